@@ -0,0 +1,188 @@
+"""
+Underpayment anomalies per (track, country, month) against rolling robust baselines.
+
+`models.detect_underpayment` compares each country's average underpayment
+with one fixed threshold. Here the ledger is priced once (`models`), summed to
+one cell per (track, country, month), and each cell's underpayment
+(1 - actual / expected revenue) is compared with the same series' previous
+`window` months:
+- baseline: median of those months
+- spread: median absolute deviation (MAD) around that median, floored at
+  `mad_floor` so flat series don't flag tiny changes
+- robust_z = (underpayment - median) / (1.4826 * spread)
+
+A cell is an anomaly when it has at least `min_periods` baseline months and
+robust_z exceeds `z_threshold` (underpayment rising, not falling). Months
+missing from a series simply leave gaps in its window.
+
+Baselines are computed for all cells at once: cells are sorted by series and
+month, each cell's previous `window` cells are gathered into an
+(n_cells, window) array, and medians come from one row-wise sort.
+
+UnderpaymentAnomalyDetector keeps the last 2 * `window` months of cells, so
+newly appended months (and restatements of the last `window` months) can be
+scored without revisiting the full history.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from tuneiq_app import models
+from tuneiq_app.rates import RateStore
+
+WINDOW_MONTHS = 6
+MIN_PERIODS = 3
+Z_THRESHOLD = 3.5
+MAD_FLOOR = 0.01
+SERIES_KEYS = ("track", "country")
+
+# MAD of a normal distribution is 0.6745 standard deviations
+_MAD_SCALE = 1.4826
+_SUM_COLUMNS = ["streams", "expected_revenue_ngn", "actual_revenue_ngn"]
+
+
+def month_index(month: pd.Series) -> np.ndarray:
+    """Months since 1970-01 as float (NaN where `month` cannot be parsed)."""
+    codes, uniques = pd.factorize(month)
+    parsed = pd.to_datetime(pd.Series(np.asarray(uniques, dtype=object)).astype(str), errors="coerce", format="mixed")
+    index = (parsed.dt.year - 1970) * 12 + parsed.dt.month - 1
+    return np.append(index.to_numpy(dtype=np.float64), np.nan)[codes]
+
+
+def _month_labels(months: pd.Series) -> np.ndarray:
+    """'YYYY-MM' for month indexes from `month_index`."""
+    return months.to_numpy(dtype=np.int64).astype("datetime64[M]").astype(str)
+
+
+def _row_median(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Median of the first `counts` values of each row after sorting (NaN sorts last)."""
+    ordered = np.sort(values, axis=1)
+    low = np.clip((counts - 1) // 2, 0, None)[:, None]
+    high = np.clip(counts // 2, 0, values.shape[1] - 1)[:, None]
+    median = (np.take_along_axis(ordered, low, axis=1) + np.take_along_axis(ordered, high, axis=1))[:, 0] / 2
+    median[counts == 0] = np.nan
+    return median
+
+
+class UnderpaymentAnomalyDetector:
+    """
+    Rolling median/MAD underpayment detector with incremental updates.
+
+    Args:
+        window: Months of history in each baseline
+        min_periods: Baseline months a cell needs before it can be flagged
+        z_threshold: Robust z-score above which a cell is an anomaly
+        mad_floor: Lower bound on the MAD (in underpayment fraction)
+        by: Columns identifying a series (a month column is always added)
+        rates: Rate store used to price rows (defaults as in `models`)
+    """
+
+    def __init__(self, window: int = WINDOW_MONTHS, min_periods: int = MIN_PERIODS,
+                 z_threshold: float = Z_THRESHOLD, mad_floor: float = MAD_FLOOR,
+                 by: Sequence[str] = SERIES_KEYS, rates: Optional[RateStore] = None):
+        self.window = window
+        self.min_periods = min_periods
+        self.z_threshold = z_threshold
+        self.mad_floor = mad_floor
+        self.by = list(by)
+        self.rates = rates
+        # Cells of the last 2 * window months: baselines for restated or new months
+        self.history = pd.DataFrame(columns=self.by + ["month_index"] + _SUM_COLUMNS)
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add newly appended rows and score the cells they touch.
+
+        Rows of a month already seen are added to its cells, and later cells of
+        the same series are rescored since their baselines changed. Rows more
+        than `window` months before the latest month seen raise ValueError.
+
+        Returns:
+            Scored cells (see `score`) from the earliest new month onward for
+            the series present in `df`
+        """
+        new = self._cells(df)
+        if new.empty:
+            return self.score(new)
+        earliest = new["month_index"].min()
+        if not self.history.empty and earliest < self.history["month_index"].max() - self.window:
+            raise ValueError("Rows are older than the retained history; rebuild the detector from the full ledger")
+
+        cells = pd.concat([self.history, new], ignore_index=True) if not self.history.empty else new
+        cells = cells.groupby(self.by + ["month_index"], sort=False, dropna=False, observed=True)[_SUM_COLUMNS].sum().reset_index()
+        scored = self.score(cells)
+
+        touched = scored.set_index(self.by).index.isin(new.set_index(self.by).index.unique())
+        result = scored[touched & (scored["month_index"] >= earliest)]
+
+        latest = cells["month_index"].max()
+        self.history = cells[cells["month_index"] >= latest - 2 * self.window].reset_index(drop=True)
+        return result.reset_index(drop=True)
+
+    def score(self, cells: pd.DataFrame) -> pd.DataFrame:
+        """
+        Baselines and flags for per-(series, month) cells.
+
+        Adds underpayment_pct, baseline_median, baseline_mad, baseline_months,
+        robust_z and anomaly, plus a 'YYYY-MM' month column.
+        """
+        cells = cells.sort_values("month_index", kind="stable")
+        cells = cells.assign(_series=cells.groupby(self.by, sort=False, dropna=False, observed=True).ngroup())
+        cells = cells.sort_values(["_series", "month_index"], kind="stable").reset_index(drop=True)
+
+        pct, _ = models.underpayment_ratio(cells["expected_revenue_ngn"].to_numpy(dtype=np.float64),
+                                           cells["actual_revenue_ngn"].to_numpy(dtype=np.float64))
+        series = cells["_series"].to_numpy()
+        months = cells["month_index"].to_numpy(dtype=np.float64)
+
+        # Previous `window` cells of each cell; one cell per month, so these cover at most `window` months
+        n = len(cells)
+        previous = np.arange(n)[:, None] - np.arange(1, self.window + 1)[None, :]
+        source = np.clip(previous, 0, None)
+        in_window = ((previous >= 0) & (series[source] == series[:, None])
+                     & (months[source] >= months[:, None] - self.window) & np.isfinite(pct[source]))
+        values = np.where(in_window, pct[source], np.nan)
+        counts = in_window.sum(axis=1)
+
+        median = _row_median(values, counts)
+        mad = _row_median(np.abs(values - median[:, None]), counts)
+        with np.errstate(invalid="ignore"):
+            robust_z = (pct - median) / (_MAD_SCALE * np.fmax(mad, self.mad_floor))
+
+        cells["underpayment_pct"] = pct
+        cells["baseline_median"] = median
+        cells["baseline_mad"] = mad
+        cells["baseline_months"] = counts
+        cells["robust_z"] = robust_z
+        with np.errstate(invalid="ignore"):
+            cells["anomaly"] = (counts >= self.min_periods) & (robust_z > self.z_threshold)
+        return cells.drop(columns="_series").assign(month=_month_labels(cells["month_index"]))
+
+    def _cells(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Price rows and sum them per (series, month); rows without a parseable month are skipped."""
+        if df.empty:
+            return pd.DataFrame(columns=self.by + ["month_index"] + _SUM_COLUMNS)
+        priced = models.estimate_royalties(df, self.rates)
+        rows = priced[self.by + _SUM_COLUMNS].assign(month_index=month_index(priced["month"]))
+        rows = rows[rows["month_index"].notna()]
+        return rows.groupby(self.by + ["month_index"], sort=False, dropna=False, observed=True)[_SUM_COLUMNS].sum().reset_index()
+
+
+def detect_anomalies(df: pd.DataFrame, window: int = WINDOW_MONTHS, min_periods: int = MIN_PERIODS,
+                     z_threshold: float = Z_THRESHOLD, mad_floor: float = MAD_FLOOR,
+                     by: Sequence[str] = SERIES_KEYS, rates: Optional[RateStore] = None,
+                     only_anomalies: bool = False) -> pd.DataFrame:
+    """
+    Score every (series, month) cell of a ledger against its rolling baseline.
+
+    Returns one row per cell (series keys, month, streams, expected/actual
+    revenue, underpayment_pct, baseline_median, baseline_mad, baseline_months,
+    robust_z, anomaly), or only the anomalies, largest robust_z first.
+    """
+    detector = UnderpaymentAnomalyDetector(window, min_periods, z_threshold, mad_floor, by, rates)
+    cells = detector.update(df)
+    if only_anomalies:
+        return cells[cells["anomaly"]].sort_values("robust_z", ascending=False).reset_index(drop=True)
+    return cells
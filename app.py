@@ -28,6 +28,8 @@ fetch_all = None
 estimate_royalties = None
 detect_underpayment = None
 economic_impact_proxy = None
+analyze_royalties = None
+underpayment_table = None
 COUNTRIES = None
 NIGERIAN_ARTISTS = None
 display_economic_impact_section = None
@@ -40,6 +42,8 @@ try:
     estimate_royalties = getattr(models, "estimate_royalties")
     detect_underpayment = getattr(models, "detect_underpayment")
     economic_impact_proxy = getattr(models, "economic_impact_proxy")
+    analyze_royalties = getattr(models, "analyze_royalties")
+    underpayment_table = getattr(models, "underpayment_table")
     countries_mod = importlib.import_module("tuneiq_app.countries")
     COUNTRIES = getattr(countries_mod, "COUNTRIES")
     na_mod = importlib.import_module("tuneiq_app.nigerian_artists")
@@ -55,6 +59,8 @@ except Exception:
         estimate_royalties = getattr(models, "estimate_royalties")
         detect_underpayment = getattr(models, "detect_underpayment")
         economic_impact_proxy = getattr(models, "economic_impact_proxy")
+        analyze_royalties = getattr(models, "analyze_royalties")
+        underpayment_table = getattr(models, "underpayment_table")
         countries_mod = importlib.import_module("countries")
         COUNTRIES = getattr(countries_mod, "COUNTRIES")
         na_mod = importlib.import_module("nigerian_artists")
@@ -1204,7 +1210,8 @@ def render_kpi_cards(df: pd.DataFrame, impact_metrics: Dict):
     direct_revenue = impact_metrics['direct_revenue_ngn']
     indirect_revenue = impact_metrics['indirect_revenue_ngn']
     country_count = len(df['country'].unique())
-    underpaid = detect_underpayment(df)
+    # df already carries the royalty columns from analyze_royalties in main()
+    underpaid = underpayment_table(df)
     alert_count = len(underpaid)
     
     # Format currency
@@ -1220,6 +1227,12 @@ def render_kpi_cards(df: pd.DataFrame, impact_metrics: Dict):
     
     st.markdown(kpi_html, unsafe_allow_html=True)
 
+    # {platform: rows} left out of the underpayment alerts
+    masked = underpaid.attrs.get('masked_rows') or {}
+    if masked:
+        st.caption("Underpayment alerts exclude rows with no expected revenue: "
+                   + ", ".join(f"{platform} ({count:,})" for platform, count in masked.items()))
+
 # def render_charts(df: pd.DataFrame, selected_platforms=None):
 #     """Render main dashboard visualizations."""
 #     # Filter data based on selected platforms
@@ -1510,7 +1523,7 @@ def render_charts(df: pd.DataFrame, selected_platforms=None):
     st.markdown(chart_css, unsafe_allow_html=True)
         
     # Compute per-country impact and identify top-10 countries by impact
-    country_impact = df.groupby('country').agg({
+    country_impact = df.groupby('country', observed=True).agg({
         'streams': 'sum',
         'expected_revenue_ngn': 'sum',
         'actual_revenue_ngn': 'sum'
@@ -1577,7 +1590,7 @@ def render_charts(df: pd.DataFrame, selected_platforms=None):
         st.markdown('<div class="chart-wrapper">', unsafe_allow_html=True)
         st.markdown("#### Platform Distribution")
         
-        platform_data = df.groupby('platform')['streams'].sum().reset_index()
+        platform_data = df.groupby('platform', observed=True)['streams'].sum().reset_index()
         
         # Add platform icons
         platform_icons = {
@@ -2264,6 +2277,10 @@ def main():
                             st.session_state['latest_df'] = fetched
                             st.session_state['current_artist'] = selected_artist
                             st.success(f"Live data fetched for {selected_artist} and applied to the dashboard")
+                            fetch_report = fetched.attrs.get('fetch_report') or {}
+                            if fetch_report:
+                                st.caption(" · ".join(f"{platform}: {info['status']} in {info['seconds']:.1f}s"
+                                                      for platform, info in fetch_report.items()))
                     except Exception as e:
                         st.error(f"Error fetching live data: {e}")
                 st.session_state['fetching'] = False
@@ -2273,8 +2290,9 @@ def main():
     header_months = None
     header_country = None
     
-    # Load and process data
-    df = load_data(use_live)
+    # Load and process data. load_data may return the frame cached in session_state['latest_df'];
+    # work on a shallow copy so the column changes below never leak into it across reruns
+    df = load_data(use_live).copy(deep=False)
 
     # Ensure artist_image field exists consistently (merge info from any platform)
     if 'artist_image' not in df.columns:
@@ -2287,8 +2305,10 @@ def main():
         else:
             df['artist_image'] = None
 
-    df = estimate_royalties(df)
-    impact_metrics = economic_impact_proxy(df)
+    # Royalty columns and impact metrics are derived once; df is this run's own copy, so enrich it in place
+    royalty_analysis = analyze_royalties(df, inplace=True)
+    df = royalty_analysis.frame
+    impact_metrics = royalty_analysis.impact
 
     # Source badge
     if st.session_state.get('latest_df') is not None:
@@ -2313,10 +2333,15 @@ def main():
         st.markdown(f"### {artist_name_display}")
     
     # Clean data for filtering
-    df['platform'] = df['platform'].fillna('Spotify').astype(str)
+    df['platform'] = df['platform'].astype(object).fillna('Spotify').astype(str)
     df['platform'] = df['platform'].replace('Unknown', 'Spotify')
-    df = df[df['month'].notna()]  # Remove rows with Unknown months
+    # Remove rows with Unknown months: coerce_ledger parses months, so 'Unknown' is NaT like a missing month
+    known_month = df['month'].notna()
+    unknown_months = int((~known_month).sum())
+    df = df[known_month]
     df['month'] = df['month'].astype(str)
+    if unknown_months:
+        st.caption(f"{unknown_months:,} rows without a recognisable month (e.g. 'Unknown') are left out of the filters and charts.")
     
     # Get unique values and sort
     platforms = sorted(df['platform'].unique().tolist(), key=str)
@@ -2443,7 +2468,7 @@ def main():
 
     # Country-level detail panel when drilled down
     if drill_country != 'All':
-        country_agg = filtered_df.groupby('platform').agg({'streams': 'sum', 'expected_revenue_ngn': 'sum', 'actual_revenue_ngn': 'sum'}).reset_index()
+        country_agg = filtered_df.groupby('platform', observed=True).agg({'streams': 'sum', 'expected_revenue_ngn': 'sum', 'actual_revenue_ngn': 'sum'}).reset_index()
         
         # Toolbar for the country detail table
         render_table_toolbar(
@@ -0,0 +1,94 @@
+"""
+Merging live platform rows into the sample ledger in `data_pipeline.fetch_all`.
+
+Compares `data_pipeline.merge_live_data` (one mask, one concat) with the
+previous per-platform loop (filter the accumulated frame, copy it, concat one
+platform's rows, repeat) on synthetic ledgers from
+`bench_suite.make_streaming_frame`, with live rows for Spotify, YouTube and
+Apple Music. Reports the best wall time and the peak memory allocated
+(tracemalloc) for each.
+
+Usage:
+    python benchmarks/bench_fetch_merge.py [--sizes 1e5 1e6 1e7] [--live-rows 5000] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import make_streaming_frame  # noqa: E402  (also puts tuneiq_app on sys.path)
+
+from tuneiq_app.data_pipeline import merge_live_data  # noqa: E402
+from tuneiq_app.ledger_schema import coerce_ledger  # noqa: E402
+
+LIVE_PLATFORMS = ["Spotify", "YouTube", "Apple Music"]
+
+
+def legacy_merge(df: pd.DataFrame, live: dict) -> pd.DataFrame:
+    """The per-platform filter-and-concat loop `fetch_all` used before `merge_live_data`."""
+    for platform, live_df in live.items():
+        if live_df is not None:
+            df = df[df['platform'] != platform].copy()
+            df = pd.concat([df, live_df])
+    return coerce_ledger(df.reset_index(drop=True))
+
+
+def live_frames(rows: int) -> dict:
+    """Coerced live rows for each platform, as the fetchers return them."""
+    frames = {}
+    for seed, platform in enumerate(LIVE_PLATFORMS, start=1):
+        frame = make_streaming_frame(rows, seed=seed).assign(platform=platform)
+        frames[platform] = coerce_ledger(frame)
+    return frames
+
+
+def measure(merge, sample: pd.DataFrame, live: dict, repeats: int) -> dict:
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        merge(sample, live)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    merge(sample, live)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(times), "peak_mb": peak / 2 ** 20}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Single-concat vs per-platform merge in fetch_all")
+    parser.add_argument("--sizes", nargs="+", type=lambda v: int(float(v)), default=[100_000, 1_000_000, 10_000_000],
+                        help="sample ledger rows")
+    parser.add_argument("--live-rows", type=lambda v: int(float(v)), default=5_000, help="live rows per platform")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    live = live_frames(args.live_rows)
+    results = []
+    print(f"{'rows':>12} {'legacy s':>9} {'single s':>9} {'speedup':>8} {'legacy MB':>10} {'single MB':>10}")
+    for rows in args.sizes:
+        sample = coerce_ledger(make_streaming_frame(rows))
+        expected = legacy_merge(sample, live)
+        merged = merge_live_data(sample, live)
+        pd.testing.assert_frame_equal(merged, expected, check_categorical=False)
+        del expected, merged
+
+        legacy = measure(legacy_merge, sample, live, args.repeats)
+        single = measure(merge_live_data, sample, live, args.repeats)
+        results.append({"rows": rows, "live_rows": args.live_rows, "legacy": legacy, "single_concat": single})
+        print(f"{rows:>12,} {legacy['seconds']:>9.3f} {single['seconds']:>9.3f} "
+              f"{legacy['seconds'] / single['seconds']:>7.1f}x {legacy['peak_mb']:>10.0f} {single['peak_mb']:>10.0f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
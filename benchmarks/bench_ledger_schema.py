@@ -0,0 +1,59 @@
+"""
+Memory saved by `ledger_schema.coerce_ledger`.
+
+Reports deep per-column memory before and after coercion for the scraper
+ledger (scraper/artist_tracks.csv) and for a synthetic ledger from
+`bench_suite.make_streaming_frame`, plus the time coercion takes.
+
+Usage:
+    python benchmarks/bench_ledger_schema.py [--rows 1e7] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import make_streaming_frame  # noqa: E402  (also puts tuneiq_app on sys.path)
+
+from tuneiq_app.ledger_impact import sniff_encoding  # noqa: E402
+from tuneiq_app.ledger_schema import coerce_ledger, memory_report  # noqa: E402
+
+SCRAPER_LEDGER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper", "artist_tracks.csv")
+
+
+def measure(name: str, df: pd.DataFrame) -> dict:
+    t0 = time.perf_counter()
+    coerced = coerce_ledger(df)
+    seconds = time.perf_counter() - t0
+    report = memory_report(df, coerced)
+    print(f"\n{name}: {len(df):,} rows, coerced in {seconds * 1000:.1f} ms")
+    print(report.to_string(float_format=lambda v: f"{v:,.1f}"))
+    total = report.loc["total"]
+    return {"rows": len(df), "coerce_s": seconds, "bytes_before": int(total["bytes_before"]),
+            "bytes_after": int(total["bytes_after"]), "saved_pct": float(total["saved_pct"]),
+            "columns": report.drop(index="total").reset_index(names="column").to_dict(orient="records")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory saved by the canonical ledger schema")
+    parser.add_argument("--rows", type=lambda v: int(float(v)), default=10_000_000, help="synthetic ledger rows")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if os.path.exists(SCRAPER_LEDGER):
+        results["scraper"] = measure("scraper/artist_tracks.csv",
+                                     pd.read_csv(SCRAPER_LEDGER, encoding=sniff_encoding(SCRAPER_LEDGER)))
+    results["synthetic"] = measure("synthetic ledger", make_streaming_frame(args.rows))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Memory benchmark: per-worker footprint of the TuneIQ model across processes.
+
+Starts N worker processes that each load the model in one format, score a
+batch, and then (while all workers are alive) report:
+- rss_mb: resident set size (counts shared pages in every process)
+- pss_mb: proportional set size (shared pages split between the processes)
+- model_mb: growth in private memory caused by loading and using the model
+
+Formats compared:
+- joblib: the scikit-learn pickle, each worker holds its own copy
+- npz:    compiled export read into memory (no scikit-learn)
+- npy:    compiled export directory opened with mmap_mode='r', shared pages
+
+PSS and private memory come from /proc/self/smaps_rollup (Linux). Elsewhere
+only RSS is reported.
+
+Usage:
+    python benchmarks/bench_model_memory.py [--workers 4] [--formats joblib npz npy] [--json out.json]
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+
+def _memory_kb() -> dict:
+    """Current rss/pss/private memory of this process in KB."""
+    stats = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if parts[0] in ("Rss:", "Pss:", "Private_Clean:", "Private_Dirty:"):
+                    stats[parts[0][:-1].lower()] = int(parts[1])
+        stats["private"] = stats.pop("private_clean", 0) + stats.pop("private_dirty", 0)
+    except OSError:
+        import resource
+        stats["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return stats
+
+
+def _worker(fmt: str, path: str, barrier, results):
+    import warnings
+    warnings.filterwarnings("ignore")
+    import numpy as np
+    import pandas as pd
+    from tuneiq_app import predictor
+
+    before = _memory_kb()
+    if fmt == "joblib":
+        model = predictor.load_tuneiq_model(path)
+    else:
+        model = predictor.load_compiled_model(path, mmap_mode="r" if fmt == "npy" else None)
+    names = list(model.feature_names_in_)
+    X = pd.DataFrame(np.random.default_rng(os.getpid()).gamma(2.0, 50.0, size=(500, len(names))), columns=names)
+    model.predict(X)
+
+    # Measure only once every worker holds its model so shared pages are split fairly
+    barrier.wait()
+    after = _memory_kb()
+    barrier.wait()
+    results.put({
+        "format": fmt,
+        "rss_mb": after.get("rss", 0) / 1024,
+        "pss_mb": after.get("pss", 0) / 1024 if "pss" in after else None,
+        "model_mb": (after["private"] - before["private"]) / 1024 if "private" in after else None,
+    })
+
+
+def run(formats, workers: int) -> list:
+    from tuneiq_app.model_export import export_model
+    from tuneiq_app.predictor import MODEL_PATH
+
+    ctx = mp.get_context("spawn")
+    summary = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"joblib": MODEL_PATH}
+        if "npz" in formats:
+            paths["npz"] = os.path.join(tmp, "model.npz")
+            export_model(MODEL_PATH, paths["npz"], layout="npz")
+        if "npy" in formats:
+            paths["npy"] = os.path.join(tmp, "model.npy")
+            export_model(MODEL_PATH, paths["npy"], layout="npy")
+
+        for fmt in formats:
+            barrier = ctx.Barrier(workers)
+            results = ctx.Queue()
+            procs = [ctx.Process(target=_worker, args=(fmt, paths[fmt], barrier, results)) for _ in range(workers)]
+            for proc in procs:
+                proc.start()
+            rows = [results.get() for _ in procs]
+            for proc in procs:
+                proc.join()
+
+            def mean(key):
+                values = [row[key] for row in rows if row[key] is not None]
+                return round(sum(values) / len(values), 2) if values else None
+
+            summary.append({
+                "format": fmt,
+                "workers": workers,
+                "rss_mb_per_worker": mean("rss_mb"),
+                "pss_mb_per_worker": mean("pss_mb"),
+                "model_private_mb_per_worker": mean("model_mb"),
+            })
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-worker memory of the TuneIQ model by load format")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--formats", nargs="+", default=["joblib", "npz", "npy"], choices=["joblib", "npz", "npy"])
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    summary = run(args.formats, args.workers)
+    print(f"{'format':<8}{'workers':>8}{'RSS MB':>10}{'PSS MB':>10}{'model MB':>10}")
+    for row in summary:
+        print(f"{row['format']:<8}{row['workers']:>8}{row['rss_mb_per_worker']:>10}"
+              f"{str(row['pss_mb_per_worker']):>10}{str(row['model_private_mb_per_worker']):>10}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
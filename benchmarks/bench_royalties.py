@@ -0,0 +1,157 @@
+"""
+Royalty benchmarks on synthetic ledgers from `bench_suite.make_streaming_frame`.
+
+- apply vs vectorized: the previous `estimate_royalties` expected-revenue step
+  (`df.apply(lambda row: ..., axis=1)` over STREAM_RATES) against the current
+  categorical lookup, checking both give identical values.
+- pipeline: the dashboard's previous sequence (estimate_royalties, then
+  economic_impact_proxy and detect_underpayment, each re-deriving royalties
+  from a copy) against one `models.analyze_royalties` pass; reports wall time
+  and the tracemalloc allocation high-water mark of each.
+- exact money: `estimate_royalties` and `analyze_royalties` with exact=True
+  (Int64 cents/kobo) against the float path, plus how far a plain float64
+  sum of the NGN actual revenue column is from the exact total at a
+  non-round exchange rate (DRIFT_NGN_RATE).
+
+Usage:
+    python benchmarks/bench_royalties.py [--sizes 1e3 1e4 1e5 1e6] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import make_streaming_frame  # noqa: E402  (also puts tuneiq_app on sys.path)
+
+from tuneiq_app import models, money  # noqa: E402
+from tuneiq_app.rates import RateStore  # noqa: E402
+
+
+def estimate_royalties_apply(df):
+    """The row-wise implementation `estimate_royalties` used before vectorization."""
+    df = df.copy()
+    df['expected_revenue_usd'] = df.apply(
+        lambda row: row['streams'] * models.STREAM_RATES.get(row['platform'], models.DEFAULT_STREAM_RATE),
+        axis=1
+    )
+    df['expected_revenue_ngn'] = df['expected_revenue_usd'] * models.NGN_RATE
+    df['actual_revenue_ngn'] = df['reported_revenue_usd'] * models.NGN_RATE
+    return df
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run(sizes, repeat: int = 3) -> list:
+    rows_out = []
+    for rows in sizes:
+        df = make_streaming_frame(rows)
+        apply_s, expected = _best_of(lambda: estimate_royalties_apply(df), 1 if rows >= 100_000 else repeat)
+        vector_s, actual = _best_of(lambda: models.estimate_royalties(df), repeat)
+        for column in ("expected_revenue_usd", "expected_revenue_ngn", "actual_revenue_ngn"):
+            if not np.array_equal(expected[column].to_numpy(), actual[column].to_numpy(), equal_nan=True):
+                raise AssertionError(f"{column} differs from the apply implementation at {rows:,} rows")
+        rows_out.append({"rows": rows, "apply_s": apply_s, "vectorized_s": vector_s, "speedup": apply_s / vector_s})
+    return rows_out
+
+
+def _legacy_pipeline(df):
+    enriched = models.estimate_royalties(df)
+    return enriched, models.economic_impact_proxy(enriched), models.detect_underpayment(enriched)
+
+
+def _peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_pipeline(sizes, repeat: int = 3) -> list:
+    rows_out = []
+    for rows in sizes:
+        df = make_streaming_frame(rows)
+        legacy_s, _ = _best_of(lambda: _legacy_pipeline(df), repeat)
+        engine_s, _ = _best_of(lambda: models.analyze_royalties(df), repeat)
+        rows_out.append({
+            "rows": rows,
+            "legacy_s": legacy_s,
+            "engine_s": engine_s,
+            "legacy_peak_mb": _peak_bytes(lambda: _legacy_pipeline(df)) / 1e6,
+            "engine_peak_mb": _peak_bytes(lambda: models.analyze_royalties(df)) / 1e6,
+            "input_mb": df.memory_usage(deep=False).sum() / 1e6,
+        })
+    return rows_out
+
+
+# Market-like rate for the drift column; at the round NGN_RATE float sums of cent amounts stay exact
+DRIFT_NGN_RATE = 1532.47
+
+
+def run_exact(sizes, repeat: int = 3) -> list:
+    drift_rates = RateStore.from_constants(models.STREAM_RATES, {"NGN": DRIFT_NGN_RATE}, models.DEFAULT_STREAM_RATE)
+    rows_out = []
+    for rows in sizes:
+        df = make_streaming_frame(rows)
+        float_s, _ = _best_of(lambda: models.estimate_royalties(df), repeat)
+        exact_s, _ = _best_of(lambda: models.estimate_royalties(df, exact=True), repeat)
+        float_pipeline_s, _ = _best_of(lambda: models.analyze_royalties(df), repeat)
+        exact_pipeline_s, _ = _best_of(lambda: models.analyze_royalties(df, exact=True), repeat)
+        float_sum = float(models.estimate_royalties(df, drift_rates)["actual_revenue_ngn"].sum())
+        exact_sum = models.economic_impact_proxy(df, drift_rates, exact=True)["direct_revenue_ngn"]
+        rows_out.append({
+            "rows": rows,
+            "estimate_float_s": float_s,
+            "estimate_exact_s": exact_s,
+            "pipeline_float_s": float_pipeline_s,
+            "pipeline_exact_s": exact_pipeline_s,
+            "overhead": exact_pipeline_s / float_pipeline_s - 1,
+            "float_sum_minus_exact_ngn": float_sum - exact_sum / money.MINOR_UNITS["NGN"],
+        })
+    return rows_out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark royalty estimation and the one-pass royalty analysis")
+    parser.add_argument("--sizes", nargs="+", type=lambda v: int(float(v)), default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {"apply_vs_vectorized": run(args.sizes, args.repeat), "pipeline": run_pipeline(args.sizes, args.repeat),
+               "exact_money": run_exact(args.sizes, args.repeat)}
+    print(f"{'rows':>10}{'apply ms':>12}{'vector ms':>12}{'speedup':>10}")
+    for row in results["apply_vs_vectorized"]:
+        print(f"{row['rows']:>10,}{row['apply_s'] * 1000:>12.1f}{row['vectorized_s'] * 1000:>12.2f}{row['speedup']:>9.0f}x")
+    print(f"\n{'rows':>10}{'3 calls ms':>12}{'engine ms':>12}{'3 calls peak MB':>17}{'engine peak MB':>16}{'input MB':>10}")
+    for row in results["pipeline"]:
+        print(f"{row['rows']:>10,}{row['legacy_s'] * 1000:>12.1f}{row['engine_s'] * 1000:>12.1f}"
+              f"{row['legacy_peak_mb']:>17.1f}{row['engine_peak_mb']:>16.1f}{row['input_mb']:>10.1f}")
+    print(f"\n{'rows':>10}{'float ms':>12}{'exact ms':>12}{'float pipe ms':>15}{'exact pipe ms':>15}"
+          f"{'overhead':>10}{'float sum drift NGN':>20}")
+    for row in results["exact_money"]:
+        print(f"{row['rows']:>10,}{row['estimate_float_s'] * 1000:>12.1f}{row['estimate_exact_s'] * 1000:>12.1f}"
+              f"{row['pipeline_float_s'] * 1000:>15.1f}{row['pipeline_exact_s'] * 1000:>15.1f}"
+              f"{row['overhead']:>9.0%}{row['float_sum_minus_exact_ngn']:>20.6f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
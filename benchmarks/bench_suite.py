@@ -0,0 +1,253 @@
+"""
+Benchmark suite for the predictor and the royalty models.
+
+Times each case on synthetic streaming frames (artist, track, platform, country,
+streams, month, reported_revenue_usd, duration) from 1e2 to 1e7 rows spread
+over many artists, countries and platforms:
+- predictor.prepare_features          one artist's frame -> feature row
+- predictor.predict_impact[warm]      model already loaded
+- predictor.predict_impact[cold]      model loaded from disk on every call
+- predictor.predict_impact[loop]      one predict_impact call per artist
+- predictor.predict_impact_many       all artists in one batched call
+- models.estimate_royalties
+- models.detect_underpayment
+- models.economic_impact_proxy
+- models.analyze_royalties            all three of the above from one pass
+- models.analyze_royalties[exact]     the same with exact Int64 minor-unit money
+- anomalies.detect_anomalies          rolling median/MAD baselines per (track, country, month)
+
+Results are written as JSON (environment, git commit, per-case timings) so runs
+can be compared. With --baseline, every case that is more than --threshold
+slower than the baseline run is reported and the exit code is 1.
+
+Once a case takes longer than --budget seconds for one call, its larger sizes
+are recorded as skipped instead of run.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1e2 1e3 ... 1e7] [--cases NAME ...] [--out results.json]
+                                     [--baseline old.json] [--threshold 0.25]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app import anomalies, models, predictor
+from tuneiq_app.countries import COUNTRIES
+from tuneiq_app.nigerian_artists import NIGERIAN_ARTISTS
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+PLATFORMS = ["Spotify", "YouTube", "Apple Music", "Audiomack", "Boomplay"]
+
+
+def make_streaming_frame(rows: int, artists: int = 20, countries: int = 60, seed: int = 0) -> pd.DataFrame:
+    """Synthetic long-format streaming data shaped like sample_data/streaming_sample.csv."""
+    rng = np.random.default_rng(seed)
+    artist_names = np.array((NIGERIAN_ARTISTS * (artists // len(NIGERIAN_ARTISTS) + 1))[:artists], dtype=object)
+    if artists > len(NIGERIAN_ARTISTS):
+        artist_names = np.array([f"{name} {i}" for i, name in enumerate(artist_names)], dtype=object)
+    country_names = np.array(["Nigeria"] + [c for c in COUNTRIES if c != "Nigeria"][:countries - 1], dtype=object)
+    months = np.array([f"2025-{m:02d}" for m in range(1, 13)], dtype=object)
+
+    streams = rng.lognormal(9.0, 1.5, rows).astype(np.int64) + 1
+    return pd.DataFrame({
+        "artist": artist_names[rng.integers(0, len(artist_names), rows)],
+        "track": np.array([f"Track {i}" for i in range(50)], dtype=object)[rng.integers(0, 50, rows)],
+        "platform": np.array(PLATFORMS, dtype=object)[rng.integers(0, len(PLATFORMS), rows)],
+        "country": country_names[rng.integers(0, len(country_names), rows)],
+        "streams": streams,
+        "month": months[rng.integers(0, len(months), rows)],
+        "reported_revenue_usd": np.round(streams * rng.uniform(0.0004, 0.006, rows), 2),
+        "duration": rng.uniform(120.0, 260.0, rows).round(1),
+    })
+
+
+# --- Cases: each takes (df, context) and returns a zero-argument callable to time ---
+
+def _first_artist(df):
+    artist = df["artist"].iat[0]
+    return df[df["artist"] == artist]
+
+
+def case_prepare_features(df, ctx):
+    frame = _first_artist(df)
+    return lambda: predictor.prepare_features(frame, model=ctx["model"])
+
+
+def case_predict_warm(df, ctx):
+    frame = _first_artist(df)
+    return lambda: predictor.predict_impact(frame, model=ctx["model"])
+
+
+def case_predict_cold(df, ctx):
+    frame = _first_artist(df)
+    return lambda: predictor.predict_impact(frame, model=predictor.load_tuneiq_model(ctx["model_path"]))
+
+
+def case_predict_loop(df, ctx):
+    frames = [frame for _, frame in df.groupby("artist", sort=False, observed=True)]
+    return lambda: [predictor.predict_impact(frame, model=ctx["model"]) for frame in frames]
+
+
+def case_predict_many(df, ctx):
+    return lambda: predictor.predict_impact_many(df, by="artist", model=ctx["model"])
+
+
+def case_estimate_royalties(df, ctx):
+    return lambda: models.estimate_royalties(df)
+
+
+def case_detect_underpayment(df, ctx):
+    return lambda: models.detect_underpayment(df)
+
+
+def case_economic_impact_proxy(df, ctx):
+    return lambda: models.economic_impact_proxy(df)
+
+
+def case_analyze_royalties(df, ctx):
+    return lambda: models.analyze_royalties(df)
+
+
+def case_analyze_royalties_exact(df, ctx):
+    return lambda: models.analyze_royalties(df, exact=True)
+
+
+def case_detect_anomalies(df, ctx):
+    return lambda: anomalies.detect_anomalies(df)
+
+
+CASES = {
+    "predictor.prepare_features": case_prepare_features,
+    "predictor.predict_impact[warm]": case_predict_warm,
+    "predictor.predict_impact[cold]": case_predict_cold,
+    "predictor.predict_impact[loop]": case_predict_loop,
+    "predictor.predict_impact_many": case_predict_many,
+    "models.estimate_royalties": case_estimate_royalties,
+    "models.detect_underpayment": case_detect_underpayment,
+    "models.economic_impact_proxy": case_economic_impact_proxy,
+    "models.analyze_royalties": case_analyze_royalties,
+    "models.analyze_royalties[exact]": case_analyze_royalties_exact,
+    "anomalies.detect_anomalies": case_detect_anomalies,
+}
+
+
+def time_call(fn, repeat: int, min_time: float = 0.2) -> list:
+    """Wall times of `repeat` calls (more while the total stays under `min_time`)."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat or (time.perf_counter() - start < min_time and len(times) < 100):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run(sizes, case_names, repeat: int = 3, budget: float = 10.0, artists: int = 20) -> dict:
+    model_path = predictor.default_model_path()
+    ctx = {"model": predictor.load_tuneiq_model(model_path), "model_path": model_path}
+    over_budget = set()
+    results = []
+    for rows in sizes:
+        df = make_streaming_frame(rows, artists=artists)
+        for name in case_names:
+            entry = {"case": name, "rows": rows, "artists": int(df["artist"].nunique())}
+            if name in over_budget:
+                results.append(dict(entry, status="skipped"))
+                continue
+            fn = CASES[name](df, ctx)
+            times = time_call(fn, repeat if rows < 1_000_000 else 1)
+            median = statistics.median(times)
+            results.append(dict(entry, status="ok", median_s=median, min_s=min(times),
+                                repeats=len(times), rows_per_s=rows / median if median else None))
+            print(f"{name:<34}{rows:>10,}{median * 1000:>12.2f} ms", flush=True)
+            if median > budget:
+                over_budget.add(name)
+    return {"meta": environment(), "results": results}
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "model_path": os.path.basename(predictor.default_model_path()),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.25, min_delta: float = 0.001) -> list:
+    """
+    Cases slower than the baseline by more than `threshold` (fraction) and `min_delta` seconds.
+
+    Returns a list of {"case", "rows", "baseline_s", "current_s", "ratio"}.
+    """
+    before = {(r["case"], r["rows"]): r for r in baseline["results"] if r.get("status") == "ok"}
+    regressions = []
+    for result in current["results"]:
+        old = before.get((result["case"], result["rows"]))
+        if result.get("status") != "ok" or old is None:
+            continue
+        ratio = result["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        if ratio > 1 + threshold and result["median_s"] - old["median_s"] > min_delta:
+            regressions.append({"case": result["case"], "rows": result["rows"], "baseline_s": old["median_s"],
+                                "current_s": result["median_s"], "ratio": ratio})
+    return regressions
+
+
+def _parse_size(value: str) -> int:
+    return int(float(value))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the TuneIQ predictor and royalty models")
+    parser.add_argument("--sizes", nargs="+", type=_parse_size, default=DEFAULT_SIZES, help="row counts, e.g. 1e2 1e5")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--artists", type=int, default=20, help="distinct artists in the synthetic frames")
+    parser.add_argument("--repeat", type=int, default=3, help="timed calls per case below 1e6 rows")
+    parser.add_argument("--budget", type=float, default=10.0, help="skip larger sizes once a call exceeds this many seconds")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    report = run(args.sizes, args.cases, repeat=args.repeat, budget=args.budget, artists=args.artists)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), threshold=args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['case']} @ {r['rows']:,} rows: "
+                  f"{r['baseline_s'] * 1000:.2f} ms -> {r['current_s'] * 1000:.2f} ms ({r['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,147 @@ Includes web scraping as an alternative data enrichment source.
 Integrates ML model predictions for GDP and job creation estimates.
 """
 
+import argparse
+import asyncio
+import json
 import os
+import threading
+import numpy as np
 import pandas as pd
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict, List, Sequence
+from tuneiq_app import sources
+from tuneiq_app.ledger_store import LedgerStore
+from tuneiq_app.nigerian_artists import NIGERIAN_ARTISTS
 from tuneiq_app.spotify_fetch import get_spotify_data
 from tuneiq_app.youtube_fetch_oauth import get_youtube_analytics
 from tuneiq_app.apple_music_fetch import get_apple_music_data
 from tuneiq_app.web_scraper import scrape_music_trends, enrich_streaming_data
-from tuneiq_app.predictor import predict_impact
+from tuneiq_app.prediction_service import get_prediction_service
+from tuneiq_app.ledger_schema import coerce_ledger
 
-def load_sample_data() -> pd.DataFrame:
-    """Load Burna Boy sample streaming data."""
-    sample_path = os.path.join(os.path.dirname(__file__), 'sample_data/streaming_sample.csv')
-    return pd.read_csv(sample_path)
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), 'sample_data', 'streaming_sample.csv')
+# Optional Parquet copy of the parsed sample, reused across processes while the CSV is unchanged
+SAMPLE_SIDECAR_PATH = os.getenv("TUNEIQ_SAMPLE_SIDECAR") or None
+
+# Parquet schema metadata key recording the (mtime_ns, size) of the CSV a sidecar was built from
+_SIDECAR_SOURCE_KEY = b"tuneiq_source"
+
+
+def _read_sample_csv(path: str) -> pd.DataFrame:
+    # The sample file has '#' comment lines between blocks of rows
+    return coerce_ledger(pd.read_csv(path, comment='#'))
+
+
+class LedgerFileCache:
+    """
+    Parsed, schema-coerced ledger CSV kept in memory until the file changes.
+
+    Every `get` stats the file; the cached frame is reused while its
+    (mtime, size) signature is unchanged and re-parsed otherwise. With
+    `sidecar_path`, the parsed frame is also written to Parquet and a cold
+    process loads that instead of parsing, as long as the sidecar was built
+    from the same signature.
+    """
+
+    def __init__(self, path: str, sidecar_path: Optional[str] = None,
+                 reader: Callable[[str], pd.DataFrame] = _read_sample_csv):
+        self.path = path
+        self.sidecar_path = sidecar_path
+        self.reader = reader
+        self._lock = threading.Lock()
+        self._df = None
+        self._signature = None
+        self.hits = 0
+        self.loads = 0
+        self.sidecar_loads = 0
+
+    def _stat_signature(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, copy: bool = True) -> pd.DataFrame:
+        """
+        Return the parsed ledger.
+
+        With `copy=True` (default) the caller gets its own deep copy. With
+        `copy=False` it gets a shallow copy sharing the cached arrays: adding
+        or replacing columns is safe, modifying values in place is not
+        (unless pandas copy-on-write mode is enabled).
+        """
+        signature = self._stat_signature()
+        with self._lock:
+            if self._df is not None and signature == self._signature:
+                self.hits += 1
+            else:
+                self._df = self._load(signature)
+                self._signature = signature
+            df = self._df
+        return df.copy(deep=copy)
+
+    def clear(self):
+        """Drop the in-memory frame (the sidecar, if any, is kept)."""
+        with self._lock:
+            self._df = None
+            self._signature = None
+
+    def stats(self) -> Dict:
+        """Cache hits, CSV parses and sidecar loads so far."""
+        return {"hits": self.hits, "loads": self.loads, "sidecar_loads": self.sidecar_loads}
+
+    def _load(self, signature) -> pd.DataFrame:
+        source = json.dumps(list(signature)).encode()
+        if self.sidecar_path:
+            df = self._read_sidecar(source)
+            if df is not None:
+                self.sidecar_loads += 1
+                return df
+        df = self.reader(self.path)
+        self.loads += 1
+        if self.sidecar_path:
+            self._write_sidecar(df, source)
+        return df
+
+    def _read_sidecar(self, source: bytes) -> Optional[pd.DataFrame]:
+        try:
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(self.sidecar_path)
+        except Exception:
+            # Missing, unreadable or written by an older schema: parse the CSV instead
+            return None
+        if (table.schema.metadata or {}).get(_SIDECAR_SOURCE_KEY) != source:
+            return None
+        return table.to_pandas()
+
+    def _write_sidecar(self, df: pd.DataFrame, source: bytes):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SIDECAR_SOURCE_KEY: source})
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = f"{self.sidecar_path}.{os.getpid()}.tmp"
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self.sidecar_path)
+        except Exception as e:
+            print(f"Sample sidecar not written: {e}")
+
+
+_sample_cache = LedgerFileCache(SAMPLE_PATH, SAMPLE_SIDECAR_PATH)
+
+
+def load_sample_data(copy: bool = True) -> pd.DataFrame:
+    """
+    Load Burna Boy sample streaming data.
+
+    The parsed frame is cached until the CSV changes on disk; see
+    `LedgerFileCache.get` for `copy`.
+    """
+    return _sample_cache.get(copy=copy)
+
+def _coerce(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    return coerce_ledger(df) if df is not None else None
 
 def fetch_spotify_data(client_id: Optional[str] = None, 
                       client_secret: Optional[str] = None,
@@ -30,7 +158,7 @@ def fetch_spotify_data(client_id: Optional[str] = None,
         return None
     
     try:
-        return get_spotify_data(client_id, client_secret, artist_name=artist_name)
+        return _coerce(get_spotify_data(client_id, client_secret, artist_name=artist_name))
     except Exception as e:
         print(f"Spotify API Error: {e}")
         return None
@@ -46,91 +174,259 @@ def fetch_youtube_geo_data(credentials_json: Optional[Dict] = None,
     
     try:
         # Pass artist_name for labeling if supported by the YouTube helper
-        return get_youtube_analytics(credentials_json, artist_name=artist_name)
+        return _coerce(get_youtube_analytics(credentials_json, artist_name=artist_name))
     except Exception as e:
         print(f"YouTube API Error: {e}")
         return None
 
+def fetch_apple_music_data(credentials: Optional[Dict] = None,
+                           artist_name: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Fetch Apple Music catalog rows if credentials provided, else return None."""
+    if not credentials:
+        return None
+    return _coerce(get_apple_music_data(credentials, artist_name=artist_name))
+
+def _spotify_source(artist: Optional[str], credentials: Optional[Dict]) -> Optional[pd.DataFrame]:
+    return fetch_spotify_data(credentials.get('client_id'), credentials.get('client_secret'), artist_name=artist)
+
+def _youtube_source(artist: Optional[str], credentials: Optional[Dict]) -> Optional[pd.DataFrame]:
+    return fetch_youtube_geo_data(credentials, artist_name=artist)
+
+def _apple_music_source(artist: Optional[str], credentials: Optional[Dict]) -> Optional[pd.DataFrame]:
+    return fetch_apple_music_data(credentials, artist_name=artist)
+
+def _web_source(artist: Optional[str], credentials: Optional[Dict]) -> Optional[pd.DataFrame]:
+    scraped_df = scrape_music_trends(artist or "Burna Boy", max_results=15)
+    return scraped_df if not scraped_df.empty else None
+
+# Built-in sources; cost is API requests per fetch, cache_ttl seconds a result is reused,
+# concurrency the fetches bulk ingestion runs at once
+SOURCES = sources.registry
+for _source in (
+    sources.FunctionSource('spotify', _spotify_source, label='Spotify', platform='Spotify',
+                           schema=sources.LEDGER_COLUMNS, credentials=('client_id', 'client_secret'),
+                           cost=4, cache_ttl=900, concurrency=2),
+    sources.FunctionSource('youtube', _youtube_source, label='YouTube', platform='YouTube',
+                           schema=sources.LEDGER_COLUMNS, credentials=('installed', 'web'),
+                           cost=1, cache_ttl=3600, concurrency=1),
+    sources.FunctionSource('apple_music', _apple_music_source, label='Apple Music', platform='Apple Music',
+                           schema=sources.LEDGER_COLUMNS,
+                           credentials=('developer_token', 'key_id', 'team_id', 'private_key'),
+                           cost=1, cache_ttl=3600, concurrency=2),
+    sources.FunctionSource('web', _web_source, label='Web Scraper',
+                           schema=('artist', 'title', 'url', 'source'), cost=3, cache_ttl=1800, concurrency=1),
+):
+    SOURCES.register(_source, replace=True)
+
+def _align_frames(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Align `frames` for one concat: each categorical column gets the union of
+    its categories so it stays categorical, and the later (small) frames get
+    every column. The first frame is never reindexed, so it is not copied.
+    """
+    columns = list(dict.fromkeys(name for frame in frames for name in frame.columns))
+    aligned = frames[:1] + [frame if list(frame.columns) == columns else frame.reindex(columns=columns)
+                            for frame in frames[1:]]
+    for name in columns:
+        # Columns missing from a frame (all NaN) don't stop the others being categorical
+        present = [frame[name] for frame in aligned if name in frame.columns and frame[name].notna().any()]
+        if not present or not all(isinstance(column.dtype, pd.CategoricalDtype) for column in present):
+            continue
+        categories = pd.unique(np.concatenate([np.asarray(column.cat.categories, dtype=object) for column in present]))
+        dtype = pd.CategoricalDtype(categories)
+        aligned = [frame.assign(**{name: frame[name].astype(dtype)})
+                   if name in frame.columns and frame[name].dtype != dtype else frame
+                   for frame in aligned]
+    return aligned
+
+def merge_live_data(sample: pd.DataFrame, live: Dict[str, Optional[pd.DataFrame]]) -> pd.DataFrame:
+    """
+    Replace the sample rows of each platform in `live` that returned data with its live rows.
+
+    Sample rows of the replaced platforms are dropped with one mask and the
+    remaining rows plus each platform's live rows (in `live` order) are
+    joined with a single concat, so the sample frame is copied once. The
+    result has the canonical ledger schema.
+    """
+    replaced = [platform for platform, live_df in live.items() if live_df is not None]
+    if not replaced:
+        return coerce_ledger(sample.reset_index(drop=True))
+    frames = [sample[~sample['platform'].isin(replaced)]]
+    frames += [live[platform] for platform in replaced]
+    merged = pd.concat(_align_frames(frames), ignore_index=True)
+    # Columns whose dtypes still differ between sources (e.g. object vs category) are coerced here
+    return coerce_ledger(merged)
+
 def fetch_all(spotify_creds: Optional[Dict] = None,
               youtube_creds: Optional[Dict] = None,
               apple_music_creds: Optional[Dict] = None,
-              artist_name: Optional[str] = None) -> pd.DataFrame:
+              artist_name: Optional[str] = None,
+              timeouts: Optional[Dict[str, float]] = None,
+              credentials: Optional[Dict[str, Dict]] = None,
+              source_names: Optional[Sequence[str]] = None) -> pd.DataFrame:
     """
     Orchestration function to merge sample and live data when available.
     Falls back to sample data if no API credentials provided.
+
+    Platforms with credentials are fetched concurrently through the source
+    registry (see `sources`), each with its own timeout (`timeouts` by
+    platform, default TUNEIQ_FETCH_TIMEOUT seconds); a platform that fails or
+    times out keeps its sample rows. Per-platform status, wall time, row
+    count and cost are in `df.attrs['fetch_report']`.
+
+    `credentials` passes credentials for any registered source by name, and
+    `source_names` selects ledger sources explicitly (default: those with
+    credentials).
     """
-    # Always load sample data as fallback
-    df = load_sample_data()
-    
-    # Attempt to fetch live data if credentials provided
-    if spotify_creds:
-        spotify_df = fetch_spotify_data(
-            spotify_creds.get('client_id'),
-            spotify_creds.get('client_secret'),
-            artist_name=artist_name
-        )
-        if spotify_df is not None:
-            # Replace sample Spotify data with live data
-            df = df[df['platform'] != 'Spotify'].copy()
-            df = pd.concat([df, spotify_df])
-    
-    if youtube_creds:
-        youtube_df = fetch_youtube_geo_data(youtube_creds, artist_name=artist_name)
-        if youtube_df is not None:
-            # Replace sample YouTube data with live data
-            df = df[df['platform'] != 'YouTube'].copy()
-            df = pd.concat([df, youtube_df])
-
-    # Apple Music (optional/stub)
-    if apple_music_creds:
-        try:
-            apple_df = get_apple_music_data(apple_music_creds, artist_name=artist_name)
-            if apple_df is not None:
-                df = df[df['platform'] != 'Apple Music'].copy()
-                df = pd.concat([df, apple_df])
-        except Exception as e:
-            print(f"Apple Music API Error: {e}")
-    
-    return df.reset_index(drop=True)
+    # Always load sample data as fallback; merge_live_data builds a new frame from it
+    df = load_sample_data(copy=False)
+
+    creds = {'spotify': spotify_creds, 'youtube': youtube_creds, 'apple_music': apple_music_creds}
+    creds.update({SOURCES.get(name).name: value for name, value in (credentials or {}).items()})
+    if source_names is None:
+        source_names = [name for name, value in creds.items() if value]
+    selected = [SOURCES.get(name) for name in source_names]
+    ledger_sources = [source for source in selected if source.platform]
+
+    live, report = SOURCES.fetch([source.name for source in ledger_sources], artist_name,
+                                 credentials=creds, timeouts=timeouts)
 
+    df = merge_live_data(df, {source.platform: live[source.label] for source in ledger_sources})
+    df.attrs['fetch_report'] = report
+    return df
 
-def fetch_live_data(source: str = "web", artist_name: str = "Burna Boy") -> pd.DataFrame:
+
+def fetch_live_data(source: str = "web", artist_name: str = "Burna Boy",
+                    credentials: Optional[Dict] = None) -> pd.DataFrame:
     """
-    Fetch live data from specified source (Spotify, YouTube, or web scraper).
+    Fetch live data from one registered source (Spotify, YouTube, Apple Music, web scraper, ...).
     
     Args:
-        source: Data source type ('spotify', 'youtube', 'web')
+        source: Source name, label or platform ('spotify', 'youtube', 'apple_music', 'Apple Music', 'web', ...)
         artist_name: Name of the artist to fetch data for
+        credentials: Credentials for sources that need them
     
     Returns:
-        pd.DataFrame with streaming data from specified source, or empty DataFrame on failure
+        pd.DataFrame with data from the source, or empty DataFrame when it
+        needs credentials that were not given, fails or finds nothing
+    
+    Raises:
+        ValueError: if `source` is not registered
     """
-    if source.lower() == "spotify":
-        print(f"Fetching Spotify data for {artist_name}...")
-        # Requires credentials - return empty if none available
+    data_source = SOURCES.get(source)
+    if data_source.needs_credentials and not credentials:
+        print(f"Fetching {data_source.label} data for {artist_name}: no credentials configured")
         return pd.DataFrame()
-    
-    elif source.lower() == "youtube":
-        print(f"Fetching YouTube data for {artist_name}...")
-        # Requires credentials - return empty if none available
+
+    print(f"Fetching {data_source.label} data for {artist_name}...")
+    live, report = SOURCES.fetch([data_source.name], artist_name, credentials={data_source.name: credentials})
+    result = live[data_source.label]
+    if result is None or result.empty:
+        print(f"✗ No {data_source.label} results for {artist_name} ({report[data_source.label]['status']})")
         return pd.DataFrame()
-    
-    elif source.lower() == "web":
-        print(f"Scraping live web data for {artist_name}...")
-        try:
-            scraped_df = scrape_music_trends(artist_name, max_results=15)
-            if not scraped_df.empty:
-                print(f"✓ Web scrape successful: {len(scraped_df)} results found")
-                return scraped_df
+    print(f"✓ {data_source.label} fetch successful: {len(result)} results found")
+    return result
+
+
+# Statuses that complete an (artist, platform) pair; errors, timeouts and missing credentials are retried
+_INGEST_DONE_STATUSES = ('ok', 'cached', 'no data')
+_INGEST_COLUMNS = ['artist', 'platform', 'status', 'seconds', 'rows', 'cost', 'path']
+
+
+def ingest_artists(store_path: str,
+                   artists: Optional[Sequence[str]] = None,
+                   credentials: Optional[Dict[str, Dict]] = None,
+                   source_names: Optional[Sequence[str]] = None,
+                   concurrency: Optional[Dict[str, int]] = None,
+                   timeouts: Optional[Dict[str, float]] = None,
+                   resume: bool = True,
+                   progress: Optional[Callable[[Dict], None]] = None) -> pd.DataFrame:
+    """
+    Fetch many artists from every configured platform into a partitioned ledger.
+
+    All (artist, platform) pairs are fetched concurrently through the source
+    registry, with at most `concurrency[platform]` (default: the source's
+    declared concurrency) in flight per platform. Each result is written to
+    its `ledger_store.LedgerStore` partition as soon as it arrives and the
+    pair is recorded as completed. Writes run off the event loop; a pair
+    whose write fails is reported as 'error' and left for the next run.
+    With `resume=True` pairs completed by an earlier (possibly crashed) run
+    are skipped.
+
+    Args:
+        store_path: LedgerStore directory
+        artists: Artists to ingest (default NIGERIAN_ARTISTS)
+        credentials: Credentials per source name
+        source_names: Ledger sources to fetch (default: those with credentials)
+        concurrency: Fetches in flight per source
+        timeouts: Seconds per fetch, per source
+        resume: Skip pairs already completed in the store
+        progress: Called with each pair's report row as it finishes
+
+    Returns:
+        One row per (artist, platform): status ('done' for pairs skipped on
+        resume), seconds, rows, cost and partition path
+    """
+    artists = list(NIGERIAN_ARTISTS if artists is None else artists)
+    creds = {SOURCES.get(name).name: value for name, value in (credentials or {}).items()}
+    if source_names is None:
+        source_names = [name for name, value in creds.items() if value]
+    selected = [source for source in dict.fromkeys(SOURCES.get(name) for name in source_names) if source.platform]
+    limits = {SOURCES.get(name).name: value for name, value in (concurrency or {}).items()}
+    deadlines = {SOURCES.get(name).name: value for name, value in (timeouts or {}).items()}
+
+    store = LedgerStore(store_path)
+    done = store.completed() if resume else {}
+    results = {}
+    pending = []
+    for artist in artists:
+        for source in selected:
+            entry = done.get((artist, source.platform))
+            if entry is not None:
+                results[(artist, source.platform)] = {'artist': artist, 'platform': source.platform, 'status': 'done',
+                                                      'seconds': 0.0, 'rows': entry.get('rows', 0), 'cost': 0.0,
+                                                      'path': entry.get('path')}
             else:
-                print(f"✗ No results found via web scraping for {artist_name}")
-                return pd.DataFrame()
-        except Exception as e:
-            print(f"✗ Web scraping failed: {e}")
-            return pd.DataFrame()
-    
-    else:
-        raise ValueError(f"Invalid data source '{source}'. Use 'spotify', 'youtube', or 'web'.")
+                pending.append((artist, source))
+
+    async def ingest():
+        semaphores = {source.name: asyncio.Semaphore(limits.get(source.name, source.concurrency))
+                      for source in selected}
+
+        def save(artist, platform, data, info):
+            path = None
+            if data is not None and not data.empty:
+                path = store.write(artist, platform, data)
+            store.mark_done(artist, platform, status=info['status'], rows=info['rows'], path=path)
+            return path
+
+        async def ingest_one(artist, source):
+            async with semaphores[source.name]:
+                data, info = await SOURCES.fetch_one(source.name, artist, creds.get(source.name),
+                                                     deadlines.get(source.name))
+            path = None
+            if info['status'] in _INGEST_DONE_STATUSES:
+                # Parquet encoding and the fsync'd manifest append would stall every other fetch on the loop
+                loop = asyncio.get_running_loop()
+                try:
+                    path = await loop.run_in_executor(None, save, artist, source.platform, data, info)
+                except Exception as e:
+                    # Not marked done, so a resumed run retries the pair
+                    print(f"✗ Writing {artist} / {source.platform} failed: {e}")
+                    info = {**info, 'status': 'error'}
+            row = {'artist': artist, 'platform': source.platform, **info, 'path': path}
+            results[(artist, source.platform)] = row
+            if progress is not None:
+                progress(row)
+
+        await asyncio.gather(*(ingest_one(artist, source) for artist, source in pending))
+
+    if pending:
+        # Fetch threads, plus one per platform for partition writes
+        workers = sum(limits.get(source.name, source.concurrency) + 1 for source in selected)
+        sources.run_sync(ingest(), max_workers=workers)
+    rows = [results[(artist, source.platform)] for artist in artists for source in selected]
+    return pd.DataFrame(rows, columns=_INGEST_COLUMNS)
 
 
 def enrich_data_with_web(df: pd.DataFrame, artist_name: str) -> pd.DataFrame:
@@ -158,6 +454,10 @@ def get_model_predictions(df: pd.DataFrame) -> Dict:
     """
     Run the TuneIQ GDP & Jobs model on the provided DataFrame.
     Uses ML model to predict economic impact from streaming data.
+    Requests go through the shared prediction service (see prediction_service):
+    identical inputs on Streamlit reruns are served from the prediction cache,
+    concurrent sessions asking for the same artist share one model run, and
+    distinct requests arriving together are scored in one batch.
     
     Args:
         df: DataFrame with streaming data (can be from API or web scraping)
@@ -177,7 +477,7 @@ def get_model_predictions(df: pd.DataFrame) -> Dict:
                 "confidence": None,
                 "error": "Input data is empty"
             }
-        return predict_impact(df)
+        return get_prediction_service().predict(df)
     except Exception as e:
         print(f"Model prediction failed: {e}")
         return {
@@ -185,4 +485,37 @@ def get_model_predictions(df: pd.DataFrame) -> Dict:
             "predicted_jobs": None,
             "confidence": None,
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-ingest artists from live platforms into a partitioned ledger")
+    parser.add_argument("store", help="ledger store directory")
+    parser.add_argument("--artists", nargs="+", help="artists to ingest (default: all Nigerian artists)")
+    parser.add_argument("--credentials", help="JSON file of credentials per source, e.g. {\"spotify\": {...}}")
+    parser.add_argument("--sources", nargs="+", help="sources to fetch (default: those with credentials)")
+    parser.add_argument("--concurrency", nargs="+", default=[], metavar="SOURCE=N",
+                        help="fetches in flight per source")
+    parser.add_argument("--no-resume", action="store_true", help="refetch pairs completed by earlier runs")
+    args = parser.parse_args(argv)
+
+    credentials = {}
+    if args.credentials:
+        with open(args.credentials) as f:
+            credentials = json.load(f)
+    concurrency = {name: int(value) for name, value in (item.split("=", 1) for item in args.concurrency)}
+
+    def progress(row):
+        print(f"{row['artist']} / {row['platform']}: {row['status']} ({row['rows']} rows, {row['seconds']:.1f}s)")
+
+    report = ingest_artists(args.store, args.artists, credentials, args.sources, concurrency,
+                            resume=not args.no_resume, progress=progress)
+    if report.empty:
+        print("Nothing to ingest: no sources selected and none with credentials")
+        return
+    print()
+    print(report.groupby(['platform', 'status'], observed=True).size().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ try:
     get_model_predictions = getattr(dp, "get_model_predictions")
     load_sample_data = getattr(dp, "load_sample_data")
     fetch_live_data = getattr(dp, "fetch_live_data")
+    SOURCES = getattr(dp, "SOURCES")
     na_mod = importlib.import_module("tuneiq_app.nigerian_artists")
     NIGERIAN_ARTISTS = getattr(na_mod, "NIGERIAN_ARTISTS")
 except Exception:
@@ -27,6 +28,7 @@ except Exception:
         get_model_predictions = getattr(dp, "get_model_predictions")
         load_sample_data = getattr(dp, "load_sample_data")
         fetch_live_data = getattr(dp, "fetch_live_data")
+        SOURCES = getattr(dp, "SOURCES")
         na_mod = importlib.import_module("nigerian_artists")
         NIGERIAN_ARTISTS = getattr(na_mod, "NIGERIAN_ARTISTS")
     except Exception as e:
@@ -201,12 +203,13 @@ def display_economic_impact_section():
                         st.warning(f"⚠️ No web data found for {artist_name}. Using sample data instead.")
                         df = load_sample_data()
                 else:
-                    # Spotify, Apple Music, or YouTube require API credentials
-                    if data_source == "Apple Music":
-                        source_lower = "apple_music"
-                    else:
-                        source_lower = data_source.lower()
-                    df = fetch_live_data(source=source_lower, artist_name=artist_name)
+                    # Spotify, Apple Music, or YouTube require the API credentials entered in Live Mode
+                    source = SOURCES.get(data_source)
+                    df = fetch_live_data(
+                        source=source.name,
+                        artist_name=artist_name,
+                        credentials=st.session_state.get(f"{source.name}_creds")
+                    )
                     if df.empty:
                         st.warning(
                             f"⚠️ No {data_source} data found. "
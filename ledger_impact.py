@@ -0,0 +1,108 @@
+"""
+Economic impact of a streaming ledger too large to load at once.
+
+Reads a CSV in chunks (or a Parquet file one row group at a time, or every
+partition of a `ledger_store.LedgerStore` directory), folds every
+chunk into a `models.ImpactAccumulator` and prints the `economic_impact_proxy`
+metrics plus per-country subtotals. The totals are identical to running
+`economic_impact_proxy` on the whole file.
+
+Ledgers shaped like `scraper/artist_tracks.csv` are accepted as-is:
+- UTF-7 encoded files (headers such as `last+AF8-updated`) are detected
+- a missing `reported_revenue_usd` column counts as unknown revenue (NaN)
+- 'Global' aggregate rows are dropped unless --keep-global is given, since
+  they repeat the per-country streams
+
+    python -m tuneiq_app.ledger_impact scraper/artist_tracks.csv --by-country
+"""
+
+import argparse
+import json
+import os
+import re
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from tuneiq_app.ledger_schema import coerce_ledger
+from tuneiq_app.ledger_store import LedgerStore
+from tuneiq_app.models import ImpactAccumulator
+
+CHUNK_ROWS = int(os.getenv("TUNEIQ_LEDGER_CHUNK_ROWS", "250000"))
+AGGREGATE_COUNTRIES = ("Global",)
+
+# '+' followed by modified base64 and '-': how UTF-7 escapes characters such as '_'
+_UTF7_ESCAPE = re.compile(rb"\+[A-Za-z0-9/]+-")
+
+
+def sniff_encoding(path: str) -> str:
+    """'utf-7' when the header line contains UTF-7 escapes, else 'utf-8'."""
+    with open(path, "rb") as handle:
+        header = handle.readline()
+    return "utf-7" if _UTF7_ESCAPE.search(header) else "utf-8"
+
+
+def read_ledger(path: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield a CSV, Parquet or LedgerStore ledger as DataFrames of at most about `chunk_rows` rows."""
+    if os.path.isdir(path):
+        for partition in LedgerStore(path).partitions():
+            yield from read_ledger(partition, chunk_rows)
+    elif path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, encoding=sniff_encoding(path))
+
+
+def prepare_chunk(df: pd.DataFrame, keep_aggregates: bool = False) -> pd.DataFrame:
+    """Fill in the columns `ImpactAccumulator` needs, drop aggregate rows and apply the ledger schema."""
+    if "reported_revenue_usd" not in df.columns:
+        df = df.assign(reported_revenue_usd=np.nan)
+    if not keep_aggregates:
+        df = df[~df["country"].isin(AGGREGATE_COUNTRIES)]
+    return coerce_ledger(df)
+
+
+def ledger_impact(path: str, chunk_rows: int = CHUNK_ROWS, keep_aggregates: bool = False,
+                  accumulator: Optional[ImpactAccumulator] = None) -> ImpactAccumulator:
+    """Accumulate the economic impact of every row in the ledger at `path`."""
+    if accumulator is None:
+        accumulator = ImpactAccumulator()
+    for chunk in read_ledger(path, chunk_rows):
+        accumulator.add(prepare_chunk(chunk, keep_aggregates))
+    return accumulator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Economic impact of a streaming ledger, read in chunks")
+    parser.add_argument("path", help="ledger CSV or Parquet file, or a ledger store directory")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument("--keep-global", action="store_true", help="keep 'Global' aggregate rows")
+    parser.add_argument("--by-country", action="store_true", help="also print per-country subtotals")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+    args = parser.parse_args(argv)
+
+    accumulator = ledger_impact(args.path, args.chunk_rows, args.keep_global)
+    impact = accumulator.result()
+    by_country = accumulator.by_country() if args.by_country else None
+
+    if args.json:
+        output = {"rows": accumulator.rows, "impact": impact}
+        if by_country is not None:
+            output["by_country"] = by_country.to_dict(orient="records")
+        print(json.dumps(output, indent=2, default=str))
+        return
+
+    print(f"Rows: {accumulator.rows:,}")
+    for name, value in impact.items():
+        print(f"{name:<28} ₦{value:,.2f}")
+    if by_country is not None:
+        print()
+        print(by_country.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
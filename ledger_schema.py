@@ -0,0 +1,107 @@
+"""
+Canonical in-memory schema for streaming ledgers.
+
+Every source (sample CSV, API fetchers, scraper ledgers) produces the same
+columns as object strings and int64/float64 numbers. `coerce_ledger` converts
+them to compact dtypes:
+- artist, track, platform, country: category (when values repeat; see
+  CATEGORY_MAX_RATIO)
+- month: period[M] ('2025-01' and '2025-01-15' both become 2025-01;
+  unparseable values such as 'Unknown' become NaT)
+- streams: uint32 when every value is a whole number in range, nullable
+  UInt32 when some are missing; left as-is otherwise
+- revenue columns: float64, or float32 with `revenue_dtype="float32"`
+
+Other columns are left untouched, and coercing an already coerced frame is
+cheap. Downstream code reads these columns through `to_numpy(dtype=...)`,
+`pd.factorize` and `groupby(..., observed=True)`, so both the compact and the
+original dtypes work.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = ["artist", "track", "platform", "country"]
+MONTH_COLUMN = "month"
+STREAMS_COLUMN = "streams"
+REVENUE_COLUMNS = ["reported_revenue_usd", "expected_revenue_usd", "expected_revenue_ngn", "actual_revenue_ngn"]
+
+# Strings become categories when there are at most this many distinct values per row
+CATEGORY_MAX_RATIO = 0.5
+
+_UINT32_MAX = np.iinfo(np.uint32).max
+
+
+def month_periods(month: pd.Series) -> pd.Series:
+    """Parse a month column to period[M], parsing each distinct value once."""
+    if isinstance(month.dtype, pd.PeriodDtype):
+        return month if month.dtype.freq.freqstr == "M" else month.dt.asfreq("M")
+    codes, uniques = pd.factorize(month)
+    parsed = pd.to_datetime(pd.Series(np.asarray(uniques, dtype=object)).astype(str), errors="coerce", format="mixed")
+    periods = parsed.dt.to_period("M").array
+    # Missing months (code -1) become NaT
+    return pd.Series(periods.take(codes, allow_fill=True), index=month.index, name=month.name)
+
+
+def compact_streams(streams: pd.Series) -> pd.Series:
+    """uint32 (or nullable UInt32 with missing values) when all values fit; else unchanged."""
+    if not pd.api.types.is_numeric_dtype(streams.dtype) or streams.dtype in (np.uint32, "UInt32"):
+        return streams
+    values = streams.to_numpy(dtype=np.float64, na_value=np.nan)
+    present = values[~np.isnan(values)]
+    if present.size and (present.min() < 0 or present.max() > _UINT32_MAX or not np.all(present == np.floor(present))):
+        return streams
+    if present.size == values.size:
+        return streams.astype(np.uint32)
+    return streams.astype("UInt32")
+
+
+def coerce_ledger(df: pd.DataFrame, revenue_dtype: str = "float64",
+                  categories: Optional[list] = None) -> pd.DataFrame:
+    """
+    Return `df` with the canonical ledger dtypes (a new frame; `df` is not modified).
+
+    Args:
+        df: Ledger rows from any source
+        revenue_dtype: "float64" (default) or "float32" for the revenue columns
+        categories: String columns to encode as categories (default CATEGORY_COLUMNS)
+    """
+    columns = {}
+    for name in CATEGORY_COLUMNS if categories is None else categories:
+        if name not in df.columns or isinstance(df[name].dtype, pd.CategoricalDtype):
+            continue
+        codes, uniques = pd.factorize(df[name])
+        if len(uniques) <= CATEGORY_MAX_RATIO * len(df) or len(df) < 2:
+            columns[name] = pd.Series(pd.Categorical.from_codes(codes, uniques), index=df.index, name=name)
+    if MONTH_COLUMN in df.columns:
+        columns[MONTH_COLUMN] = month_periods(df[MONTH_COLUMN])
+    if STREAMS_COLUMN in df.columns:
+        columns[STREAMS_COLUMN] = compact_streams(df[STREAMS_COLUMN])
+    for name in REVENUE_COLUMNS:
+        if name in df.columns and pd.api.types.is_float_dtype(df[name].dtype) and df[name].dtype != revenue_dtype:
+            columns[name] = df[name].astype(revenue_dtype)
+    return df.assign(**columns) if columns else df.copy(deep=False)
+
+
+def memory_report(df: pd.DataFrame, coerced: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Per-column dtype and deep memory (bytes) before and after `coerce_ledger`, with a total row.
+
+    The coerced month column is not a lossless re-encoding: unparseable months
+    ('Unknown') become NaT, so they count as missing (`notna()` filters drop them).
+    """
+    if coerced is None:
+        coerced = coerce_ledger(df)
+    before = df.memory_usage(index=False, deep=True)
+    after = coerced.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        "dtype_before": df.dtypes.astype(str),
+        "dtype_after": coerced.dtypes.astype(str),
+        "bytes_before": before,
+        "bytes_after": after,
+    })
+    report.loc["total"] = ["", "", before.sum(), after.sum()]
+    report["saved_pct"] = 100 * (1 - report["bytes_after"] / report["bytes_before"])
+    return report
@@ -0,0 +1,120 @@
+"""
+Partitioned on-disk streaming ledger for bulk ingestion.
+
+Each (artist, platform) fetch is stored as one Parquet file:
+
+    <root>/platform=<platform>/artist=<artist>/part-0.parquet
+
+Names are percent-encoded where they are not safe in a path. Partition
+files are written to a temporary name and renamed, so a crash never leaves
+a partial file. `_manifest.jsonl` then records the pair as completed, one
+JSON line per pair. A job interrupted between the two only redoes that pair.
+The pair's file is simply overwritten.
+
+`read` concatenates the partitions (optionally filtered by artist and
+platform) with the canonical ledger schema, and `ledger_impact` accepts a
+store directory as its ledger path.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+from tuneiq_app.ledger_schema import coerce_ledger
+
+MANIFEST_NAME = "_manifest.jsonl"
+PARTITION_FILE = "part-0.parquet"
+
+
+def _segment(key: str, value: str) -> str:
+    return f"{key}={quote(str(value), safe=' ()')}"
+
+
+class LedgerStore:
+    """
+    Partitioned Parquet ledger with a completion manifest.
+
+    Args:
+        root: Directory holding the partitions and the manifest (created if missing)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def partition_path(self, artist: str, platform: str) -> str:
+        return os.path.join(self.root, _segment("platform", platform), _segment("artist", artist), PARTITION_FILE)
+
+    def write(self, artist: str, platform: str, df: pd.DataFrame) -> str:
+        """Replace the (artist, platform) partition with `df`; returns its path."""
+        path = self.partition_path(artist, platform)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        coerce_ledger(df).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def mark_done(self, artist: str, platform: str, **info):
+        """Record (artist, platform) as completed, with any extra `info` (status, rows, ...)."""
+        entry = {"artist": artist, "platform": platform, "finished_at": time.time(), **info}
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            with open(self.manifest_path, "a+b") as handle:
+                # Start a fresh line after a line cut short by a crash
+                if handle.tell() > 0:
+                    handle.seek(-1, os.SEEK_END)
+                    if handle.read(1) != b"\n":
+                        line = "\n" + line
+                handle.write(line.encode("utf-8"))
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def completed(self) -> Dict[Tuple[str, str], Dict]:
+        """Latest manifest entry per completed (artist, platform) pair."""
+        done = {}
+        if not os.path.exists(self.manifest_path):
+            return done
+        with open(self.manifest_path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash: that pair is simply not completed
+                    continue
+                done[(entry["artist"], entry["platform"])] = entry
+        return done
+
+    def partitions(self, artists: Optional[Iterable[str]] = None,
+                   platforms: Optional[Iterable[str]] = None) -> List[str]:
+        """Paths of existing partition files, optionally restricted to some artists/platforms."""
+        paths = []
+        if not os.path.isdir(self.root):
+            return paths
+        wanted_platforms = None if platforms is None else {_segment("platform", p) for p in platforms}
+        wanted_artists = None if artists is None else {_segment("artist", a) for a in artists}
+        for platform_dir in sorted(os.listdir(self.root)):
+            if not platform_dir.startswith("platform=") or (wanted_platforms is not None and platform_dir not in wanted_platforms):
+                continue
+            for artist_dir in sorted(os.listdir(os.path.join(self.root, platform_dir))):
+                if wanted_artists is not None and artist_dir not in wanted_artists:
+                    continue
+                path = os.path.join(self.root, platform_dir, artist_dir, PARTITION_FILE)
+                if os.path.exists(path):
+                    paths.append(path)
+        return paths
+
+    def read(self, artists: Optional[Iterable[str]] = None,
+             platforms: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """All stored rows (optionally filtered) in the canonical ledger schema."""
+        frames = [pd.read_parquet(path) for path in self.partitions(artists, platforms)]
+        if not frames:
+            return pd.DataFrame()
+        # Partitions carry their own categories; concat falls back to object and coerce_ledger recompacts
+        return coerce_ledger(pd.concat(frames, ignore_index=True))
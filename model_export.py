@@ -0,0 +1,219 @@
+"""
+Export the TuneIQ GDP/Jobs model to a portable array format.
+
+The fitted scikit-learn estimator is converted into plain NumPy arrays that
+`predictor.CompiledModel` scores without scikit-learn or joblib, saved either
+as a single `.npz` file or as a directory of `.npy` files plus `meta.json`
+(the `npy` layout, which workers memory-map and share through the page cache):
+- Tree ensembles (random forests, extra trees, single decision trees) become
+  flattened node arrays (feature, threshold, children, leaf values) with one
+  root offset per tree.
+- Linear models become coefficient and intercept arrays.
+
+When training data is available, a table of residual quantiles is stored in
+the metadata so `predictor.predict_with_intervals` can attach prediction
+intervals to models that have no per-tree spread.
+
+Usage:
+    python -m tuneiq_app.model_export [--model PATH] [--layout npz|npy] [--out PATH] [--no-verify]
+                                      [--training-data CSV] [--target COLUMN]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from tuneiq_app.predictor import COMPILED_MODEL_DIR, COMPILED_MODEL_PATH, MODEL_PATH, load_compiled_model
+
+TRAINING_DATA_PATH = os.path.join(os.path.dirname(__file__), "sdfortrainingmodule.csv")
+TRAINING_TARGET = "Estimated_Jobs_Created"
+RESIDUAL_LEVELS = [round(level, 2) for level in np.linspace(0.05, 0.95, 19)]
+
+
+def _flatten_trees(estimators) -> Tuple[Dict[str, np.ndarray], int]:
+    """Concatenate fitted trees into global node arrays; child indices are offset per tree."""
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        left = tree.children_left.astype(np.int32)
+        right = tree.children_right.astype(np.int32)
+        # Leaves keep -1 so the scorer can recognise them
+        lefts.append(np.where(left == -1, -1, left + offset).astype(np.int32))
+        rights.append(np.where(right == -1, -1, right + offset).astype(np.int32))
+        features.append(tree.feature.astype(np.int32))
+        thresholds.append(tree.threshold.astype(np.float64))
+        # Regression leaves: (nodes, n_outputs, 1) -> (nodes, n_outputs)
+        values.append(np.asarray(tree.value[:, :, 0], dtype=np.float64))
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, int(tree.max_depth))
+
+    arrays = {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "children_left": np.concatenate(lefts),
+        "children_right": np.concatenate(rights),
+        "value": np.concatenate(values),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+    return arrays, max_depth
+
+
+def compile_estimator(model) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Convert a fitted regressor into (arrays, metadata) for `CompiledModel`.
+
+    Raises ValueError for estimators that have no array representation here
+    (e.g. classifiers or boosted ensembles).
+    """
+    if not hasattr(model, "feature_names_in_"):
+        raise ValueError("Model must be fitted on a DataFrame so feature names are known")
+    meta = {
+        "source_class": type(model).__name__,
+        "feature_names": [str(name) for name in model.feature_names_in_],
+        "n_outputs": int(getattr(model, "n_outputs_", 1)),
+    }
+
+    if hasattr(model, "tree_"):
+        estimators = [model]
+    elif hasattr(model, "estimators_") and all(hasattr(e, "tree_") for e in model.estimators_):
+        if hasattr(model, "learning_rate") or hasattr(model, "predict_proba"):
+            raise ValueError(f"{type(model).__name__} is not an averaging tree regressor")
+        estimators = list(model.estimators_)
+    elif hasattr(model, "coef_") and hasattr(model, "intercept_") and not hasattr(model, "predict_proba"):
+        coef = np.atleast_2d(np.asarray(model.coef_, dtype=np.float64))
+        intercept = np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64))
+        meta.update(kind="linear", n_outputs=coef.shape[0])
+        return {"coef": coef, "intercept": intercept}, meta
+    else:
+        raise ValueError(f"Cannot compile {type(model).__name__}: unsupported estimator type")
+
+    arrays, max_depth = _flatten_trees(estimators)
+    meta.update(kind="tree_ensemble", n_trees=len(estimators), max_depth=max_depth)
+    return arrays, meta
+
+
+def residual_quantiles(model, X, y, levels=RESIDUAL_LEVELS) -> Dict:
+    """Quantiles of (actual - predicted) for the first output, as {"levels", "residuals"}."""
+    predicted = np.asarray(model.predict(X), dtype=float).reshape(len(X), -1)[:, 0]
+    residuals = np.asarray(y, dtype=float) - predicted
+    return {"levels": list(levels), "residuals": np.quantile(residuals, levels).tolist()}
+
+
+def _load_training_data(path: str, feature_names, target: str):
+    import pandas as pd
+
+    frame = pd.read_csv(path).dropna(subset=list(feature_names) + [target])
+    return frame[list(feature_names)], frame[target]
+
+
+def _write_npz(path: str, arrays: Dict[str, np.ndarray], meta: Dict):
+    np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+
+
+def _write_npy_dir(path: str, arrays: Dict[str, np.ndarray], meta: Dict):
+    os.makedirs(path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _replace(tmp_path: str, out_path: str):
+    """Move a finished export into place, swapping out any previous one."""
+    if os.path.isdir(out_path):
+        old_path = out_path + ".old"
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(out_path, old_path)
+        os.replace(tmp_path, out_path)
+        shutil.rmtree(old_path, ignore_errors=True)
+    else:
+        os.replace(tmp_path, out_path)
+
+
+def export_model(model_path: str = MODEL_PATH, out_path: Optional[str] = None,
+                 verify: bool = True, layout: str = "npz",
+                 training_data: Optional[str] = None, target: str = TRAINING_TARGET) -> Dict:
+    """
+    Load a joblib model, write its compiled export and return the metadata.
+
+    `layout` is 'npz' (single file, default `COMPILED_MODEL_PATH`) or 'npy'
+    (memory-mappable directory, default `COMPILED_MODEL_DIR`). With `verify`,
+    predictions of the export are checked against the original estimator on
+    random inputs and the export is rejected if they differ. With
+    `training_data` (a CSV holding the feature columns and `target`), the
+    residual quantile table is stored as `meta["residual_quantiles"]`.
+    """
+    import joblib
+
+    if layout not in ("npz", "npy"):
+        raise ValueError(f"Unknown export layout '{layout}'. Use 'npz' or 'npy'.")
+    if out_path is None:
+        out_path = COMPILED_MODEL_PATH if layout == "npz" else COMPILED_MODEL_DIR
+
+    model = joblib.load(model_path)
+    arrays, meta = compile_estimator(model)
+    with open(model_path, "rb") as f:
+        meta["source_sha256"] = hashlib.sha256(f.read()).hexdigest()
+    if training_data:
+        X_train, y_train = _load_training_data(training_data, meta["feature_names"], target)
+        meta["residual_quantiles"] = residual_quantiles(model, X_train, y_train)
+
+    if layout == "npz":
+        tmp_path = out_path + ".tmp.npz"
+        _write_npz(tmp_path, arrays, meta)
+    else:
+        tmp_path = out_path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        _write_npy_dir(tmp_path, arrays, meta)
+
+    if verify:
+        import pandas as pd
+
+        rng = np.random.default_rng(0)
+        n_features = len(meta["feature_names"])
+        X = pd.DataFrame(rng.gamma(2.0, 50.0, size=(256, n_features)), columns=meta["feature_names"])
+        expected = np.asarray(model.predict(X))
+        actual = load_compiled_model(tmp_path, mmap_mode=None).predict(X)
+        if not np.array_equal(expected, actual):
+            if os.path.isdir(tmp_path):
+                shutil.rmtree(tmp_path)
+            else:
+                os.remove(tmp_path)
+            raise ValueError("Compiled model predictions differ from the source estimator")
+
+    _replace(tmp_path, out_path)
+    return meta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the TuneIQ model to NumPy arrays (.npz file or .npy directory)")
+    parser.add_argument("--model", default=MODEL_PATH, help="joblib model to export")
+    parser.add_argument("--layout", choices=("npz", "npy"), default="npz",
+                        help="single .npz file, or a memory-mappable directory of .npy files")
+    parser.add_argument("--out", default=None, help="destination (defaults next to the joblib model)")
+    parser.add_argument("--no-verify", action="store_true", help="skip the prediction equality check")
+    parser.add_argument("--training-data", default=TRAINING_DATA_PATH if os.path.exists(TRAINING_DATA_PATH) else None,
+                        help="CSV used to build the residual quantile table (default: sdfortrainingmodule.csv)")
+    parser.add_argument("--target", default=TRAINING_TARGET, help="target column in the training data")
+    args = parser.parse_args(argv)
+
+    out_path = args.out or (COMPILED_MODEL_PATH if args.layout == "npz" else COMPILED_MODEL_DIR)
+    meta = export_model(args.model, out_path, verify=not args.no_verify, layout=args.layout,
+                        training_data=args.training_data, target=args.target)
+    if os.path.isdir(out_path):
+        size = sum(os.path.getsize(os.path.join(out_path, name)) for name in os.listdir(out_path))
+    else:
+        size = os.path.getsize(out_path)
+    print(f"✓ Exported {meta['source_class']} ({meta['kind']}) to {out_path} ({size / 1024:,.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
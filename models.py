@@ -1,11 +1,25 @@
 """
 Models for TuneIQ Insight - handles revenue estimation, underpayment detection,
 and economic impact analysis.
+
+Royalties use the NGN_RATE / STREAM_RATES constants below unless a
+`rates.RateStore` is passed (or configured through TUNEIQ_FX_RATES_PATH and
+TUNEIQ_STREAM_RATES_PATH), in which case each row is valued at the exchange
+and per-stream rates in effect for its month.
+
+With `exact=True` amounts are Int64 minor units (cents/kobo) computed with
+integer arithmetic (see `money`), for reconciliation reports that must tie out.
 """
 
+import tracemalloc
+from fractions import Fraction
+
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
+
+from tuneiq_app import money
+from tuneiq_app.rates import RateStore, get_rate_store
 
 # Platform-specific streaming rates (USD)
 STREAM_RATES = {
@@ -14,89 +28,457 @@ STREAM_RATES = {
     'Apple Music': 0.01
 }
 
+# Rate applied to platforms missing from STREAM_RATES
+DEFAULT_STREAM_RATE = 0.003
+
 # USD to NGN conversion rate
 NGN_RATE = 850  # Example rate, should be updated regularly
 
-def estimate_royalties(df: pd.DataFrame) -> pd.DataFrame:
+# Domestic market for the cultural export value (country name and ISO code)
+HOME_COUNTRIES = ('Nigeria', 'NG')
+
+# Indirect revenue (merchandise, shows) per unit of streaming revenue
+INDIRECT_MULTIPLIER = 2.5
+
+# USD of cultural export value per foreign stream (rough proxy)
+CULTURAL_EXPORT_PER_STREAM_USD = 0.01
+
+def platform_rates(platform: pd.Series) -> np.ndarray:
+    """
+    Per-row USD stream rate for a platform column.
+
+    The column is encoded as a categorical (reused as-is when it already is one)
+    and rates are looked up from a small array indexed by the category codes.
+    Unknown and missing platforms get DEFAULT_STREAM_RATE.
+    """
+    platforms = platform if isinstance(platform.dtype, pd.CategoricalDtype) else platform.astype("category")
+    categories = platforms.cat.categories
+    # Trailing entry serves code -1 (missing platform)
+    lookup = np.array([STREAM_RATES.get(name, DEFAULT_STREAM_RATE) for name in categories] + [DEFAULT_STREAM_RATE],
+                      dtype=np.float64)
+    return lookup[platforms.cat.codes.to_numpy()]
+
+
+def _resolve_rates(rates: Optional[RateStore]) -> Optional[RateStore]:
+    return rates if rates is not None else get_rate_store()
+
+
+def _month_column(df: pd.DataFrame) -> pd.Series:
+    # Rows without a month are valued at the latest rates
+    return df['month'] if 'month' in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+
+def _add_royalty_columns(df: pd.DataFrame, rates: Optional[RateStore] = None, exact: bool = False) -> pd.DataFrame:
+    """Add the expected/actual revenue columns to `df` (modifies it) and return it."""
+    if rates is None:
+        stream_rate, ngn_rate = platform_rates(df['platform']), NGN_RATE
+    else:
+        stream_rate, ngn_rate = rates.lookup(_month_column(df), df['platform'], df['country'], "NGN")
+    if exact:
+        return _add_exact_royalty_columns(df, stream_rate, ngn_rate)
+
+    streams = df['streams'].to_numpy(dtype=np.float64)
+    df['expected_revenue_usd'] = streams * stream_rate
+    df['expected_revenue_ngn'] = df['expected_revenue_usd'] * ngn_rate
+    df['actual_revenue_ngn'] = df['reported_revenue_usd'] * ngn_rate
+    return df
+
+
+def _add_exact_royalty_columns(df: pd.DataFrame, stream_rate, ngn_rate) -> pd.DataFrame:
+    # Rates become fixed-point integers; every amount is rounded to minor units once
+    fx = money.scaled(np.broadcast_to(ngn_rate, len(df)), money.FX_SCALE)
+    streams = pd.array(df['streams'], dtype='Int64')
+    expected_usd = money.mul_div(streams, money.scaled(stream_rate, money.RATE_SCALE),
+                                 money.RATE_SCALE // money.MINOR_UNITS['USD'])
+    df['expected_revenue_usd'] = expected_usd
+    df['expected_revenue_ngn'] = money.convert(expected_usd, fx, 'USD', 'NGN')
+    df['actual_revenue_ngn'] = money.convert(money.to_minor(df['reported_revenue_usd'], 'USD'), fx, 'USD', 'NGN')
+    return df
+
+
+def estimate_royalties(df: pd.DataFrame, rates: Optional[RateStore] = None, exact: bool = False) -> pd.DataFrame:
     """
     Calculate expected revenue based on per-platform streaming rates.
     Returns DataFrame with new columns:
     - expected_revenue_usd: Calculated from streams * platform rate
     - expected_revenue_ngn: USD converted to NGN
     - actual_revenue_ngn: Reported revenue converted to NGN
+
+    With a rate store, rates are the ones in effect for each row's month.
+    With `exact`, the columns are Int64 cents/kobo; NGN amounts are converted
+    from the rounded USD amounts, as on a statement.
     """
-    df = df.copy()
-    
-    # Calculate expected revenue
-    df['expected_revenue_usd'] = df.apply(
-        lambda row: row['streams'] * STREAM_RATES.get(row['platform'], 0.003),
-        axis=1
-    )
-    
-    # Convert to NGN
-    df['expected_revenue_ngn'] = df['expected_revenue_usd'] * NGN_RATE
-    df['actual_revenue_ngn'] = df['reported_revenue_usd'] * NGN_RATE
-    
-    return df
+    return _add_royalty_columns(df.copy(), _resolve_rates(rates), exact)
 
-def detect_underpayment(df: pd.DataFrame, threshold: float = 0.15) -> pd.DataFrame:
+
+def underpayment_ratio(expected: np.ndarray, actual: np.ndarray):
     """
-    Compare actual vs expected revenue to identify potential underpayment.
-    threshold: Maximum acceptable deviation (e.g., 0.15 = 15% below expected)
-    
-    Returns DataFrame with underpaid regions, sorted by severity.
+    (underpayment_pct, valid) for arrays of expected and actual revenue.
+
+    `valid` marks rows whose ratio is defined: finite expected revenue above
+    zero and finite actual revenue. Other rows (e.g. zero-stream rows, whose
+    expected revenue is 0) get NaN instead of inf, so they never pass a
+    threshold or reach an aggregate.
     """
-    df = estimate_royalties(df)
-    
-    # Calculate underpayment percentage
-    df['underpayment_pct'] = (
-        (df['expected_revenue_ngn'] - df['actual_revenue_ngn']) 
-        / df['expected_revenue_ngn']
-    )
-    
+    valid = np.isfinite(expected) & (expected > 0) & np.isfinite(actual)
+    underpayment_pct = np.divide(expected - actual, expected, out=np.full(len(expected), np.nan), where=valid)
+    return underpayment_pct, valid
+
+
+def masked_rows_by_platform(df: pd.DataFrame, valid: np.ndarray) -> pd.Series:
+    """Rows left out of the underpayment math (not `valid`), counted per platform."""
+    platforms = pd.Series(df['platform'].to_numpy()[~valid], dtype=object).fillna('Unknown')
+    return platforms.value_counts().rename('masked_rows').rename_axis('platform')
+
+
+def underpayment_table(df: pd.DataFrame, threshold: float = 0.15) -> pd.DataFrame:
+    """
+    `detect_underpayment` for a frame that already has the royalty columns.
+
+    Only the columns the table needs are read, so no copy of `df` is made.
+    Exact (minor-unit) amount columns are summed as integers. Rows without a
+    defined underpayment ratio (see `underpayment_ratio`) are left out; their
+    per-platform counts are in the table's `attrs['masked_rows']` as a plain
+    {platform: count} dict (pandas compares attrs when concatenating or
+    merging, which a Series would break).
+    """
+    exact = money.is_exact(df['expected_revenue_ngn'])
+    na_value = {'na_value': np.nan} if exact else {}
+    expected = df['expected_revenue_ngn'].to_numpy(dtype=np.float64, **na_value)
+    actual = df['actual_revenue_ngn'].to_numpy(dtype=np.float64, **na_value)
+    underpayment_pct, valid = underpayment_ratio(expected, actual)
+
     # Filter for significant underpayments
-    underpaid = df[df['underpayment_pct'] > threshold].copy()
-    
+    underpaid = valid & (underpayment_pct > threshold)
+    rows = pd.DataFrame({
+        'country': df['country'].to_numpy()[underpaid],
+        'underpayment_pct': underpayment_pct[underpaid],
+        'expected_revenue_ngn': (df['expected_revenue_ngn'].array if exact else expected)[underpaid],
+        'actual_revenue_ngn': (df['actual_revenue_ngn'].array if exact else actual)[underpaid],
+        'streams': df['streams'].array[underpaid],
+    })
+
     # Group by country and calculate severity metrics
-    severity = underpaid.groupby('country').agg({
+    severity = rows.groupby('country').agg({
         'underpayment_pct': 'mean',
         'expected_revenue_ngn': 'sum',
         'actual_revenue_ngn': 'sum',
         'streams': 'sum'
     }).reset_index()
-    
+
     severity['lost_revenue_ngn'] = (
         severity['expected_revenue_ngn'] - severity['actual_revenue_ngn']
     )
-    
-    return severity.sort_values('lost_revenue_ngn', ascending=False)
 
-def economic_impact_proxy(df: pd.DataFrame) -> Dict:
+    severity = severity.sort_values('lost_revenue_ngn', ascending=False)
+    severity.attrs['masked_rows'] = {platform: int(count) for platform, count
+                                     in masked_rows_by_platform(df, valid).items()}
+    return severity
+
+
+def detect_underpayment(df: pd.DataFrame, threshold: float = 0.15,
+                        rates: Optional[RateStore] = None, exact: bool = False) -> pd.DataFrame:
     """
-    Approximate contribution to national creative economy.
-    Uses streaming data to estimate:
-    - Direct revenue (from streams)
-    - Indirect impact (merchandise, shows)
-    - Cultural export value
+    Compare actual vs expected revenue to identify potential underpayment.
+    threshold: Maximum acceptable deviation (e.g., 0.15 = 15% below expected)
     
-    Returns dict with impact metrics in NGN.
+    Returns DataFrame with underpaid regions, sorted by severity
+    (revenue totals in kobo with `exact`).
     """
-    df = estimate_royalties(df)
-    
+    return underpayment_table(estimate_royalties(df, rates, exact), threshold)
+
+
+# --- Exact sums ---
+# Sums of float columns are exact (then rounded once), so they do not depend on row
+# order or on how the rows are split into chunks. Each finite float is mantissa * 2**exp
+# with a 53-bit integer mantissa; mantissas are split into 26-bit halves and summed per
+# (group, exponent) with bincount, where float64 partial sums stay exact below 2**53.
+_EXP_BINS = 2100          # frexp exponents -1073..1024, shifted to 0..2097
+_EXACT_SCALE = 1126       # group totals are integers in units of 2**-1126
+_EXACT_CHUNK = 1 << 26    # rows per bincount pass keeps every partial sum below 2**53
+
+
+def _exact_group_sums(values: np.ndarray, codes: np.ndarray, n_groups: int) -> List[int]:
+    """Exact per-group sums of `values` (NaN skipped) as integers in units of 2**-_EXACT_SCALE."""
+    totals = [0] * n_groups
+    for start in range(0, len(values), _EXACT_CHUNK):
+        part = np.asarray(values[start:start + _EXACT_CHUNK], dtype=np.float64)
+        group = codes[start:start + _EXACT_CHUNK]
+        finite = np.isfinite(part) & (part != 0)
+        mantissa, exponent = np.frexp(part[finite])
+        mantissa = (mantissa * 2.0 ** 53).astype(np.int64)
+        bins = group[finite].astype(np.int64) * _EXP_BINS + (exponent + 1073)
+        size = n_groups * _EXP_BINS
+        high = np.bincount(bins, weights=mantissa >> 26, minlength=size)
+        low = np.bincount(bins, weights=mantissa & ((1 << 26) - 1), minlength=size)
+        for index in np.flatnonzero((high != 0) | (low != 0)):
+            g, shift = divmod(int(index), _EXP_BINS)
+            # value = mantissa * 2**(exp - 53) = mantissa * 2**(shift - _EXACT_SCALE)
+            totals[g] += ((int(high[index]) << 26) + int(low[index])) << shift
+    return totals
+
+
+def _exact_to_float(total: int) -> float:
+    """Round an exact total (units of 2**-_EXACT_SCALE) to the nearest float."""
+    return float(Fraction(total, 1 << _EXACT_SCALE))
+
+
+class ImpactAccumulator:
+    """
+    Running `economic_impact_proxy` over a stream of DataFrame chunks.
+
+    Keeps exact per-country totals of streams, expected/actual revenue and the
+    cultural-export base, so memory depends on the number of countries, not
+    rows, and the result is identical however the rows are chunked (and to
+    `economic_impact_proxy` on the concatenated frame).
+
+    Args:
+        rates: Rate store used to price chunks (defaults as in `estimate_royalties`)
+        exact: Accumulate Int64 minor units (see `estimate_royalties`); results
+            are then integer kobo
+    """
+
+    FIELDS = ('streams', 'expected_revenue_ngn', 'actual_revenue_ngn', 'export_base')
+
+    def __init__(self, rates: Optional[RateStore] = None, exact: bool = False):
+        self.rates = _resolve_rates(rates)
+        self.exact = exact
+        self.rows = 0
+        self._countries: Dict[object, List[int]] = {}
+
+    def add(self, df: pd.DataFrame) -> 'ImpactAccumulator':
+        """Fold one chunk into the totals (priced here unless it has the royalty columns)."""
+        if df.empty:
+            return self
+        if 'actual_revenue_ngn' not in df.columns:
+            df = _add_royalty_columns(df.copy(deep=False), self.rates, self.exact)
+        elif money.is_exact(df['actual_revenue_ngn']) != self.exact:
+            raise ValueError("Royalty columns were priced in a different money mode than the accumulator")
+
+        codes, countries = pd.factorize(df['country'])
+        # Missing countries get their own trailing group
+        codes[codes < 0] = len(countries)
+        countries = list(countries) + [None]
+        home = df['country'].isin(HOME_COUNTRIES).to_numpy()
+        if self.exact:
+            sums = self._exact_money_sums(df, home, codes, len(countries))
+        else:
+            streams = df['streams'].to_numpy(dtype=np.float64)
+            # Foreign streams, or their NGN value per stream when the rate varies by month
+            if self.rates is None:
+                export_base = streams.copy()
+            else:
+                export_base = streams * self.rates.fx_rates(_month_column(df), "NGN")
+            export_base[home] = 0.0
+            columns = (streams, df['expected_revenue_ngn'].to_numpy(dtype=np.float64),
+                       df['actual_revenue_ngn'].to_numpy(dtype=np.float64), export_base)
+            sums = [_exact_group_sums(values, codes, len(countries)) for values in columns]
+        present = np.bincount(codes, minlength=len(countries)) > 0
+        for g in np.flatnonzero(present):
+            totals = self._countries.setdefault(countries[g], [0] * len(self.FIELDS))
+            for f in range(len(self.FIELDS)):
+                totals[f] += sums[f][g]
+        self.rows += len(df)
+        return self
+
+    def _exact_money_sums(self, df: pd.DataFrame, home: np.ndarray, codes: np.ndarray, n_groups: int) -> List[List[int]]:
+        streams = pd.array(df['streams'], dtype='Int64')
+        # Cultural export value in kobo per row: foreign streams at the export rate, converted at the row's rate
+        fx_rate = NGN_RATE if self.rates is None else self.rates.fx_rates(_month_column(df), "NGN")
+        fx = money.scaled(np.broadcast_to(fx_rate, len(df)), money.FX_SCALE)
+        per_stream = Fraction(str(CULTURAL_EXPORT_PER_STREAM_USD)) * money.MINOR_UNITS['USD']
+        export_usd = money.mul_div(streams, per_stream.numerator, per_stream.denominator)
+        export_value = money.convert(export_usd, fx, 'USD', 'NGN')
+        export_value[home] = 0
+        columns = (streams, df['expected_revenue_ngn'].array, df['actual_revenue_ngn'].array, export_value)
+        return [money.group_sums(values, codes, n_groups) for values in columns]
+
+    def _value(self, total: int):
+        # Exact mode keeps integer streams and kobo; otherwise totals are in units of 2**-_EXACT_SCALE
+        return total if self.exact else _exact_to_float(total)
+
+    def _total(self, field: str):
+        f = self.FIELDS.index(field)
+        return self._value(sum(totals[f] for totals in self._countries.values()))
+
+    def _export_value(self, export_base):
+        if self.exact:
+            return export_base
+        if self.rates is None:
+            return export_base * CULTURAL_EXPORT_PER_STREAM_USD * NGN_RATE
+        return export_base * CULTURAL_EXPORT_PER_STREAM_USD
+
+    def result(self) -> Dict:
+        """The `economic_impact_proxy` dict for all rows added so far."""
+        # Direct streaming revenue
+        direct_revenue = self._total('actual_revenue_ngn')
+
+        # Estimate indirect revenue (typically 2-3x streaming revenue)
+        if self.exact:
+            indirect_revenue = money.round_fraction(direct_revenue, INDIRECT_MULTIPLIER)
+        else:
+            indirect_revenue = direct_revenue * INDIRECT_MULTIPLIER
+
+        # Cultural export value (non-Nigerian streams have additional impact)
+        cultural_export_value = self._export_value(self._total('export_base'))  # Rough proxy
+
+        return {
+            'direct_revenue_ngn': direct_revenue,
+            'indirect_revenue_ngn': indirect_revenue,
+            'cultural_export_value_ngn': cultural_export_value,
+            'total_economic_impact_ngn': direct_revenue + indirect_revenue + cultural_export_value
+        }
+
+    def by_country(self) -> pd.DataFrame:
+        """Per-country subtotals: streams, expected/actual revenue and cultural export value (NGN)."""
+        rows = []
+        for country, totals in self._countries.items():
+            values = dict(zip(self.FIELDS, (self._value(t) for t in totals)))
+            rows.append({
+                'country': country,
+                'streams': values['streams'],
+                'expected_revenue_ngn': values['expected_revenue_ngn'],
+                'actual_revenue_ngn': values['actual_revenue_ngn'],
+                'cultural_export_value_ngn': self._export_value(values['export_base']),
+            })
+        table = pd.DataFrame(rows, columns=['country', 'streams', 'expected_revenue_ngn', 'actual_revenue_ngn',
+                                            'cultural_export_value_ngn'])
+        if self.exact:
+            table = table.astype({name: 'Int64' for name in table.columns[1:]})
+        return table.sort_values('actual_revenue_ngn', ascending=False, kind='stable').reset_index(drop=True)
+
+
+# Below this many rows float impact sums are plain float sums: the exact sums' fixed
+# overhead dominates there (dashboard-sized frames), and chunking doesn't apply
+_EXACT_SUM_MIN_ROWS = 1000
+
+
+def _float_impact_summary(df: pd.DataFrame, rates: Optional[RateStore]) -> Dict:
+    """`impact_summary` with plain float sums, for small frames."""
     # Direct streaming revenue
-    direct_revenue = df['actual_revenue_ngn'].sum()
-    
+    direct_revenue = float(df['actual_revenue_ngn'].sum())
+
     # Estimate indirect revenue (typically 2-3x streaming revenue)
-    indirect_multiplier = 2.5
-    indirect_revenue = direct_revenue * indirect_multiplier
-    
+    indirect_revenue = direct_revenue * INDIRECT_MULTIPLIER
+
     # Cultural export value (non-Nigerian streams have additional impact)
-    foreign_streams = df[df['country'] != 'Nigeria']['streams'].sum()
-    cultural_export_value = foreign_streams * 0.01 * NGN_RATE  # Rough proxy
-    
+    foreign = ~df['country'].isin(HOME_COUNTRIES)
+    if rates is None:
+        foreign_streams = float(df['streams'][foreign].sum())
+        cultural_export_value = foreign_streams * CULTURAL_EXPORT_PER_STREAM_USD * NGN_RATE  # Rough proxy
+    else:
+        ngn_rate = pd.Series(rates.fx_rates(_month_column(df), "NGN"), index=df.index)
+        cultural_export_value = float((df['streams'][foreign] * ngn_rate[foreign]).sum()) * CULTURAL_EXPORT_PER_STREAM_USD
+
     return {
         'direct_revenue_ngn': direct_revenue,
         'indirect_revenue_ngn': indirect_revenue,
         'cultural_export_value_ngn': cultural_export_value,
         'total_economic_impact_ngn': direct_revenue + indirect_revenue + cultural_export_value
-    }
\ No newline at end of file
+    }
+
+
+def impact_summary(df: pd.DataFrame, rates: Optional[RateStore] = None) -> Dict:
+    """`economic_impact_proxy` for a frame that already has the royalty columns (float or exact)."""
+    exact = money.is_exact(df['actual_revenue_ngn'])
+    if not exact and len(df) < _EXACT_SUM_MIN_ROWS:
+        return _float_impact_summary(df, _resolve_rates(rates))
+    return ImpactAccumulator(rates, exact).add(df).result()
+
+
+def economic_impact_proxy(df: pd.DataFrame, rates: Optional[RateStore] = None, exact: bool = False) -> Dict:
+    """
+    Approximate contribution to national creative economy.
+    Uses streaming data to estimate:
+    - Direct revenue (from streams)
+    - Indirect impact (merchandise, shows)
+    - Cultural export value
+    
+    Returns dict with impact metrics in NGN (integer kobo with `exact`).
+    Float frames under 1000 rows use plain float sums, which may differ from
+    `economic_impact_proxy_chunked` in the last bit.
+    """
+    if not exact and len(df) < _EXACT_SUM_MIN_ROWS:
+        rates = _resolve_rates(rates)
+        return _float_impact_summary(_add_royalty_columns(df.copy(deep=False), rates, exact), rates)
+    return ImpactAccumulator(rates, exact).add(df).result()
+
+
+def economic_impact_proxy_chunked(chunks: Iterable[pd.DataFrame], rates: Optional[RateStore] = None,
+                                  accumulator: Optional[ImpactAccumulator] = None, exact: bool = False) -> Dict:
+    """
+    `economic_impact_proxy` over an iterator of DataFrames in constant memory.
+
+    `chunks` can be `pd.read_csv(path, chunksize=...)`, Parquet row groups or
+    any iterable of frames; the result is identical to `economic_impact_proxy`
+    on all rows at once. Pass an `ImpactAccumulator` to also read per-country
+    subtotals (`accumulator.by_country()`) afterwards.
+    """
+    if accumulator is None:
+        accumulator = ImpactAccumulator(rates, exact)
+    for chunk in chunks:
+        accumulator.add(chunk)
+    return accumulator.result()
+
+
+class RoyaltyAnalysis:
+    """
+    Royalty columns, underpayment table and impact metrics computed in one pass.
+
+    Attributes:
+        frame: Input rows plus expected_revenue_usd, expected_revenue_ngn and
+            actual_revenue_ngn (the output of `estimate_royalties`)
+        underpayment: Same table as `detect_underpayment(frame, threshold)`
+        impact: Same dict as `economic_impact_proxy(frame)`
+        masked_rows: Rows left out of the underpayment table (zero or missing
+            expected revenue, missing actual revenue), counted per platform
+        peak_memory_bytes: Allocation high-water mark of the analysis above the
+            memory in use when it started (None unless `track_memory` was set)
+    """
+
+    def __init__(self, frame: pd.DataFrame, underpayment: pd.DataFrame, impact: Dict,
+                 peak_memory_bytes: Optional[int] = None):
+        self.frame = frame
+        self.underpayment = underpayment
+        self.impact = impact
+        self.masked_rows = pd.Series(underpayment.attrs.get('masked_rows') or {}, dtype='int64',
+                                     name='masked_rows').rename_axis('platform')
+        self.peak_memory_bytes = peak_memory_bytes
+
+
+def analyze_royalties(df: pd.DataFrame, threshold: float = 0.15, inplace: bool = False,
+                      track_memory: bool = False, rates: Optional[RateStore] = None,
+                      exact: bool = False) -> RoyaltyAnalysis:
+    """
+    Derive royalties once and build the underpayment table and impact dict from them.
+
+    Args:
+        df: Streaming rows with platform, country, streams and reported_revenue_usd
+        threshold: Underpayment threshold, as in `detect_underpayment`
+        inplace: Add the royalty columns to `df` itself. Otherwise they are added
+            to a shallow copy: `df` is left unchanged and its existing columns are
+            shared, not duplicated (in-place writes to those shared columns are
+            visible through both frames)
+        track_memory: Measure the allocation high-water mark with tracemalloc
+        rates: Time-versioned rates; defaults to the configured store, else the constants
+        exact: Integer minor-unit amounts, as in `estimate_royalties`
+
+    Returns:
+        RoyaltyAnalysis
+    """
+    tracing = track_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    if track_memory:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    try:
+        rates = _resolve_rates(rates)
+        frame = _add_royalty_columns(df if inplace else df.copy(deep=False), rates, exact)
+        analysis = RoyaltyAnalysis(frame, underpayment_table(frame, threshold), impact_summary(frame, rates))
+        if track_memory:
+            analysis.peak_memory_bytes = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    return analysis
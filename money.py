@@ -0,0 +1,115 @@
+"""
+Exact money arithmetic for royalty reconciliation.
+
+In exact mode (`exact=True` on the `models` royalty functions) amounts are
+pandas nullable Int64 arrays of minor units: cents for USD, kobo for NGN (see
+MINOR_UNITS). Rates are fixed-point integers: per-stream rates in units of
+1/RATE_SCALE USD, exchange rates in units of 1/FX_SCALE. All operations are
+integer array operations, with no per-row Python objects:
+- products are `mul_div`: value * numerator / denominator, rounded half to
+  even once, computed via divmod so intermediates stay inside int64
+- sums of any number of rows are exact (`group_sums` returns Python ints)
+
+Divide by MINOR_UNITS[currency] (`to_major`) to get amounts for display.
+"""
+
+from fractions import Fraction
+from math import gcd
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Minor units per major unit
+MINOR_UNITS = {"USD": 100, "NGN": 100}
+
+# Fixed-point scales: per-stream rates in nano-USD, exchange rates in millionths
+RATE_SCALE = 10 ** 9
+FX_SCALE = 10 ** 6
+
+_INT64_MAX = np.iinfo(np.int64).max
+_SUM_CHUNK = 1 << 20  # rows per bincount pass keeps 32-bit halves exact in float64
+
+
+def is_exact(amounts) -> bool:
+    """Whether an amount column holds integer minor units (exact mode)."""
+    return pd.api.types.is_integer_dtype(amounts.dtype)
+
+
+def _unmask(values) -> Tuple[np.ndarray, np.ndarray]:
+    """(int64 data with NA as 0, NA mask) for an integer array or Series."""
+    values = pd.array(values, dtype="Int64") if not isinstance(values, pd.arrays.IntegerArray) else values
+    mask = np.asarray(values.isna())
+    return values.to_numpy(dtype=np.int64, na_value=0), mask
+
+
+def to_minor(amounts, currency: str = "USD") -> pd.arrays.IntegerArray:
+    """Float amounts in major units to Int64 minor units (half to even); NaN becomes NA."""
+    major = np.asarray(amounts, dtype=np.float64)
+    mask = np.isnan(major)
+    minor = np.rint(np.where(mask, 0.0, major) * MINOR_UNITS[currency]).astype(np.int64)
+    return pd.arrays.IntegerArray(minor, mask)
+
+
+def to_major(amounts, currency: str = "NGN") -> np.ndarray:
+    """Minor units to float major units (NaN for NA), e.g. for display."""
+    return pd.array(amounts, dtype="Int64").to_numpy(dtype=np.float64, na_value=np.nan) / MINOR_UNITS[currency]
+
+
+def scaled(rates, scale: int) -> np.ndarray:
+    """Float rates to fixed-point int64 at `scale` (nearest integer)."""
+    return np.rint(np.asarray(rates, dtype=np.float64) * scale).astype(np.int64)
+
+
+def mul_div(values, numerator, denominator: int) -> pd.arrays.IntegerArray:
+    """
+    values * numerator / denominator per element, rounded half to even.
+
+    `values` is an integer array (NA propagates) and `numerator` an int64 scalar
+    or array. With q, r = divmod(values, denominator) the product is
+    q * numerator + r * numerator / denominator, so no intermediate exceeds
+    denominator * |numerator| or the result itself; OverflowError is raised
+    when those bounds do not fit in int64.
+    """
+    data, mask = _unmask(values)
+    numerator = np.asarray(numerator, dtype=np.int64)
+    numerator_max = int(np.abs(numerator).max()) if numerator.size else 0
+    data_max = int(np.abs(data).max()) if data.size else 0
+    if denominator * numerator_max > _INT64_MAX or (data_max // denominator + 1) * numerator_max > _INT64_MAX:
+        raise OverflowError("Money product does not fit in int64 minor units")
+
+    quotient, remainder = np.divmod(data, denominator)
+    whole, fraction = np.divmod(remainder * numerator, denominator)
+    result = quotient * numerator + whole
+    # fraction / denominator is in [0, 1): round up past one half, and at one half to even
+    twice = 2 * fraction
+    result += (twice > denominator) | ((twice == denominator) & (result % 2 == 1))
+    return pd.arrays.IntegerArray(result, mask.copy())
+
+
+def convert(amounts, fx_scaled, source: str = "USD", target: str = "NGN") -> pd.arrays.IntegerArray:
+    """Minor units of `source` to minor units of `target` at fixed-point rates (target per source)."""
+    source_units, target_units = MINOR_UNITS[source], MINOR_UNITS[target]
+    common = gcd(source_units, target_units)
+    numerator = np.asarray(fx_scaled, dtype=np.int64) * (target_units // common)
+    return mul_div(amounts, numerator, FX_SCALE * (source_units // common))
+
+
+def group_sums(values, codes: np.ndarray, n_groups: int) -> List[int]:
+    """Exact per-group sums of integer amounts (NA skipped) as Python ints."""
+    data, _ = _unmask(values)
+    totals = [0] * n_groups
+    for start in range(0, len(data), _SUM_CHUNK):
+        part = data[start:start + _SUM_CHUNK]
+        group = codes[start:start + _SUM_CHUNK]
+        # value = high * 2**32 + low with 0 <= low < 2**32
+        high = np.bincount(group, weights=part >> 32, minlength=n_groups)
+        low = np.bincount(group, weights=part & 0xFFFFFFFF, minlength=n_groups)
+        for g in np.flatnonzero((high != 0) | (low != 0)):
+            totals[g] += (int(high[g]) << 32) + int(low[g])
+    return totals
+
+
+def round_fraction(value: int, factor) -> int:
+    """An exact integer total times a decimal factor, rounded half to even."""
+    return round(Fraction(value) * Fraction(str(factor)))
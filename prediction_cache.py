@@ -0,0 +1,219 @@
+"""
+Prediction result cache for TuneIQ Insight.
+
+Memoizes `predictor.predict_impact` so dashboard reruns and repeated button
+presses with the same inputs are a lookup instead of a model run. Entries are
+keyed on a hash of the prepared feature vector, the raw stream total, the model
+file fingerprint and the TUNEIQ_* heuristic settings, held in a bounded LRU with
+a TTL, and optionally persisted to SQLite so other processes can reuse them.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from tuneiq_app import predictor
+
+# In-memory entries kept, seconds an entry stays valid, optional SQLite file for the disk tier
+CACHE_MAX_ENTRIES = int(os.getenv("TUNEIQ_PREDICTION_CACHE_SIZE", "256"))
+CACHE_TTL_SECONDS = float(os.getenv("TUNEIQ_PREDICTION_CACHE_TTL", "600"))
+CACHE_DB_PATH = os.getenv("TUNEIQ_PREDICTION_CACHE_PATH") or None
+
+# Module-level predictor settings that change predict_impact output for the same features
+HEURISTIC_SETTINGS = (
+    "GDP_PER_STREAM",
+    "JOB_PER_GDP",
+    "AUTO_SCALE_THRESHOLD_STREAMS",
+    "AUTO_SCALE_FACTOR",
+    "MIN_GDP_DISPLAY",
+    "INTERVAL_COVERAGE",
+)
+
+
+class PredictionCache:
+    """
+    Bounded LRU of prediction dicts with per-entry TTL and an optional SQLite tier.
+
+    Memory lookups fall through to the database (when `path` is set); disk hits
+    are promoted back into memory. Counters are available from `stats()`.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS,
+                 path: Optional[str] = CACHE_DB_PATH):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached result for `key`, or None if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(value)
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM predictions WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.disk_hits += 1
+                    return dict(value)
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict):
+        """Store `value` under `key` in memory (and on disk when enabled)."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, dict(value), expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO predictions (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value: Dict, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry from memory and disk and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM predictions")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Return the process-wide prediction cache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = PredictionCache()
+    return _default_cache
+
+
+def _stable_fingerprint(model) -> Optional[str]:
+    """Fingerprint valid across processes and over time, or None if the model has none."""
+    if model is None:
+        return "heuristic"
+    if model is predictor.get_model():
+        return predictor.model_fingerprint()
+    return None
+
+
+def is_cacheable(model) -> bool:
+    """
+    Whether predictions from `model` may be cached.
+
+    Only the heuristic and the registry model (identified by its file hash)
+    qualify. Ad-hoc models can only be told apart by `id()`, which is reused
+    after garbage collection and across processes, so caching them could
+    serve another model's predictions.
+    """
+    return _stable_fingerprint(model) is not None
+
+
+def _model_fingerprint(model) -> str:
+    """Identify the model behind a prediction (content hash for the registry model)."""
+    fingerprint = _stable_fingerprint(model)
+    if fingerprint is not None:
+        return fingerprint
+    # Only unique while `model` is alive: good for coalescing in-flight requests, never for caching
+    return f"object-{id(model)}"
+
+
+def prediction_key(df: pd.DataFrame, model=None) -> str:
+    """Hash of the prepared feature vector, model fingerprint and heuristic settings."""
+    X, _, feature_order, total_streams = predictor.build_feature_matrix(df, model=model)
+    return feature_key(X, feature_order, total_streams, model=model)
+
+
+def feature_key(X: np.ndarray, feature_order, total_streams, model=None) -> str:
+    """`prediction_key` for a feature block already built with `predictor.build_feature_matrix`."""
+    digest = hashlib.sha256()
+    digest.update(_model_fingerprint(model).encode())
+    digest.update(json.dumps(feature_order).encode())
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.asarray(total_streams, dtype=np.float64).tobytes())
+    settings = {name: getattr(predictor, name) for name in HEURISTIC_SETTINGS}
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def cached_predict_impact(df: pd.DataFrame, model=None, cache: Optional[PredictionCache] = None) -> Dict:
+    """
+    `predictor.predict_impact` with memoization.
+
+    Failed predictions (non-empty `error`) are returned but never cached, and
+    models without a stable fingerprint (see `is_cacheable`) bypass the cache.
+    """
+    if model is None:
+        model = predictor.get_model()
+    if not is_cacheable(model):
+        return predictor.predict_impact(df, model=model)
+    if cache is None:
+        cache = get_prediction_cache()
+
+    key = prediction_key(df, model=model)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    result = predictor.predict_impact(df, model=model)
+    if not result.get("error"):
+        cache.set(key, result)
+    return result
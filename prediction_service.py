@@ -0,0 +1,291 @@
+"""
+In-process prediction service for TuneIQ Insight.
+
+Wraps `predictor` for callers that ask for predictions concurrently (several
+Streamlit sessions, a CLI run over many artists):
+- Identical requests in flight at the same time share one computation. Requests
+  are identified by their prepared feature vector (`prediction_cache.feature_key`),
+  so two frames that produce the same features are treated as the same request.
+- Distinct requests arriving within a short window are scored together with one
+  `model.predict` call (`predictor.predict_features_many`).
+- Results already in the prediction cache are returned without queueing, and
+  new results are added to it.
+
+`submit` returns a `concurrent.futures.Future`; `predict` blocks for the result
+and `predict_async` awaits it from asyncio code.
+
+Usage:
+    python -m tuneiq_app.prediction_service [--csv PATH] [--by artist] [--artist NAME ...] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tuneiq_app import predictor
+from tuneiq_app.prediction_cache import PredictionCache, feature_key, get_prediction_cache, is_cacheable
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for more requests after the first one of a batch, and the batch size cap
+BATCH_WINDOW_SECONDS = float(os.getenv("TUNEIQ_PREDICTION_BATCH_WINDOW", "0.01"))
+MAX_BATCH_SIZE = int(os.getenv("TUNEIQ_PREDICTION_MAX_BATCH", "64"))
+
+
+def _empty_result(error: str) -> Dict:
+    return {
+        "predicted_gdp": None,
+        "predicted_jobs": None,
+        "confidence": None,
+        "error": error,
+    }
+
+
+def _as_result(row: pd.Series) -> Dict:
+    """Convert a `predict_features_many` row into the dict `predict_impact` returns."""
+    def number(value, cast=float):
+        return None if value is None or pd.isna(value) else cast(value)
+
+    return {
+        "predicted_gdp": number(row["predicted_gdp"]),
+        "predicted_jobs": number(row["predicted_jobs"], int),
+        "confidence": number(row["confidence"]),
+        "error": row["error"] if isinstance(row["error"], str) else None,
+        "estimation": bool(row["estimation"]),
+        "auto_scaled": bool(row["auto_scaled"]),
+        "predicted_gdp_lower": number(row["predicted_gdp_lower"]),
+        "predicted_gdp_upper": number(row["predicted_gdp_upper"]),
+    }
+
+
+class _Request:
+    __slots__ = ("key", "model", "features", "feature_order", "total_streams", "future", "cacheable")
+
+    def __init__(self, key: str, model, features: np.ndarray, feature_order: List[str], total_streams: float,
+                 future: Future, cacheable: bool = True):
+        self.key = key
+        # The model that built `features`; it also scores them, even if the registry reloads meanwhile
+        self.model = model
+        self.cacheable = cacheable
+        self.features = features
+        self.feature_order = feature_order
+        self.total_streams = total_streams
+        self.future = future
+
+
+class PredictionService:
+    """
+    Coalescing, micro-batching front end to the predictor.
+
+    Args:
+        model: Model to score with; defaults to the registry model (`predictor.get_model()`),
+            resolved per request so reloads are picked up. A request is always scored
+            by the model it was prepared with.
+        window: Seconds a batch stays open for more requests after its first one
+        max_batch: Requests scored per `model.predict` call at most
+        cache: Prediction cache to read and fill; defaults to the process-wide cache,
+            pass False to disable
+    """
+
+    def __init__(self, model=None, window: float = BATCH_WINDOW_SECONDS,
+                 max_batch: int = MAX_BATCH_SIZE, cache: Optional[PredictionCache] = None):
+        self.model = model
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self.cache = get_prediction_cache() if cache is None else (cache or None)
+        self._pending: List[_Request] = []
+        self._in_flight: Dict[str, Future] = {}
+        self._cond = threading.Condition()
+        self._worker = None
+        self._closed = False
+        self.requests = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.batches = 0
+        self.batched_rows = 0
+
+    # --- Public API ---
+
+    def submit(self, df: pd.DataFrame) -> Future:
+        """Queue a prediction for one artist's streaming frame and return its future."""
+        future = Future()
+        if df is None or df.empty:
+            future.set_result(_empty_result("Input data is empty"))
+            return future
+
+        model = self.model if self.model is not None else predictor.get_model()
+        X, _, feature_order, total_streams = predictor.build_feature_matrix(df, model=model)
+        key = feature_key(X, feature_order, total_streams, model=model)
+        cacheable = self.cache is not None and is_cacheable(model)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PredictionService is closed")
+            self.requests += 1
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                self.coalesced += 1
+                return shared
+            cached = self.cache.get(key) if cacheable else None
+            if cached is not None:
+                self.cache_hits += 1
+                future.set_result(cached)
+                return future
+
+            self._in_flight[key] = future
+            self._pending.append(_Request(key, model, X[0], feature_order, float(total_streams[0]), future, cacheable))
+            self._ensure_worker()
+            self._cond.notify()
+        return future
+
+    def predict(self, df: pd.DataFrame, timeout: Optional[float] = None) -> Dict:
+        """Blocking `submit`; returns a private copy of the result dict."""
+        return dict(self.submit(df).result(timeout))
+
+    async def predict_async(self, df: pd.DataFrame) -> Dict:
+        """`predict` for asyncio callers; feature preparation runs in the calling thread."""
+        return dict(await asyncio.wrap_future(self.submit(df)))
+
+    def predict_many(self, frames: Dict[str, pd.DataFrame], timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """Submit every frame at once so they share batches, then collect the results by name."""
+        futures = {name: self.submit(frame) for name, frame in frames.items()}
+        return {name: dict(future.result(timeout)) for name, future in futures.items()}
+
+    def stats(self) -> Dict:
+        """Request, coalescing, cache and batching counters."""
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "cache_hits": self.cache_hits,
+                "batches": self.batches,
+                "batched_rows": self.batched_rows,
+                "pending": len(self._pending),
+            }
+
+    def close(self):
+        """Finish queued requests and stop the worker thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+
+    # --- Worker ---
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="tuneiq-prediction-service", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self) -> List[_Request]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return []
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            self._score(batch)
+
+    def _score(self, batch: List[_Request]):
+        # A registry reload between requests can put several models in one batch
+        groups: Dict[int, List[int]] = {}
+        for position, request in enumerate(batch):
+            groups.setdefault(id(request.model), []).append(position)
+
+        results: List[Dict] = [None] * len(batch)
+        for positions in groups.values():
+            requests = [batch[position] for position in positions]
+            try:
+                X = pd.DataFrame(np.vstack([request.features for request in requests]),
+                                 columns=requests[0].feature_order)
+                total_streams = np.array([request.total_streams for request in requests])
+                frame = predictor.predict_features_many(X, total_streams, model=requests[0].model)
+                scored = [_as_result(row) for _, row in frame.iterrows()]
+            except Exception as e:
+                logger.error(f"❌ Prediction service batch failed: {e}")
+                scored = [_empty_result(str(e)) for _ in requests]
+            for position, result in zip(positions, scored):
+                results[position] = result
+
+        try:
+            # Fill the cache before leaving the in-flight map so no identical request slips between them
+            if self.cache is not None:
+                for request, result in zip(batch, results):
+                    if request.cacheable and not result.get("error"):
+                        self.cache.set(request.key, result)
+        except Exception as e:
+            # A failing cache tier (e.g. a locked SQLite file) must not strand the batch's callers
+            logger.error(f"❌ Prediction cache write failed: {e}")
+        finally:
+            with self._cond:
+                self.batches += 1
+                self.batched_rows += len(batch)
+                for request in batch:
+                    self._in_flight.pop(request.key, None)
+            for request, result in zip(batch, results):
+                if not request.future.done():
+                    request.future.set_result(result)
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_prediction_service() -> PredictionService:
+    """Return the process-wide prediction service, creating it on first use."""
+    global _default_service
+    if _default_service is None:
+        with _default_service_lock:
+            if _default_service is None:
+                _default_service = PredictionService()
+    return _default_service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predict GDP and job impact for artists through the prediction service")
+    parser.add_argument("--csv", default=os.path.join(os.path.dirname(__file__), "sample_data", "streaming_sample.csv"),
+                        help="streaming CSV (default: sample data)")
+    parser.add_argument("--by", default="artist", help="column identifying each artist")
+    parser.add_argument("--artist", nargs="*", help="only predict these artists")
+    parser.add_argument("--repeat", type=int, default=1, help="submit every artist this many times concurrently")
+    args = parser.parse_args(argv)
+
+    # The sample file has '#' comment lines between blocks of rows
+    df = pd.read_csv(args.csv, comment='#')
+    frames = {name: frame for name, frame in df.groupby(args.by, sort=False, observed=True)}
+    if args.artist:
+        frames = {name: frames.get(name, pd.DataFrame()) for name in args.artist}
+
+    service = PredictionService(cache=False)
+    futures = {name: [service.submit(frame) for _ in range(args.repeat)] for name, frame in frames.items()}
+    results = {name: dict(submitted[0].result()) for name, submitted in futures.items()}
+    service.close()
+    print(json.dumps({"results": results, "stats": service.stats()}, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
-import joblib
 import pandas as pd
 import numpy as np
 import os
+import hashlib
+import json
 import logging
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional, Tuple
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+diagnostics_logger = logging.getLogger(f"{__name__}.diagnostics")
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "tuneiq_gdp_jobs_model.joblib")
+# Array export of the same model (see model_export.py), scored with NumPy only
+COMPILED_MODEL_PATH = os.path.join(os.path.dirname(__file__), "tuneiq_gdp_jobs_model.npz")
+# Same export as one .npy per array, memory-mapped so worker processes share pages
+COMPILED_MODEL_DIR = os.path.join(os.path.dirname(__file__), "tuneiq_gdp_jobs_model.npy")
 
 # Define a safe set of feature names we can provide when the model's feature names
 # are not available. This union includes names seen in errors and older training runs.
@@ -24,6 +35,35 @@ DEFAULT_FEATURES = [
     "Engagement Rate (%)"
 ]
 
+
+class FeatureSpec(NamedTuple):
+    """One way of deriving a model feature from raw streaming columns."""
+    name: str
+    source: Tuple[str, ...]   # raw columns; several are multiplied together
+    agg: Tuple[str, ...]      # groupby aggregation per source column
+    scale: float              # aggregated value is divided by this
+    default: float            # used when no rule applies for a group
+    post: Optional[Callable] = None
+
+
+# Declarative feature table. Rules for the same feature are tried in order: the
+# first whose source columns are present (and non-missing for a group) wins,
+# otherwise the feature falls back to `default`. Unknown features are 0.0.
+FEATURE_SPECS = [
+    FeatureSpec("Total Streams (Millions)", ("streams",), ("sum",), 1_000_000, 0.5),
+    FeatureSpec("Streams Last 30 Days (Millions)", ("streams",), ("sum",), 1_000_000, 0.5),
+    # estimate total seconds = avg_duration_seconds * streams
+    FeatureSpec("Total Hours Streamed (Millions)", ("duration", "streams"), ("mean", "sum"), 3600 * 1_000_000, 0.01),
+    FeatureSpec("Total Hours Streamed (Millions)", ("hours",), ("sum",), 1_000_000, 0.01),
+    FeatureSpec("Monthly Listeners (Millions)", ("listeners",), ("mean",), 1_000_000, 1.0),
+    FeatureSpec("Avg Stream Duration (Min)", ("duration",), ("mean",), 60, 3.5),
+    FeatureSpec("Skip Rate (%)", ("skip_rate",), ("mean",), 1, 5),
+    FeatureSpec("Release Year", ("release_year",), ("mean",), 1, 2023, post=np.trunc),
+    FeatureSpec("Playlist Adds", ("playlist_adds",), ("mean",), 1, 10),
+    FeatureSpec("Followers (Millions)", ("followers",), ("mean",), 1_000_000, 0.5),
+    FeatureSpec("Engagement Rate (%)", ("engagement_rate",), ("mean",), 1, 20),
+]
+
 # --- Configurable heuristics (can be overridden with environment variables) ---
 # GDP value assigned per stream (₦ per stream)
 GDP_PER_STREAM = float(os.getenv("TUNEIQ_GDP_PER_STREAM", "0.0005"))
@@ -36,18 +76,436 @@ AUTO_SCALE_FACTOR = float(os.getenv("TUNEIQ_AUTO_SCALE_FACTOR", "1000"))
 # Minimum GDP to consider for display without scaling
 MIN_GDP_DISPLAY = float(os.getenv("TUNEIQ_MIN_GDP_DISPLAY", "1000"))
 
-def load_tuneiq_model():
-    """Load the trained TuneIQ GDP/Jobs model."""
+# Which model artifact to serve: 'auto' (the .npy directory or .npz export if present
+# and not older than the joblib file), 'compiled' or 'joblib'
+MODEL_FORMAT = os.getenv("TUNEIQ_MODEL_FORMAT", "auto").lower()
+
+# numpy mmap_mode for the .npy export directory ('r' shares pages via the OS cache; '' loads into memory)
+MODEL_MMAP_MODE = os.getenv("TUNEIQ_MODEL_MMAP_MODE", "r") or None
+
+# Central coverage of the prediction interval reported alongside point estimates
+INTERVAL_COVERAGE = float(os.getenv("TUNEIQ_INTERVAL_COVERAGE", "0.8"))
+
+# Seconds between on-disk checks of the model file (0 = check on every call)
+MODEL_CHECK_INTERVAL = float(os.getenv("TUNEIQ_MODEL_CHECK_INTERVAL", "1.0"))
+
+# Per-stage timing diagnostics (off by default) and the fraction of calls to record
+DIAGNOSTICS_ENABLED = os.getenv("TUNEIQ_PREDICTOR_DIAGNOSTICS", "0").lower() in ("1", "true", "yes")
+DIAGNOSTICS_SAMPLE_RATE = float(os.getenv("TUNEIQ_DIAGNOSTICS_SAMPLE_RATE", "1.0"))
+
+
+# --- Diagnostics ---
+
+class _NullTrace:
+    """Trace used when diagnostics are off or the call is not sampled: all no-ops."""
+    __slots__ = ()
+
+    def mark(self, stage: str):
+        pass
+
+    def set(self, **fields):
+        pass
+
+    def finish(self):
+        pass
+
+
+_NULL_TRACE = _NullTrace()
+
+
+class _Trace:
+    """Collects wall time per stage (load, features, predict, postprocess) for one call."""
+    __slots__ = ("op", "sink", "fields", "stages", "_start", "_last")
+
+    def __init__(self, op: str, sink):
+        self.op = op
+        self.sink = sink
+        self.fields = {}
+        self.stages = {}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, stage: str):
+        """Attribute the time since the previous mark to `stage`."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def finish(self):
+        record = {"op": self.op, **self.fields}
+        for stage, seconds in self.stages.items():
+            record[f"{stage}_ms"] = round(seconds * 1000, 3)
+        record["total_ms"] = round((time.perf_counter() - self._start) * 1000, 3)
+        self.sink.emit(record)
+
+
+class PredictorDiagnostics:
+    """
+    Sampled, structured timing records for predictor calls.
+
+    Disabled by default, in which case `trace()` returns a shared no-op trace and
+    the prediction path does no timing or formatting work. When enabled, a
+    `sample_rate` fraction of calls emit one compact JSON record on the
+    `predictor.diagnostics` logger and are kept in a bounded in-memory history.
+    """
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 1.0, history: int = 256):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.records = deque(maxlen=history)
+
+    def trace(self, op: str):
+        if not self.enabled or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return _NULL_TRACE
+        return _Trace(op, self)
+
+    def emit(self, record: dict):
+        self.records.append(record)
+        diagnostics_logger.info(json.dumps(record, separators=(",", ":")))
+
+
+_diagnostics = PredictorDiagnostics(DIAGNOSTICS_ENABLED, DIAGNOSTICS_SAMPLE_RATE)
+
+
+def enable_diagnostics(sample_rate: float = 1.0):
+    """Start recording per-stage timings for `sample_rate` of predictor calls."""
+    _diagnostics.sample_rate = sample_rate
+    _diagnostics.enabled = True
+
+
+def disable_diagnostics():
+    """Stop recording predictor timings (the default)."""
+    _diagnostics.enabled = False
+
+
+def get_diagnostics() -> list:
+    """Return the most recent diagnostics records, oldest first."""
+    return list(_diagnostics.records)
+
+
+class CompiledModel:
+    """
+    NumPy-only scorer for a model exported by `model_export.export_model`.
+
+    Supports flattened tree ensembles (forests and single trees, averaged like
+    scikit-learn) and linear models, and mirrors the estimator interface used
+    here: `feature_names_in_`, `n_outputs_` and `predict(X)`. Outputs match the
+    source scikit-learn estimator exactly.
+    """
+
+    def __init__(self, arrays: dict, meta: dict):
+        self.meta = meta
+        self.kind = meta["kind"]
+        self.feature_names_in_ = np.asarray(meta["feature_names"], dtype=object)
+        self.n_outputs_ = int(meta["n_outputs"])
+        self.arrays = arrays
+        if self.kind == "tree_ensemble":
+            self.feature = arrays["feature"]
+            self.threshold = arrays["threshold"]
+            self.children_left = arrays["children_left"]
+            self.children_right = arrays["children_right"]
+            self.value = arrays["value"]
+            self.roots = arrays["roots"]
+            self.max_depth = int(meta["max_depth"])
+        elif self.kind == "linear":
+            self.coef = arrays["coef"]
+            self.intercept = arrays["intercept"]
+        else:
+            raise ValueError(f"Unsupported compiled model kind '{self.kind}'")
+
+    def _as_array(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[list(self.feature_names_in_)]
+        return np.asarray(X, dtype=np.float64)
+
+    def leaf_values(self, X) -> np.ndarray:
+        """Per-tree predictions, shape (rows, trees, outputs), from one traversal."""
+        # scikit-learn trees compare float32 inputs against float64 thresholds
+        Xc = self._as_array(X).astype(np.float32).astype(np.float64)
+        n_rows, n_features = Xc.shape
+        n_trees = len(self.roots)
+        flat_x = Xc.ravel()
+
+        # One slot per (row, tree); only slots still at an internal node are advanced
+        node = np.tile(self.roots, n_rows).astype(np.intp)
+        row_offset = np.repeat(np.arange(n_rows, dtype=np.intp) * n_features, n_trees)
+        active = np.arange(node.size, dtype=np.intp)
+        for _ in range(self.max_depth + 1):
+            current = node[active]
+            left = self.children_left[current]
+            internal = left != -1
+            if not internal.all():
+                active, current, left = active[internal], current[internal], left[internal]
+            if active.size == 0:
+                break
+            go_left = flat_x[row_offset[active] + self.feature[current]] <= self.threshold[current]
+            node[active] = np.where(go_left, left, self.children_right[current])
+        return self.value[node].reshape(n_rows, n_trees, -1)
+
+    def predict(self, X) -> np.ndarray:
+        if self.kind == "linear":
+            y = self._as_array(X) @ self.coef.T + self.intercept
+        else:
+            per_tree = self.leaf_values(X)
+            # Sequential sum over trees, in estimator order, as scikit-learn accumulates
+            y = np.cumsum(per_tree, axis=1)[:, -1, :] / per_tree.shape[1]
+        return y[:, 0] if self.n_outputs_ == 1 else y
+
+
+def load_compiled_model(path: str = COMPILED_MODEL_PATH, mmap_mode: Optional[str] = MODEL_MMAP_MODE) -> CompiledModel:
+    """
+    Load an export written by `model_export.export_model`.
+
+    `path` is either a `.npz` file (read into memory) or a `.npy` export
+    directory whose arrays are opened with `mmap_mode`, so several processes
+    serving the same model share one copy through the OS page cache.
+    """
+    if os.path.isdir(path):
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {
+            name[:-len(".npy")]: np.load(os.path.join(path, name), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in sorted(os.listdir(path)) if name.endswith(".npy")
+        }
+        return CompiledModel(arrays, meta)
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files if name != "meta"}
+        meta = json.loads(str(data["meta"]))
+    return CompiledModel(arrays, meta)
+
+
+def load_tuneiq_model(path: str = MODEL_PATH):
+    """Load the trained TuneIQ GDP/Jobs model (joblib pickle or compiled export)."""
     try:
-        model = joblib.load(MODEL_PATH)
-        logger.info(f"✅ Model loaded successfully from {MODEL_PATH}")
+        if path.endswith(".npz") or os.path.isdir(path):
+            model = load_compiled_model(path)
+        else:
+            # Imported lazily so compiled-model workers never pay for joblib/scikit-learn
+            import joblib
+            model = joblib.load(path)
+        logger.info(f"✅ Model loaded successfully from {path}")
         return model
     except Exception as e:
         logger.error(f"❌ Failed to load model: {e}")
         return None
 
 
-def prepare_features(df: pd.DataFrame) -> pd.DataFrame:
+def default_model_path() -> str:
+    """Model artifact to serve according to `TUNEIQ_MODEL_FORMAT`."""
+    compiled = [path for path in (COMPILED_MODEL_DIR, COMPILED_MODEL_PATH) if os.path.exists(path)]
+    if MODEL_FORMAT == "compiled":
+        return compiled[0] if compiled else COMPILED_MODEL_PATH
+    if MODEL_FORMAT == "auto":
+        for path in compiled:
+            try:
+                if os.path.getmtime(path) >= os.path.getmtime(MODEL_PATH):
+                    return path
+            except OSError:
+                return path
+    return MODEL_PATH
+
+
+def _file_sha256(path: str) -> str:
+    """Return the hex SHA-256 digest of a file (or a directory's files), read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    is_dir = os.path.isdir(path)
+    paths = [os.path.join(path, name) for name in sorted(os.listdir(path))] if is_dir else [path]
+    for file_path in paths:
+        if is_dir:
+            digest.update(os.path.basename(file_path).encode())
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Process-wide cache for a model file.
+
+    The model is deserialized once and shared by every caller. On access the
+    file's (mtime, size) signature is re-checked at most every
+    `check_interval` seconds; when it changes the content hash is recomputed and
+    the model is reloaded only if the bytes actually differ.
+    """
+
+    def __init__(self, path: str = MODEL_PATH, loader=load_tuneiq_model,
+                 check_interval: float = MODEL_CHECK_INTERVAL):
+        self.path = path
+        self.loader = loader
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._model = None
+        self._loaded = False
+        self._signature = None
+        self._sha256 = None
+        self._last_check = 0.0
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self, signature):
+        sha256 = None
+        if signature is not None:
+            try:
+                sha256 = _file_sha256(self.path)
+            except OSError:
+                sha256 = None
+        # Same bytes under a new mtime (e.g. `touch` or re-copy): keep the model
+        if self._loaded and sha256 is not None and sha256 == self._sha256:
+            self._signature = signature
+            return
+        self._model = self.loader(self.path) if signature is not None else None
+        self._signature = signature
+        self._sha256 = sha256
+        self._loaded = True
+
+    def get(self):
+        """Return the cached model, reloading it if the file changed on disk."""
+        now = time.monotonic()
+        if self._loaded and now - self._last_check < self.check_interval:
+            return self._model
+        with self._lock:
+            signature = self._stat_signature()
+            if not self._loaded or signature != self._signature:
+                self._load(signature)
+            self._last_check = now
+            return self._model
+
+    def reload(self):
+        """Force a fresh load from disk, bypassing the content-hash check."""
+        with self._lock:
+            self._loaded = False
+            self._sha256 = None
+            self._load(self._stat_signature())
+            self._last_check = time.monotonic()
+            return self._model
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """Content hash of the currently loaded model file (None if not loaded)."""
+        self.get()
+        return self._sha256
+
+
+_registry = ModelRegistry(default_model_path())
+
+
+def get_model():
+    """Return the process-wide TuneIQ model, loading it on first use."""
+    return _registry.get()
+
+
+def reload_model():
+    """Discard the cached TuneIQ model and load it again from disk."""
+    return _registry.reload()
+
+
+def model_fingerprint() -> Optional[str]:
+    """SHA-256 of the model file currently served by `get_model()`."""
+    return _registry.fingerprint
+
+
+def _feature_order(model) -> list:
+    """Feature names in the order the model was fitted with."""
+    if model is not None and hasattr(model, "feature_names_in_"):
+        return list(getattr(model, "feature_names_in_"))
+    return list(DEFAULT_FEATURES)
+
+
+@lru_cache(maxsize=64)
+def _compile_feature_plan(feature_order: Tuple[str, ...], columns: frozenset):
+    """
+    Compile `FEATURE_SPECS` for one feature order and set of available columns.
+
+    Returns the named aggregations for a single `groupby().agg()` call and, per
+    feature, the applicable rules as (aggregate keys, scale, default, post).
+    Sums are paired with a count so all-missing groups fall back to defaults.
+    """
+    named_aggs = {}
+
+    def agg_key(column, how):
+        key = f"{column}__{how}"
+        named_aggs[key] = (column, how)
+        if how == "sum":
+            named_aggs[f"{column}__count"] = (column, "count")
+        return key
+
+    plan = []
+    for name in feature_order:
+        specs = [spec for spec in FEATURE_SPECS if spec.name == name]
+        rules = tuple(
+            (tuple(agg_key(col, how) for col, how in zip(spec.source, spec.agg)), spec.scale, spec.post)
+            for spec in specs
+            if all(col in columns for col in spec.source)
+        )
+        plan.append((rules, float(specs[0].default) if specs else 0.0))
+
+    # Raw stream totals drive auto-scaling and the confidence heuristic
+    if "streams" in columns:
+        agg_key("streams", "sum")
+    return named_aggs, tuple(plan)
+
+
+def build_feature_matrix(df: pd.DataFrame, by: Optional[str] = None, model=None):
+    """
+    Build the model's feature block for one group (`by=None`) or one row per `by` value.
+
+    Aggregations are compiled from `FEATURE_SPECS` and run as a single
+    `groupby().agg()` over `df` (or one direct reduction per column for a
+    single group), so every raw column is scanned once per aggregation.
+
+    Returns:
+        (X, index, feature_order, total_streams) where X is a C-contiguous
+        float64 array of shape (groups, features) in the model's
+        `feature_names_in_` order and total_streams holds raw stream sums.
+    """
+    feature_order = tuple(_feature_order(model))
+    named_aggs, plan = _compile_feature_plan(feature_order, frozenset(df.columns))
+
+    if by is None:
+        # One group: reduce each compiled (column, aggregation) pair once, skipping groupby overhead
+        index = pd.RangeIndex(1)
+        raw = {key: getattr(df[col], how)() for key, (col, how) in named_aggs.items()}
+    else:
+        stats = df.groupby(by, sort=False, observed=True).agg(**named_aggs) if named_aggs else None
+        index = stats.index if stats is not None else pd.Index(pd.unique(df[by]), name=by)
+        raw = {key: stats[key].to_numpy(dtype=float) for key in named_aggs}
+
+    n = len(index)
+    aggregates = {}
+    for key, values in raw.items():
+        values = np.asarray(values, dtype=float).reshape(n)
+        if key.endswith("__sum"):
+            counts = np.asarray(raw[key[:-len("sum")] + "count"]).reshape(n)
+            values = np.where(counts > 0, values, np.nan)
+        aggregates[key] = values
+
+    X = np.empty((n, len(feature_order)), dtype=np.float64)
+    for j, (rules, default) in enumerate(plan):
+        column = np.full(n, default)
+        # Apply rules lowest priority first so earlier rules overwrite later ones
+        for keys, scale, post in reversed(rules):
+            values = aggregates[keys[0]]
+            for key in keys[1:]:
+                values = values * aggregates[key]
+            values = values / scale
+            if post is not None:
+                values = post(values)
+            column = np.where(np.isnan(values), column, values)
+        X[:, j] = column
+
+    total_streams = aggregates.get("streams__sum", np.full(n, np.nan))
+    return X, index, list(feature_order), np.nan_to_num(total_streams)
+
+
+def prepare_features(df: pd.DataFrame, model=None) -> pd.DataFrame:
     """
     Build a single-row feature DataFrame matching what the model expects.
 
@@ -56,82 +514,112 @@ def prepare_features(df: pd.DataFrame) -> pd.DataFrame:
       ordering to construct the DataFrame (sklearn requires matching names/order).
     - Otherwise, fall back to `DEFAULT_FEATURES` (a union of likely names).
 
-    Missing values are filled with conservative defaults.
-    """
-    # Helper to compute a sensible value for a given feature name
-    def value_for(name: str):
-        # Streams totals (millions)
-        if name in ("Total Streams (Millions)", "Streams Last 30 Days (Millions)"):
-            if "streams" in df.columns:
-                return float(df["streams"].sum() / 1_000_000)
-            return 0.5
-
-        # Total hours streamed (millions)
-        if name == "Total Hours Streamed (Millions)":
-            if "duration" in df.columns and "streams" in df.columns:
-                # estimate total seconds = avg_duration_seconds * streams
-                avg_sec = df["duration"].mean()
-                total_seconds = avg_sec * df["streams"].sum()
-                return float((total_seconds / 3600) / 1_000_000)
-            elif "hours" in df.columns:
-                return float(df["hours"].sum() / 1_000_000)
-            return 0.01
-
-        if name == "Monthly Listeners (Millions)":
-            if "listeners" in df.columns:
-                return float(df["listeners"].mean() / 1_000_000)
-            return 1.0
-
-        if name == "Avg Stream Duration (Min)":
-            if "duration" in df.columns:
-                return float(df["duration"].mean() / 60)
-            return 3.5
-
-        if name == "Skip Rate (%)":
-            return float(df.get("skip_rate", pd.Series([5])).mean())
-
-        if name == "Release Year":
-            return int(df.get("release_year", pd.Series([2023])).mean())
-
-        if name == "Playlist Adds":
-            return float(df.get("playlist_adds", pd.Series([10])).mean())
-
-        if name == "Followers (Millions)":
-            if "followers" in df.columns:
-                return float(df["followers"].mean() / 1_000_000)
-            return 0.5
-
-        if name == "Engagement Rate (%)":
-            return float(df.get("engagement_rate", pd.Series([20])).mean())
-
-        # Default fallback numeric value
-        return 0.0
-
-    # Attempt to load model to get feature ordering
-    model = load_tuneiq_model()
-    if model is not None and hasattr(model, "feature_names_in_"):
-        feature_order = list(getattr(model, "feature_names_in_"))
-        logger.info(f"Using model.feature_names_in_ for feature order: {feature_order}")
-    else:
-        feature_order = DEFAULT_FEATURES
-        logger.info(f"Using DEFAULT_FEATURES for feature order: {feature_order}")
-
-    data = {name: value_for(name) for name in feature_order}
-    feature_df = pd.DataFrame([data], columns=feature_order)
-    logger.info(f"Prepared features for prediction: {feature_df.to_dict(orient='records')[0]}")
+    Feature values come from `FEATURE_SPECS`; missing values are filled with
+    conservative defaults. Pass an already-loaded `model` to skip the registry
+    lookup.
+    """
+    # Use the cached model (if not supplied) to get feature ordering
+    if model is None:
+        model = get_model()
+    X, _, feature_order, _ = build_feature_matrix(df, model=model)
+    feature_df = pd.DataFrame(X, columns=feature_order)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Prepared features for prediction: %s", dict(zip(feature_order, X[0])))
     return feature_df
 
 
-def predict_impact(df: pd.DataFrame):
+# --- Prediction intervals ---
+
+def _averaging_trees(model):
+    """Fitted trees of a scikit-learn averaging forest (or a single tree), else None."""
+    if hasattr(model, "tree_"):
+        return [model]
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None or hasattr(model, "learning_rate") or hasattr(model, "predict_proba"):
+        return None
+    estimators = list(estimators)
+    return estimators if estimators and all(hasattr(e, "tree_") for e in estimators) else None
+
+
+def _residual_table(model):
+    """Training residual quantiles as (levels, residuals), if the model carries them."""
+    table = getattr(model, "residual_quantiles_", None)
+    if table is None and isinstance(model, CompiledModel):
+        table = model.meta.get("residual_quantiles")
+    if not table:
+        return None
+    return np.asarray(table["levels"], dtype=float), np.asarray(table["residuals"], dtype=float)
+
+
+def predict_with_intervals(model, X, coverage: float = INTERVAL_COVERAGE):
+    """
+    Point predictions plus a central `coverage` interval from one model pass.
+
+    - Tree ensembles (scikit-learn forests, single trees, compiled exports):
+      every tree is evaluated once; the point estimate is the in-order mean
+      (identical to `model.predict`) and the interval comes from the quantiles
+      of the per-tree predictions.
+    - Models carrying a residual quantile table (`residual_quantiles_`, or
+      `residual_quantiles` in a compiled export's metadata): one `predict`,
+      with the interval shifted by the interpolated training residuals.
+    - Anything else: one `predict` and no interval.
+
+    Returns:
+        (y_pred, lower, upper); y_pred is shaped like `model.predict(X)` and
+        lower/upper refer to the first output, or are None.
+    """
+    lo_q, hi_q = (1 - coverage) / 2, (1 + coverage) / 2
+    per_tree = None
+    if isinstance(model, CompiledModel) and model.kind == "tree_ensemble":
+        per_tree = model.leaf_values(X)
+    else:
+        trees = _averaging_trees(model)
+        if trees is not None:
+            if isinstance(X, pd.DataFrame) and hasattr(model, "feature_names_in_"):
+                X = X[list(model.feature_names_in_)]
+            X32 = np.asarray(X, dtype=np.float32)
+            per_tree = np.stack([tree.predict(X32, check_input=False) for tree in trees], axis=1)
+            per_tree = per_tree.reshape(len(X32), len(trees), -1)
+
+    if per_tree is not None:
+        # Sequential sum over trees, in estimator order, as scikit-learn accumulates
+        y = np.cumsum(per_tree, axis=1)[:, -1, :] / per_tree.shape[1]
+        lower, upper = np.quantile(per_tree[:, :, 0], [lo_q, hi_q], axis=1)
+        return (y[:, 0] if y.shape[1] == 1 else y), lower, upper
+
+    y_pred = np.asarray(model.predict(X))
+    table = _residual_table(model)
+    if table is None:
+        return y_pred, None, None
+    levels, residuals = table
+    first = y_pred.reshape(len(y_pred), -1)[:, 0].astype(float)
+    return y_pred, first + np.interp(lo_q, levels, residuals), first + np.interp(hi_q, levels, residuals)
+
+
+def interval_confidence(point, lower, upper):
+    """Map an interval to a 0..1 confidence: 1 / (1 + interval width relative to the estimate)."""
+    point = np.abs(np.asarray(point, dtype=float))
+    width = np.asarray(upper, dtype=float) - np.asarray(lower, dtype=float)
+    return 1.0 / (1.0 + width / np.maximum(point, 1e-9))
+
+
+def predict_impact(df: pd.DataFrame, model=None):
     """
     Use the trained model to predict GDP and job creation.
+
+    `model` defaults to the process-wide cached model from `get_model()`.
     """
-    model = load_tuneiq_model()
+    trace = _diagnostics.trace("predict_impact")
+    trace.set(rows=len(df))
+    if model is None:
+        model = get_model()
+    trace.mark("load")
 
     # If the model cannot be loaded, use a deterministic heuristic so the UI shows values
     if model is None:
         logger.warning("Model not available - using heuristic fallback estimates")
         X = prepare_features(df)
+        trace.mark("features")
         if X.empty:
             return {
                 "predicted_gdp": None,
@@ -162,6 +650,9 @@ def predict_impact(df: pd.DataFrame):
         predicted_gdp = float(total_streams * GDP_PER_STREAM)
         predicted_jobs = max(7, int(predicted_gdp * JOB_PER_GDP))
         confidence = 0.35
+        trace.mark("postprocess")
+        trace.set(estimation=True)
+        trace.finish()
 
         return {
             "predicted_gdp": predicted_gdp,
@@ -170,12 +661,16 @@ def predict_impact(df: pd.DataFrame):
             "error": None,
             "estimation": True,
             "auto_scaled": False,
+            "predicted_gdp_lower": None,
+            "predicted_gdp_upper": None,
         }
 
     # If model is available, run it and attempt to compute a confidence score
     try:
-        X = prepare_features(df)
-        y_pred = model.predict(X)
+        X = prepare_features(df, model=model)
+        trace.mark("features")
+        y_pred, gdp_lower, gdp_upper = predict_with_intervals(model, X)
+        trace.mark("predict")
 
         predicted_gdp = None
         predicted_jobs = None
@@ -194,15 +689,20 @@ def predict_impact(df: pd.DataFrame):
             predicted_gdp = float(y_pred)
             predicted_jobs = None
 
-        # Try to estimate confidence if the model exposes probabilities or score
+        # Confidence from class probabilities, or from the prediction interval for regressors
         try:
             if hasattr(model, "predict_proba"):
                 proba = model.predict_proba(X)
                 confidence = float(max(proba[0])) if proba is not None else None
+            elif gdp_lower is not None:
+                gdp_lower, gdp_upper = float(gdp_lower[0]), float(gdp_upper[0])
+                confidence = float(interval_confidence(predicted_gdp, gdp_lower, gdp_upper))
             else:
                 confidence = None
         except Exception:
             confidence = None
+        if not isinstance(gdp_lower, float):
+            gdp_lower = gdp_upper = None
 
         # Ensure we return numeric jobs and confidence even if model didn't output jobs
         if predicted_jobs is None and predicted_gdp is not None:
@@ -219,9 +719,11 @@ def predict_impact(df: pd.DataFrame):
         try:
             total_streams = float(df['streams'].sum()) if 'streams' in df.columns else 0.0
             if predicted_gdp is not None and predicted_gdp < MIN_GDP_DISPLAY and total_streams > AUTO_SCALE_THRESHOLD_STREAMS:
-                logger.info(f'Auto-scaling predicted_gdp by factor {AUTO_SCALE_FACTOR} for display based on stream volume')
+                logger.debug("Auto-scaling predicted_gdp by factor %s for display based on stream volume", AUTO_SCALE_FACTOR)
                 predicted_gdp = float(predicted_gdp * AUTO_SCALE_FACTOR)
                 predicted_jobs = max(7, int(predicted_gdp * JOB_PER_GDP))
+                if gdp_lower is not None:
+                    gdp_lower, gdp_upper = gdp_lower * AUTO_SCALE_FACTOR, gdp_upper * AUTO_SCALE_FACTOR
                 auto_scaled_flag = True
         except Exception:
             pass
@@ -241,6 +743,8 @@ def predict_impact(df: pd.DataFrame):
                 predicted_jobs = max(7, int(predicted_gdp * JOB_PER_GDP))
         except Exception:
             pass
+        trace.mark("postprocess")
+        trace.finish()
 
         return {
             "predicted_gdp": predicted_gdp,
@@ -249,7 +753,204 @@ def predict_impact(df: pd.DataFrame):
             "error": None,
             "estimation": False,
             "auto_scaled": auto_scaled_flag,
+            "predicted_gdp_lower": gdp_lower,
+            "predicted_gdp_upper": gdp_upper,
         }
     except Exception as e:
         logger.error(f"❌ Prediction Error: {e}")
+        trace.set(error=type(e).__name__)
+        trace.finish()
         return {"predicted_gdp": None, "predicted_jobs": None, "confidence": None, "error": str(e)}
+
+
+# --- Batch scoring ---
+
+RESULT_COLUMNS = [
+    "predicted_gdp", "predicted_jobs", "confidence", "error", "estimation", "auto_scaled",
+    "predicted_gdp_lower", "predicted_gdp_upper",
+]
+
+
+def _to_long_frame(data, by: str) -> pd.DataFrame:
+    """Accept a long-format frame or a mapping of group -> frame and return a long frame."""
+    if isinstance(data, pd.DataFrame):
+        if by not in data.columns:
+            raise ValueError(f"Column '{by}' is required to group a long-format DataFrame")
+        return data
+    frames = {key: frame for key, frame in data.items() if frame is not None and not frame.empty}
+    if not frames:
+        return pd.DataFrame(columns=[by])
+    long_df = pd.concat(frames, names=[by, None])
+    long_df = long_df.drop(columns=[by], errors="ignore").reset_index(level=0)
+    return long_df.reset_index(drop=True)
+
+
+def _build_features_many(long_df: pd.DataFrame, by: str, model):
+    """Return (feature frame indexed by `by`, raw total streams per group)."""
+    X, index, feature_order, total_streams = build_feature_matrix(long_df, by=by, model=model)
+    return pd.DataFrame(X, index=index, columns=feature_order), total_streams
+
+
+def prepare_features_many(data, by: str = "artist", model=None) -> pd.DataFrame:
+    """
+    Build the feature matrix for many groups (one row per `by` value) in one groupby.
+
+    `data` is either a long-format streaming DataFrame with a `by` column or a
+    mapping of group name -> DataFrame. Columns follow the model's feature order;
+    per-group values follow `FEATURE_SPECS`, like `prepare_features`.
+    """
+    if model is None:
+        model = get_model()
+    return _build_features_many(_to_long_frame(data, by), by, model)[0]
+
+
+def _postprocess_predictions(model, X: pd.DataFrame, y_pred, total_streams: np.ndarray,
+                             lower=None, upper=None) -> pd.DataFrame:
+    """Vectorized equivalent of the post-processing in `predict_impact` for many rows."""
+    n = len(X)
+    y = np.asarray(y_pred, dtype=float).reshape(n, -1)
+    predicted_gdp = y[:, 0].copy()
+    model_jobs = y.shape[1] >= 2
+    predicted_jobs = y[:, 1].copy() if model_jobs else np.trunc(predicted_gdp * JOB_PER_GDP).clip(min=0)
+    lower = np.full(n, np.nan) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.full(n, np.nan) if upper is None else np.asarray(upper, dtype=float)
+
+    confidence = np.zeros(n)
+    if hasattr(model, "predict_proba"):
+        try:
+            proba = model.predict_proba(X)
+            if proba is not None:
+                confidence = np.asarray(proba, dtype=float).max(axis=1)
+        except Exception:
+            pass
+    else:
+        confidence = np.nan_to_num(interval_confidence(predicted_gdp, lower, upper))
+
+    # Auto-scale suspiciously small model output when stream volume is large
+    auto_scaled = (predicted_gdp < MIN_GDP_DISPLAY) & (total_streams > AUTO_SCALE_THRESHOLD_STREAMS)
+    scale = np.where(auto_scaled, AUTO_SCALE_FACTOR, 1.0)
+    predicted_gdp = predicted_gdp * scale
+    lower, upper = lower * scale, upper * scale
+    floor_jobs = np.maximum(7, np.trunc(predicted_gdp * JOB_PER_GDP))
+    predicted_jobs = np.where(auto_scaled, floor_jobs, predicted_jobs)
+
+    # Stream-volume heuristic where the model gave no confidence
+    heuristic = np.minimum(0.6, 0.2 + np.minimum(1.0, total_streams / 5_000_000))
+    confidence = np.where(confidence == 0.0, heuristic, confidence)
+
+    # Non-zero job impact whenever GDP is positive
+    no_jobs = (np.isnan(predicted_jobs) | (predicted_jobs == 0)) & (predicted_gdp > 0)
+    predicted_jobs = np.where(no_jobs, floor_jobs, predicted_jobs)
+
+    return pd.DataFrame({
+        "predicted_gdp": predicted_gdp,
+        "predicted_jobs": predicted_jobs,
+        "confidence": confidence,
+        "error": None,
+        "estimation": False,
+        "auto_scaled": auto_scaled,
+        "predicted_gdp_lower": lower,
+        "predicted_gdp_upper": upper,
+    }, index=X.index)
+
+
+def _heuristic_predictions(X: pd.DataFrame, total_streams: np.ndarray) -> pd.DataFrame:
+    """Vectorized equivalent of the model-unavailable fallback in `predict_impact`."""
+    if "Streams Last 30 Days (Millions)" in X.columns:
+        streams = X["Streams Last 30 Days (Millions)"].to_numpy(dtype=float) * 1_000_000
+    elif "Total Streams (Millions)" in X.columns:
+        streams = X["Total Streams (Millions)"].to_numpy(dtype=float) * 1_000_000
+    else:
+        streams = np.zeros(len(X))
+    streams = np.where(streams == 0.0, total_streams, streams)
+
+    predicted_gdp = streams * GDP_PER_STREAM
+    return pd.DataFrame({
+        "predicted_gdp": predicted_gdp,
+        "predicted_jobs": np.maximum(7, np.trunc(predicted_gdp * JOB_PER_GDP)),
+        "confidence": 0.35,
+        "error": None,
+        "estimation": True,
+        "auto_scaled": False,
+        "predicted_gdp_lower": np.nan,
+        "predicted_gdp_upper": np.nan,
+    }, index=X.index)
+
+
+def _score_features(X: pd.DataFrame, total_streams: np.ndarray, model, trace=_NULL_TRACE) -> pd.DataFrame:
+    if X.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS, index=X.index)
+    if model is None:
+        logger.warning("Model not available - using heuristic fallback estimates")
+        return _heuristic_predictions(X, total_streams)
+    try:
+        y_pred, lower, upper = predict_with_intervals(model, X)
+        trace.mark("predict")
+        return _postprocess_predictions(model, X, y_pred, total_streams, lower, upper)
+    except Exception as e:
+        logger.error(f"❌ Batch Prediction Error: {e}")
+        trace.set(error=type(e).__name__)
+        results = pd.DataFrame({col: None for col in RESULT_COLUMNS}, index=X.index)
+        results["error"] = str(e)
+        return results
+
+
+def predict_features_many(X: pd.DataFrame, total_streams, model=None) -> pd.DataFrame:
+    """
+    Score already-prepared feature rows with a single `model.predict` call.
+
+    `X` holds one row per request in the model's feature order (as returned by
+    `build_feature_matrix`) and `total_streams` the matching raw stream totals.
+    Returns the same frame as `predict_impact_many`, indexed like `X`.
+    """
+    trace = _diagnostics.trace("predict_features_many")
+    if model is None:
+        model = get_model()
+    trace.mark("load")
+    trace.set(groups=len(X))
+    results = _score_features(X, np.asarray(total_streams, dtype=float), model, trace)
+    trace.mark("postprocess")
+    trace.finish()
+    return results
+
+
+def predict_impact_many(data, by: str = "artist", model=None) -> pd.DataFrame:
+    """
+    Predict GDP and job creation for many artists with a single `model.predict` call.
+
+    Args:
+        data: Long-format streaming DataFrame with a `by` column, or a mapping
+            of artist name -> streaming DataFrame
+        by: Column identifying each group (default 'artist')
+        model: Already-loaded model; defaults to the cached model from `get_model()`
+
+    Returns:
+        DataFrame indexed by `by` with the same fields as `predict_impact`:
+        predicted_gdp, predicted_jobs, confidence, error, estimation, auto_scaled,
+        predicted_gdp_lower and predicted_gdp_upper.
+        Groups whose input frame is empty carry an error message.
+    """
+    trace = _diagnostics.trace("predict_impact_many")
+    if model is None:
+        model = get_model()
+    trace.mark("load")
+
+    X, total_streams = _build_features_many(_to_long_frame(data, by), by, model)
+    trace.mark("features")
+    trace.set(groups=len(X))
+
+    results = _score_features(X, total_streams, model, trace)
+
+    # Keep requested groups whose frames were empty, flagged like get_model_predictions does
+    if not isinstance(data, pd.DataFrame):
+        missing = [key for key in data.keys() if key not in results.index]
+        if missing:
+            if results.empty:
+                results = pd.DataFrame({col: None for col in RESULT_COLUMNS}, index=pd.Index(missing, name=by))
+            else:
+                # Reindex rather than concat an all-NA frame, which pandas is deprecating for dtype inference
+                results = results.reindex(results.index.append(pd.Index(missing)).rename(by))
+            results.loc[missing, "error"] = "Input data is empty"
+    trace.mark("postprocess")
+    trace.finish()
+    return results
@@ -0,0 +1,215 @@
+"""
+Time-versioned exchange rates and per-stream payout rates for TuneIQ Insight.
+
+A RateStore holds two tables, each loadable from CSV or Parquet:
+- fx:           effective_date, currency, rate   (units of currency per USD)
+- stream rates: effective_date, platform, country, rate   (USD per stream)
+
+A rate applies from its effective_date until the next one for the same key.
+Stream-rate rows with country '*' (or blank) apply to every country of the
+platform; a country-specific row takes precedence over the wildcard.
+
+Lookups are as-of joins on each row's `month`. Rows are reduced to their
+distinct (month, platform, country) keys first, the as-of merge runs on that
+small key table, and the rates are gathered back per row, so cost grows with
+the number of rows only through factorization and one array gather.
+
+Lookup rules:
+- a country-specific rate applies from its own effective date; earlier
+  months use the platform's wildcard rate in effect then
+- months before any rate for the key took effect use the earliest one
+- months that cannot be parsed (e.g. 'Unknown') use the latest rate
+- platforms with no stream rate get the store's default rate
+
+Paths for the process-wide store come from TUNEIQ_FX_RATES_PATH and
+TUNEIQ_STREAM_RATES_PATH; without them `get_rate_store()` returns None and
+`models` falls back to its NGN_RATE / STREAM_RATES constants.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+FX_RATES_PATH = os.getenv("TUNEIQ_FX_RATES_PATH") or None
+STREAM_RATES_PATH = os.getenv("TUNEIQ_STREAM_RATES_PATH") or None
+
+WILDCARD_COUNTRY = "*"
+FX_COLUMNS = ["effective_date", "currency", "rate"]
+STREAM_RATE_COLUMNS = ["effective_date", "platform", "country", "rate"]
+
+# Stand-in dates for unparseable months (latest rate) when searching effective dates
+_LATEST = np.datetime64("2262-04-11", "ns")
+
+
+def read_table(path: str) -> pd.DataFrame:
+    """Read a rate table from Parquet (.parquet/.pq) or CSV."""
+    if path.lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def month_dates(month: pd.Series):
+    """
+    Factorize a `month` column into (codes, dates of the distinct months).
+
+    Values like '2025-01' or '2025-01-15' parse to datetimes; anything else
+    becomes the far-future stand-in so it resolves to the latest rate.
+    """
+    codes, uniques = pd.factorize(month)
+    parsed = pd.to_datetime(pd.Series(np.asarray(uniques, dtype=object)).astype(str), errors="coerce", format="mixed")
+    # Missing months get their own trailing code
+    dates = np.append(parsed.to_numpy(dtype="datetime64[ns]"), _LATEST)
+    dates[np.isnat(dates)] = _LATEST
+    codes[codes < 0] = len(uniques)
+    return codes, dates
+
+
+class RateStore:
+    """
+    Exchange-rate and per-stream-rate tables with as-of lookups by month.
+
+    Args:
+        fx: DataFrame with effective_date, currency, rate
+        stream_rates: DataFrame with effective_date, platform, country, rate
+        default_stream_rate: USD per stream for platforms with no rate
+    """
+
+    def __init__(self, fx: pd.DataFrame, stream_rates: pd.DataFrame, default_stream_rate: float = 0.003):
+        missing = [c for c in FX_COLUMNS if c not in fx.columns] + \
+                  [c for c in STREAM_RATE_COLUMNS if c not in stream_rates.columns and c != "country"]
+        if missing:
+            raise ValueError(f"Rate tables are missing columns: {', '.join(missing)}")
+        self.default_stream_rate = float(default_stream_rate)
+
+        fx = fx[FX_COLUMNS].copy()
+        fx["effective_date"] = pd.to_datetime(fx["effective_date"]).astype("datetime64[ns]")
+        fx["rate"] = fx["rate"].astype(np.float64)
+        self.fx = fx.sort_values(["currency", "effective_date"], kind="stable").reset_index(drop=True)
+
+        stream_rates = stream_rates.copy()
+        if "country" not in stream_rates.columns:
+            stream_rates["country"] = WILDCARD_COUNTRY
+        stream_rates = stream_rates[STREAM_RATE_COLUMNS]
+        stream_rates["country"] = stream_rates["country"].fillna(WILDCARD_COUNTRY).replace("", WILDCARD_COUNTRY)
+        stream_rates["effective_date"] = pd.to_datetime(stream_rates["effective_date"]).astype("datetime64[ns]")
+        stream_rates["rate"] = stream_rates["rate"].astype(np.float64)
+        self.stream_rates = stream_rates.sort_values("effective_date", kind="stable").reset_index(drop=True)
+
+        # currency -> (sorted effective dates, rates) for searchsorted lookups
+        self._fx_index: Dict[str, tuple] = {
+            currency: (group["effective_date"].to_numpy(dtype="datetime64[ns]"), group["rate"].to_numpy())
+            for currency, group in self.fx.groupby("currency", sort=False)
+        }
+
+    @classmethod
+    def from_files(cls, fx_path: str, stream_rates_path: str, default_stream_rate: float = 0.003) -> "RateStore":
+        """Load both tables from CSV or Parquet files."""
+        return cls(read_table(fx_path), read_table(stream_rates_path), default_stream_rate)
+
+    @classmethod
+    def from_constants(cls, stream_rates: Dict[str, float], usd_rates: Dict[str, float],
+                       default_stream_rate: float = 0.003) -> "RateStore":
+        """A store with one timeless rate per platform/currency (e.g. the `models` constants)."""
+        epoch = pd.Timestamp("1970-01-01")
+        fx = pd.DataFrame({"effective_date": epoch, "currency": list(usd_rates), "rate": list(usd_rates.values())})
+        streams = pd.DataFrame({"effective_date": epoch, "platform": list(stream_rates),
+                                "country": WILDCARD_COUNTRY, "rate": list(stream_rates.values())})
+        return cls(fx, streams, default_stream_rate)
+
+    def fx_rates(self, month: pd.Series, currency: str = "NGN") -> np.ndarray:
+        """Per-row rate (currency per USD) in effect for each row's month."""
+        codes, months = month_dates(month)
+        return self._fx_for_months(months, currency)[codes]
+
+    def stream_rates_for(self, month: pd.Series, platform: pd.Series, country: pd.Series) -> np.ndarray:
+        """Per-row USD per-stream rate for each row's (month, platform, country)."""
+        return self._stream_rates(*month_dates(month), platform, country)
+
+    def lookup(self, month: pd.Series, platform: pd.Series, country: pd.Series, currency: str = "NGN"):
+        """(per-stream USD rates, exchange rates) per row, factorizing `month` only once."""
+        codes, months = month_dates(month)
+        return self._stream_rates(codes, months, platform, country), self._fx_for_months(months, currency)[codes]
+
+    def _fx_for_months(self, months: np.ndarray, currency: str) -> np.ndarray:
+        if currency not in self._fx_index:
+            raise KeyError(f"No exchange rates for currency '{currency}'")
+        dates, rates = self._fx_index[currency]
+        # Last effective date <= month; earlier months clamp to the first rate
+        position = np.clip(np.searchsorted(dates, months, side="right") - 1, 0, None)
+        return rates[position]
+
+    def _stream_rates(self, month_codes: np.ndarray, months: np.ndarray, platform: pd.Series,
+                      country: pd.Series) -> np.ndarray:
+        platform_codes, platforms = pd.factorize(platform)
+        country_codes, countries = pd.factorize(country)
+
+        # Distinct (month, platform, country) keys present in the rows
+        n_platforms, n_countries = len(platforms) + 1, len(countries) + 1
+        combined = (month_codes.astype(np.int64) * n_platforms + (platform_codes + 1)) * n_countries + (country_codes + 1)
+        key_codes, key_values = pd.factorize(combined)
+        key_country = key_values % n_countries - 1
+        key_platform = (key_values // n_countries) % n_platforms - 1
+        key_month = key_values // (n_countries * n_platforms)
+
+        # Trailing None serves code -1 (missing platform/country)
+        keys = pd.DataFrame({
+            "month_date": months[key_month],
+            "platform": np.append(np.asarray(platforms, dtype=object), None)[key_platform],
+            "country": np.append(np.asarray(countries, dtype=object), None)[key_country],
+            "key": np.arange(len(key_values)),
+        })
+        specific = self.stream_rates[self.stream_rates["country"] != WILDCARD_COUNTRY]
+        wildcard = self.stream_rates[self.stream_rates["country"] == WILDCARD_COUNTRY]
+        # Rates in effect: the country's own, else the platform's wildcard
+        key_rates, _ = self._as_of(keys, ["platform", "country"], specific, "backward")
+        missing = np.isnan(key_rates)
+        if missing.any():
+            key_rates[missing], _ = self._as_of(keys[missing], ["platform"], wildcard, "backward")
+        # Months before any rate took effect: whichever rate started first, the country's on a tie
+        missing = np.isnan(key_rates)
+        if missing.any():
+            country_rates, country_dates = self._as_of(keys[missing], ["platform", "country"], specific, "forward")
+            wildcard_rates, wildcard_dates = self._as_of(keys[missing], ["platform"], wildcard, "forward")
+            use_country = ~np.isnan(country_rates) & (np.isnan(wildcard_rates) | (country_dates <= wildcard_dates))
+            key_rates[missing] = np.where(use_country, country_rates, wildcard_rates)
+        key_rates[np.isnan(key_rates)] = self.default_stream_rate
+        return key_rates[key_codes]
+
+    @staticmethod
+    def _as_of(keys: pd.DataFrame, by, table: pd.DataFrame, direction: str):
+        """
+        (rate, effective date) per key row from an as-of merge on its month.
+
+        `direction` is "backward" (latest effective on or before the month) or
+        "forward" (earliest effective after it); keys with no match get NaN/NaT.
+        """
+        rates = np.full(len(keys), np.nan)
+        dates = np.full(len(keys), np.datetime64("NaT"), dtype="datetime64[ns]")
+        if keys.empty or table.empty:
+            return rates, dates
+        left = keys.assign(_row=np.arange(len(keys))).dropna(subset=by).sort_values("month_date", kind="stable")
+        if left.empty:
+            return rates, dates
+        right = table[["effective_date", "rate"] + by].assign(month_date=table["effective_date"])
+        merged = pd.merge_asof(left, right, on="month_date", by=by, direction=direction)
+        found = merged["rate"].notna().to_numpy()
+        rows = merged["_row"].to_numpy()[found]
+        rates[rows] = merged["rate"].to_numpy()[found]
+        dates[rows] = merged["effective_date"].to_numpy(dtype="datetime64[ns]")[found]
+        return rates, dates
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_rate_store() -> Optional[RateStore]:
+    """The store configured by TUNEIQ_FX_RATES_PATH / TUNEIQ_STREAM_RATES_PATH, loaded once; else None."""
+    global _default_store
+    if _default_store is None and FX_RATES_PATH and STREAM_RATES_PATH:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = RateStore.from_files(FX_RATES_PATH, STREAM_RATES_PATH)
+    return _default_store
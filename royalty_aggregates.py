@@ -0,0 +1,182 @@
+"""
+Incremental underpayment aggregates for append-only monthly streaming data.
+
+`models.detect_underpayment` re-derives royalties and re-aggregates the whole
+history on every call. UnderpaymentAggregates instead keeps partial sums per
+(country, platform, month) partition:
+- rows, streams, expected_revenue_ngn, actual_revenue_ngn   (all rows)
+- underpaid_rows, underpaid_streams, underpaid_expected_ngn,
+  underpaid_actual_ngn, underpayment_pct_sum               (rows above the threshold)
+
+`append(df)` prices only the new rows and adds their sums to the partitions
+they touch and to running per-country totals. `severity_table()` answers the
+`detect_underpayment` table from those totals, with no pass over history;
+restricting it to some platforms or months sums only the selected partitions.
+The mean underpayment is `underpayment_pct_sum / underpaid_rows`.
+
+Rows without a country are not attributed (as in `detect_underpayment`);
+missing platforms and months are recorded as 'Unknown'. Partials can be saved
+to and restored from Parquet.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from tuneiq_app import models
+from tuneiq_app.rates import RateStore
+
+PARTITION_KEYS = ["country", "platform", "month"]
+SUM_COLUMNS = [
+    "rows",
+    "streams",
+    "expected_revenue_ngn",
+    "actual_revenue_ngn",
+    "underpaid_rows",
+    "underpaid_streams",
+    "underpaid_expected_ngn",
+    "underpaid_actual_ngn",
+    "underpayment_pct_sum",
+]
+
+
+def _labels(column: pd.Series) -> np.ndarray:
+    """String labels for a key column (plain, categorical or period); missing values become 'Unknown'."""
+    return column.astype(object).where(column.notna(), "Unknown").astype(str).to_numpy()
+
+
+def _empty_totals() -> pd.DataFrame:
+    return pd.DataFrame({name: pd.Series(dtype=np.float64) for name in SUM_COLUMNS},
+                        index=pd.Index([], name="country", dtype=object))
+
+
+def _severity_from_sums(sums: pd.DataFrame) -> pd.DataFrame:
+    """detect_underpayment's table from per-country sums."""
+    sums = sums[sums["underpaid_rows"] > 0]
+    # Partial stream sums are kept as float64; the table reports whole streams like detect_underpayment
+    streams = sums["underpaid_streams"].round()
+    streams = streams.astype(np.int64) if streams.notna().all() else streams.astype("Int64")
+    severity = pd.DataFrame({
+        "country": sums.index.to_numpy(),
+        "underpayment_pct": (sums["underpayment_pct_sum"] / sums["underpaid_rows"]).to_numpy(),
+        "expected_revenue_ngn": sums["underpaid_expected_ngn"].to_numpy(),
+        "actual_revenue_ngn": sums["underpaid_actual_ngn"].to_numpy(),
+        "streams": streams.array,
+    })
+    severity["lost_revenue_ngn"] = severity["expected_revenue_ngn"] - severity["actual_revenue_ngn"]
+    return severity.sort_values("lost_revenue_ngn", ascending=False)
+
+
+class UnderpaymentAggregates:
+    """
+    Per-(country, platform, month) partial sums behind the underpayment table.
+
+    Args:
+        threshold: Underpayment threshold, as in `detect_underpayment`; fixed for
+            the lifetime of the aggregates because it decides which rows count
+        rates: Rate store used to price appended rows (defaults as in `models`)
+    """
+
+    def __init__(self, threshold: float = 0.15, rates: Optional[RateStore] = None):
+        self.threshold = threshold
+        self.rates = rates
+        # month -> partial sums indexed by (country, platform)
+        self._partials: Dict[str, pd.DataFrame] = {}
+        self._by_country = _empty_totals()
+
+    @property
+    def months(self):
+        """Months with data, in the order they were first appended."""
+        return list(self._partials)
+
+    def partials(self) -> pd.DataFrame:
+        """All partial sums, indexed by (country, platform, month)."""
+        if not self._partials:
+            return pd.DataFrame(columns=SUM_COLUMNS,
+                                index=pd.MultiIndex.from_arrays([[], [], []], names=PARTITION_KEYS))
+        return pd.concat(self._partials, names=["month"]).reorder_levels(PARTITION_KEYS)
+
+    def append(self, df: pd.DataFrame, replace: bool = False):
+        """
+        Add new rows to the aggregates; cost depends only on `df`.
+
+        With `replace`, months present in `df` are restated: their existing
+        partials are dropped first (e.g. when a month's data is re-fetched).
+        """
+        partials = self._partition_sums(df)
+        if partials.empty:
+            return
+        for month, part in partials.groupby(level="month", sort=False):
+            part = part.droplevel("month")
+            existing = self._partials.get(month)
+            if existing is not None and replace:
+                self._by_country = self._by_country.sub(existing.groupby(level="country").sum(), fill_value=0)
+                existing = None
+            self._partials[month] = part if existing is None else existing.add(part, fill_value=0)
+        self._by_country = self._by_country.add(partials.groupby(level="country").sum(), fill_value=0)
+
+    def severity_table(self, platforms: Optional[Iterable[str]] = None,
+                       months: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        The `detect_underpayment` table (country, underpayment_pct, expected_revenue_ngn,
+        actual_revenue_ngn, streams, lost_revenue_ngn) for the data appended so far.
+
+        Without filters it comes straight from the per-country totals; with
+        `platforms`/`months` only the matching partitions are summed.
+        """
+        if platforms is None and months is None:
+            return _severity_from_sums(self._by_country)
+        selected = [self._partials[m] for m in (self._partials if months is None else months) if m in self._partials]
+        if not selected:
+            return _severity_from_sums(_empty_totals())
+        parts = pd.concat(selected)
+        if platforms is not None:
+            parts = parts[parts.index.get_level_values("platform").isin(list(platforms))]
+        return _severity_from_sums(parts.groupby(level="country").sum())
+
+    def save(self, path: str):
+        """Write the partials (and threshold) to a Parquet file."""
+        table = self.partials().reset_index()
+        table.attrs["threshold"] = self.threshold
+        table.to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path: str, rates: Optional[RateStore] = None) -> "UnderpaymentAggregates":
+        """Restore aggregates written by `save`."""
+        table = pd.read_parquet(path)
+        aggregates = cls(threshold=table.attrs.get("threshold", 0.15), rates=rates)
+        if not table.empty:
+            partials = table.set_index(PARTITION_KEYS)[SUM_COLUMNS]
+            for month, part in partials.groupby(level="month", sort=False):
+                aggregates._partials[month] = part.droplevel("month")
+            aggregates._by_country = partials.groupby(level="country").sum()
+        return aggregates
+
+    def _partition_sums(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Partial sums of `df` per (country, platform, month)."""
+        if df.empty:
+            return pd.DataFrame(columns=SUM_COLUMNS)
+        priced = models.estimate_royalties(df, self.rates)
+        expected = priced["expected_revenue_ngn"].to_numpy(dtype=np.float64)
+        actual = priced["actual_revenue_ngn"].to_numpy(dtype=np.float64)
+        streams = priced["streams"].to_numpy(dtype=np.float64)
+        underpayment_pct, valid = models.underpayment_ratio(expected, actual)
+        underpaid = valid & (underpayment_pct > self.threshold)
+
+        month = priced["month"] if "month" in priced.columns else pd.Series(None, index=priced.index, dtype=object)
+        rows = pd.DataFrame({
+            "country": priced["country"].to_numpy(),
+            "platform": _labels(priced["platform"]),
+            "month": _labels(month),
+            "rows": 1.0,
+            "streams": streams,
+            "expected_revenue_ngn": expected,
+            "actual_revenue_ngn": actual,
+            "underpaid_rows": underpaid.astype(np.float64),
+            "underpaid_streams": np.where(underpaid, streams, 0.0),
+            "underpaid_expected_ngn": np.where(underpaid, expected, 0.0),
+            "underpaid_actual_ngn": np.where(underpaid, actual, 0.0),
+            "underpayment_pct_sum": np.where(underpaid, underpayment_pct, 0.0),
+        })
+        return rows.groupby(PARTITION_KEYS, sort=False).sum()
@@ -0,0 +1,221 @@
+"""
+Economic impact scenarios for many artists at once.
+
+`models.economic_impact_proxy` values one frame with fixed assumptions
+(INDIRECT_MULTIPLIER, CULTURAL_EXPORT_PER_STREAM_USD, NGN_RATE, STREAM_RATES).
+A scenario engine sweeps those assumptions instead: each scenario is one row
+of parameters, and every (scenario, artist) pair is evaluated.
+
+The rows are reduced once to per-artist totals (reported USD, foreign streams
+and streams per platform); the N-scenario by M-artist grid is then a handful of
+broadcast array operations and one (N x P) @ (P x M) product for expected
+revenue, so no Python loop runs per scenario or per artist.
+
+Scenario parameters (columns of the scenarios frame):
+- indirect_multiplier               indirect revenue per unit of direct revenue
+- cultural_export_per_stream_usd    export value per foreign stream
+- ngn_rate                          NGN per USD
+- stream_rate_scale                 multiplier on every per-stream rate (optional, 1.0)
+- stream_rate:<platform>            per-stream USD rate for one platform
+                                    (optional; NaN or absent keeps STREAM_RATES)
+
+Scenarios are priced from the `models` constants only: a rate store configured
+through TUNEIQ_FX_RATES_PATH / TUNEIQ_STREAM_RATES_PATH (`rates.get_rate_store`)
+is not consulted, since its rates vary by month and country while a scenario
+holds one rate per platform. The default scenario therefore reproduces
+`economic_impact_proxy(df, rates=RateStore.from_constants(...))` per artist,
+which is `economic_impact_proxy` itself when no rate store is configured.
+
+Usage:
+    python -m tuneiq_app.scenarios [--csv PATH] [--ngn-rate 850 1500] [--stream-rate Spotify=0.003,0.004] [--out PATH]
+"""
+
+import argparse
+import itertools
+import os
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from tuneiq_app import models
+
+PARAMETERS = ["indirect_multiplier", "cultural_export_per_stream_usd", "ngn_rate", "stream_rate_scale"]
+DEFAULTS = {
+    "indirect_multiplier": models.INDIRECT_MULTIPLIER,
+    "cultural_export_per_stream_usd": models.CULTURAL_EXPORT_PER_STREAM_USD,
+    "ngn_rate": models.NGN_RATE,
+    "stream_rate_scale": 1.0,
+}
+STREAM_RATE_PREFIX = "stream_rate:"
+RESULT_COLUMNS = [
+    "streams",
+    "expected_revenue_ngn",
+    "direct_revenue_ngn",
+    "indirect_revenue_ngn",
+    "cultural_export_value_ngn",
+    "total_economic_impact_ngn",
+]
+
+
+def scenario_grid(**ranges: Iterable) -> pd.DataFrame:
+    """
+    Every combination of the given parameter values, one scenario per row.
+
+    Keyword names are scenario parameters (PARAMETERS or 'stream_rate:<platform>');
+    parameters not given take their DEFAULTS value.
+
+        scenario_grid(indirect_multiplier=[2, 2.5, 3], ngn_rate=[850, 1500])
+    """
+    unknown = [name for name in ranges if name not in PARAMETERS and not name.startswith(STREAM_RATE_PREFIX)]
+    if unknown:
+        raise ValueError(f"Unknown scenario parameters: {', '.join(unknown)}")
+    values = {name: [default] for name, default in DEFAULTS.items()}
+    values.update({name: list(np.atleast_1d(v)) for name, v in ranges.items()})
+    grid = pd.DataFrame(list(itertools.product(*values.values())), columns=list(values))
+    grid.index.name = "scenario"
+    return grid
+
+
+class ArtistTotals:
+    """
+    Per-artist totals the scenario grid is computed from.
+
+    Attributes:
+        artists: Artist names (M)
+        platforms: Platform names (P); None stands for a missing platform
+        streams: (M,) total streams
+        reported_usd: (M,) reported revenue in USD (missing values skipped)
+        foreign_streams: (M,) streams outside models.HOME_COUNTRIES
+        platform_streams: (M, P) streams per artist and platform
+    """
+
+    def __init__(self, df: pd.DataFrame, by: str = "artist"):
+        artist_codes, artists = pd.factorize(df[by])
+        platform_codes, platforms = pd.factorize(df["platform"])
+        # Missing platforms get their own trailing column; rows without an artist are dropped
+        platform_codes[platform_codes < 0] = len(platforms)
+        keep = artist_codes >= 0
+        artist_codes, platform_codes = artist_codes[keep], platform_codes[keep]
+        n_artists, n_platforms = len(artists), len(platforms) + 1
+
+        streams = df["streams"].to_numpy(dtype=np.float64)[keep]
+        reported = df["reported_revenue_usd"].to_numpy(dtype=np.float64)[keep]
+        foreign = ~df["country"].isin(models.HOME_COUNTRIES).to_numpy()[keep]
+
+        self.artists = np.asarray(artists, dtype=object)
+        self.platforms = list(platforms) + [None]
+        self.streams = np.bincount(artist_codes, weights=np.nan_to_num(streams), minlength=n_artists)
+        self.reported_usd = np.bincount(artist_codes, weights=np.nan_to_num(reported), minlength=n_artists)
+        self.foreign_streams = np.bincount(artist_codes, weights=np.where(foreign, np.nan_to_num(streams), 0.0),
+                                           minlength=n_artists)
+        self.platform_streams = np.bincount(artist_codes * n_platforms + platform_codes, weights=np.nan_to_num(streams),
+                                            minlength=n_artists * n_platforms).reshape(n_artists, n_platforms)
+
+    def stream_rates(self, scenarios: pd.DataFrame) -> np.ndarray:
+        """(N, P) USD per-stream rate of every platform under every scenario (base: models.STREAM_RATES)."""
+        base = np.array([models.STREAM_RATES.get(name, models.DEFAULT_STREAM_RATE) for name in self.platforms])
+        rates = np.broadcast_to(base, (len(scenarios), len(base))).copy()
+        for p, name in enumerate(self.platforms):
+            column = f"{STREAM_RATE_PREFIX}{name}"
+            if name is not None and column in scenarios.columns:
+                override = scenarios[column].to_numpy(dtype=np.float64)
+                rates[:, p] = np.where(np.isnan(override), rates[:, p], override)
+        return rates * _parameter(scenarios, "stream_rate_scale")[:, None]
+
+
+def _parameter(scenarios: pd.DataFrame, name: str) -> np.ndarray:
+    if name in scenarios.columns:
+        return scenarios[name].to_numpy(dtype=np.float64)
+    return np.full(len(scenarios), float(DEFAULTS[name]))
+
+
+def evaluate_scenarios(df: pd.DataFrame, scenarios: Optional[pd.DataFrame] = None, by: str = "artist",
+                       totals: Optional[ArtistTotals] = None) -> pd.DataFrame:
+    """
+    Economic impact of every artist under every scenario.
+
+    Args:
+        df: Streaming rows with `by`, platform, country, streams and reported_revenue_usd
+        scenarios: One scenario per row (see module docstring); defaults to the
+            `models` constants only
+        by: Column identifying artists
+        totals: Precomputed `ArtistTotals(df, by)`, to sweep the same data repeatedly
+
+    Returns:
+        Tidy DataFrame with one row per (scenario, artist): scenario id, the
+        scenario parameters, `by`, then RESULT_COLUMNS (amounts in NGN)
+    """
+    if scenarios is None:
+        scenarios = scenario_grid()
+    if totals is None:
+        totals = ArtistTotals(df, by)
+
+    ngn_rate = _parameter(scenarios, "ngn_rate")[:, None]                              # (N, 1)
+    expected_usd = totals.stream_rates(scenarios) @ totals.platform_streams.T          # (N, M)
+    direct = ngn_rate * totals.reported_usd[None, :]
+    indirect = direct * _parameter(scenarios, "indirect_multiplier")[:, None]
+    export = (ngn_rate * _parameter(scenarios, "cultural_export_per_stream_usd")[:, None]) * totals.foreign_streams[None, :]
+
+    n_scenarios, n_artists = direct.shape
+    parameters = scenarios.reset_index(drop=True)
+    result = parameters.loc[np.repeat(np.arange(n_scenarios), n_artists)].reset_index(drop=True)
+    result.insert(0, "scenario", np.repeat(scenarios.index.to_numpy(), n_artists))
+    result[by] = np.tile(totals.artists, n_scenarios)
+    result["streams"] = np.tile(totals.streams, n_scenarios)
+    result["expected_revenue_ngn"] = (expected_usd * ngn_rate).ravel()
+    result["direct_revenue_ngn"] = direct.ravel()
+    result["indirect_revenue_ngn"] = indirect.ravel()
+    result["cultural_export_value_ngn"] = export.ravel()
+    result["total_economic_impact_ngn"] = (direct + indirect + export).ravel()
+    return result
+
+
+def _floats(values: Optional[Sequence[str]]):
+    return [float(v) for v in values] if values else None
+
+
+def _stream_rate_ranges(parser: argparse.ArgumentParser, options: Optional[Sequence[str]]) -> dict:
+    """{'stream_rate:<platform>': [rates]} from PLATFORM=VALUES options (comma-separated values)."""
+    ranges = {}
+    for option in options or []:
+        platform, sep, values = option.partition("=")
+        if not sep or not platform.strip() or not values.strip():
+            parser.error(f"--stream-rate expects PLATFORM=VALUES, got '{option}'")
+        try:
+            ranges[f"{STREAM_RATE_PREFIX}{platform.strip()}"] = _floats(values.split(","))
+        except ValueError:
+            parser.error(f"--stream-rate values must be numbers, got '{values}'")
+    return ranges
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Economic impact of every artist under a grid of scenarios")
+    parser.add_argument("--csv", default=os.path.join(os.path.dirname(__file__), "sample_data", "streaming_sample.csv"),
+                        help="streaming CSV (default: sample data)")
+    parser.add_argument("--by", default="artist", help="column identifying each artist")
+    parser.add_argument("--indirect-multiplier", nargs="+")
+    parser.add_argument("--cultural-export-per-stream-usd", nargs="+")
+    parser.add_argument("--ngn-rate", nargs="+")
+    parser.add_argument("--stream-rate-scale", nargs="+")
+    parser.add_argument("--stream-rate", action="append", metavar="PLATFORM=VALUES",
+                        help="per-stream USD rates for one platform, comma-separated (repeatable), "
+                             "e.g. --stream-rate Spotify=0.003,0.004")
+    parser.add_argument("--out", help="write the results to this CSV instead of printing them")
+    args = parser.parse_args(argv)
+
+    ranges = {name: _floats(getattr(args, name)) for name in PARAMETERS}
+    ranges = {name: values for name, values in ranges.items() if values}
+    ranges.update(_stream_rate_ranges(parser, args.stream_rate))
+    scenarios = scenario_grid(**ranges)
+    # The sample file has '#' comment lines between blocks of rows
+    df = pd.read_csv(args.csv, comment='#')
+    result = evaluate_scenarios(df, scenarios, by=args.by)
+    if args.out:
+        result.to_csv(args.out, index=False)
+    else:
+        print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
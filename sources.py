@@ -0,0 +1,290 @@
+"""
+Registry of live data sources for `data_pipeline.fetch_all` and `fetch_live_data`.
+
+Every source declares:
+- name: registry key ('spotify', 'apple_music', 'web'); its label and
+  platform ('Apple Music', 'apple-music', ...) resolve to it as well
+- platform: ledger platform whose sample rows its rows replace (None for
+  sources that return other data, such as the web scraper)
+- schema: columns every non-empty result must have
+- credentials: credential fields it reads (empty when none are needed)
+- cost: API requests one fetch spends; cache hits cost nothing
+- cache_ttl: seconds a result is reused for the same artist and credentials
+- concurrency: fetches that may run at once in bulk jobs (rate limits)
+
+and implements one contract, `async fetch(artist, credentials)`, returning a
+DataFrame or None (no data). `SourceRegistry.fetch_many` runs any subset of
+sources concurrently, each with its own timeout; a source that raises, times
+out or returns the wrong columns only loses its own result. New sources plug
+in with `register_source` and are then reachable by name from every caller.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Seconds each source fetch may take before it is reported as timed out
+FETCH_TIMEOUT_SECONDS = float(os.getenv("TUNEIQ_FETCH_TIMEOUT", "30"))
+
+# Columns of a streaming ledger source (see ledger_schema)
+LEDGER_COLUMNS = ("artist", "track", "platform", "country", "streams", "month")
+
+
+def _normalize(name: str) -> str:
+    """'Apple Music', 'apple-music' and 'apple_music' all become 'apple_music'."""
+    return re.sub(r"[\s\-]+", "_", name.strip().lower())
+
+
+class DataSource:
+    """
+    Base class for a live data source.
+
+    Subclasses set the declaration attributes and implement `fetch`.
+    """
+
+    name: str = ""
+    label: str = ""
+    platform: Optional[str] = None
+    schema: Tuple[str, ...] = ()
+    credentials: Tuple[str, ...] = ()
+    cost: float = 1.0
+    cache_ttl: float = 0.0
+    concurrency: int = 2
+
+    async def fetch(self, artist: Optional[str], credentials: Optional[Dict] = None) -> Optional[pd.DataFrame]:
+        """Rows for `artist`, or None when the source has no data."""
+        raise NotImplementedError
+
+    @property
+    def needs_credentials(self) -> bool:
+        return bool(self.credentials)
+
+
+class FunctionSource(DataSource):
+    """
+    A source backed by a blocking function `fetch(artist, credentials)`.
+
+    The function runs in the event loop's default executor so blocking HTTP
+    clients don't stall other sources.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[Optional[str], Optional[Dict]], Optional[pd.DataFrame]],
+                 label: Optional[str] = None, platform: Optional[str] = None, schema: Sequence[str] = (),
+                 credentials: Sequence[str] = (), cost: float = 1.0, cache_ttl: float = 0.0,
+                 concurrency: int = 2):
+        self.name = _normalize(name)
+        self.label = label or name
+        self.platform = platform
+        self.schema = tuple(schema)
+        self.credentials = tuple(credentials)
+        self.cost = cost
+        self.cache_ttl = cache_ttl
+        self.concurrency = concurrency
+        self._fetch = fetch
+
+    async def fetch(self, artist: Optional[str], credentials: Optional[Dict] = None) -> Optional[pd.DataFrame]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._fetch, artist, credentials)
+
+
+def _credentials_key(credentials: Optional[Dict]) -> str:
+    """Stable digest of a credentials dict, so secrets are not kept as cache keys."""
+    payload = json.dumps(credentials or {}, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SourceRegistry:
+    """
+    Named data sources with a shared result cache.
+
+    Results are cached per (source, artist, credentials) for the source's
+    `cache_ttl`; only DataFrame results are cached, never None, errors or
+    timeouts.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, DataSource] = {}
+        self._aliases: Dict[str, str] = {}
+        self._cache: Dict[Tuple[str, Optional[str], str], Tuple[float, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, source: DataSource, replace: bool = False) -> DataSource:
+        """Add `source`; an existing source of the same name is only replaced with `replace=True`."""
+        name = _normalize(source.name)
+        with self._lock:
+            if name in self._sources and not replace:
+                raise ValueError(f"Data source '{name}' is already registered")
+            self._sources[name] = source
+            for alias in (source.label, source.platform):
+                if alias:
+                    self._aliases[_normalize(alias)] = name
+            self._cache = {key: value for key, value in self._cache.items() if key[0] != name}
+        return source
+
+    def unregister(self, name: str):
+        """Remove a source and its aliases and cached results."""
+        source = self.get(name)
+        with self._lock:
+            del self._sources[source.name]
+            self._aliases = {alias: key for alias, key in self._aliases.items() if key != source.name}
+            self._cache = {key: value for key, value in self._cache.items() if key[0] != source.name}
+
+    def get(self, name: str) -> DataSource:
+        """Source by name, label or platform; ValueError for unknown names."""
+        key = _normalize(name)
+        key = key if key in self._sources else self._aliases.get(key, key)
+        if key not in self._sources:
+            raise ValueError(f"Invalid data source '{name}'. Use one of: {', '.join(self.names())}.")
+        return self._sources[key]
+
+    def names(self) -> list:
+        return list(self._sources)
+
+    def describe(self) -> pd.DataFrame:
+        """One row per source with its declarations."""
+        return pd.DataFrame([{
+            "name": source.name,
+            "label": source.label,
+            "platform": source.platform,
+            "schema": ", ".join(source.schema),
+            "credentials": ", ".join(source.credentials),
+            "cost": source.cost,
+            "cache_ttl": source.cache_ttl,
+            "concurrency": source.concurrency,
+        } for source in self._sources.values()])
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _by_name(self, options: Optional[Dict]) -> Dict:
+        """Re-key a per-source dict by registry name."""
+        return {self.get(key).name: value for key, value in (options or {}).items()}
+
+    def _cached(self, key) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._cache[key]
+                return None
+            return entry[1].copy()
+
+    async def fetch_one(self, name: str, artist: Optional[str] = None, credentials: Optional[Dict] = None,
+                        timeout: Optional[float] = None):
+        """(rows or None, report) for one source; see `fetch_many` for the report."""
+        return await self._fetch_one(self.get(name), artist, credentials,
+                                     FETCH_TIMEOUT_SECONDS if timeout is None else timeout)
+
+    async def _fetch_one(self, source: DataSource, artist: Optional[str], credentials: Optional[Dict],
+                         timeout: float):
+        if source.needs_credentials and not credentials:
+            return None, {"status": "no credentials", "seconds": 0.0, "rows": 0, "cost": 0.0}
+        key = (source.name, artist, _credentials_key(credentials))
+        cached = self._cached(key) if source.cache_ttl > 0 else None
+        if cached is not None:
+            return cached, {"status": "cached", "seconds": 0.0, "rows": len(cached), "cost": 0.0}
+
+        t0 = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(source.fetch(artist, credentials), timeout)
+        except asyncio.TimeoutError:
+            print(f"{source.label} fetch timed out after {timeout:g}s")
+            return None, {"status": "timeout", "seconds": time.perf_counter() - t0, "rows": 0, "cost": source.cost}
+        except Exception as e:
+            print(f"{source.label} API Error: {e}")
+            return None, {"status": "error", "seconds": time.perf_counter() - t0, "rows": 0, "cost": source.cost}
+        seconds = time.perf_counter() - t0
+
+        if data is not None and not data.empty:
+            missing = [column for column in source.schema if column not in data.columns]
+            if missing:
+                print(f"{source.label} API Error: result is missing columns {missing}")
+                return None, {"status": "error", "seconds": seconds, "rows": 0, "cost": source.cost}
+        if data is not None and source.cache_ttl > 0:
+            with self._lock:
+                self._cache[key] = (time.time() + source.cache_ttl, data.copy())
+        status = "ok" if data is not None else "no data"
+        return data, {"status": status, "seconds": seconds, "rows": 0 if data is None else len(data),
+                      "cost": source.cost}
+
+    async def fetch_many(self, names: Iterable[str], artist: Optional[str] = None,
+                         credentials: Optional[Dict[str, Dict]] = None,
+                         timeouts: Optional[Dict[str, float]] = None):
+        """
+        Fetch several sources concurrently.
+
+        Args:
+            names: Sources to fetch (names, labels or platforms)
+            artist: Artist to fetch for
+            credentials: Credentials per source (keyed by any of its names)
+            timeouts: Seconds per source (keyed by any of its names; default
+                TUNEIQ_FETCH_TIMEOUT)
+
+        Returns:
+            ({label: DataFrame or None}, {label: report}) in the order of
+            `names`. Each report has status ('ok', 'no data', 'cached',
+            'no credentials', 'error' or 'timeout'), seconds, rows and cost.
+        """
+        sources = list(dict.fromkeys(self.get(name) for name in names))
+        creds, limits = self._by_name(credentials), self._by_name(timeouts)
+        outcomes = await asyncio.gather(*(
+            self._fetch_one(source, artist, creds.get(source.name), limits.get(source.name, FETCH_TIMEOUT_SECONDS))
+            for source in sources
+        ))
+        results = {source.label: data for source, (data, _) in zip(sources, outcomes)}
+        report = {source.label: info for source, (_, info) in zip(sources, outcomes)}
+        return results, report
+
+    def fetch(self, names: Iterable[str], artist: Optional[str] = None,
+              credentials: Optional[Dict[str, Dict]] = None,
+              timeouts: Optional[Dict[str, float]] = None):
+        """
+        `fetch_many` for synchronous callers.
+
+        Runs on a private event loop (`run_sync`), so the call returns after
+        the slowest timeout at most.
+        """
+        names = list(names)
+        if not names:
+            return {}, {}
+        return run_sync(self.fetch_many(names, artist, credentials, timeouts), max_workers=len(names))
+
+
+def run_sync(coroutine, max_workers: int):
+    """
+    Run `coroutine` on a private event loop with `max_workers` fetch threads.
+
+    Threads still running when it finishes (sources that timed out) are
+    abandoned rather than joined.
+    """
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="tuneiq-fetch")
+    loop.set_default_executor(executor)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+registry = SourceRegistry()
+
+
+def register_source(source: DataSource, replace: bool = False) -> DataSource:
+    """Add `source` to the process-wide registry used by `data_pipeline`."""
+    return registry.register(source, replace=replace)
+
+
+def get_source(name: str) -> DataSource:
+    """Source from the process-wide registry by name, label or platform."""
+    return registry.get(name)
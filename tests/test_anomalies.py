@@ -0,0 +1,57 @@
+import sys
+import os
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app.anomalies import UnderpaymentAnomalyDetector, detect_anomalies
+
+
+class TestUnderpaymentAnomalies(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(6)
+        months = [f'2024-{m:02d}' for m in range(1, 13)] + [f'2025-{m:02d}' for m in range(1, 7)]
+        rows = []
+        for track in ['Location', 'Last Last', 'Ye']:
+            for country in ['Nigeria', 'Ghana', 'United Kingdom']:
+                for month in months:
+                    streams = rng.integers(1000, 100_000, 3)
+                    # Platforms pay about 70% of the Spotify rate, with noise
+                    paid = streams * 0.004 * rng.normal(0.7, 0.02, 3)
+                    rows.append(pd.DataFrame({'track': track, 'country': country, 'month': month,
+                                              'platform': 'Spotify', 'streams': streams,
+                                              'reported_revenue_usd': paid}))
+        self.df = pd.concat(rows, ignore_index=True)
+        # One month where Ye in Ghana is paid a fifth of the usual amount
+        spike = (self.df['track'] == 'Ye') & (self.df['country'] == 'Ghana') & (self.df['month'] == '2025-03')
+        self.df.loc[spike, 'reported_revenue_usd'] *= 0.2
+
+    def test_flags_the_injected_drop(self):
+        anomalies = detect_anomalies(self.df, only_anomalies=True)
+        self.assertEqual(anomalies[['track', 'country', 'month']].values.tolist(), [['Ye', 'Ghana', '2025-03']])
+        cells = detect_anomalies(self.df)
+        self.assertEqual(len(cells), 3 * 3 * 18)
+        self.assertFalse(cells[cells['baseline_months'] < 3]['anomaly'].any())
+
+    def test_incremental_months_match_full_run(self):
+        full = detect_anomalies(self.df).set_index(['track', 'country', 'month']).sort_index()
+        detector = UnderpaymentAnomalyDetector()
+        parts = []
+        for _, month in self.df.groupby('month'):
+            parts.append(detector.update(month))
+        incremental = pd.concat(parts).set_index(['track', 'country', 'month']).sort_index()
+        pd.testing.assert_frame_equal(incremental, full, check_dtype=False)
+
+        # Restating a recent month rescores it and the months after it
+        restated = self.df[self.df['month'] == '2025-04'].assign(streams=1, reported_revenue_usd=0.0)
+        result = detector.update(restated)
+        self.assertEqual(sorted(result['month'].unique()), ['2025-04', '2025-05', '2025-06'])
+        with self.assertRaises(ValueError):
+            detector.update(self.df[self.df['month'] == '2024-01'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,47 @@
 import sys
 import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 import pandas as pd
 
 # Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from tuneiq_app.data_pipeline import fetch_all
+from tuneiq_app import data_pipeline
+from tuneiq_app.data_pipeline import SAMPLE_PATH, LedgerFileCache, fetch_all, load_sample_data, merge_live_data
+from tuneiq_app.ledger_schema import coerce_ledger
+
+
+def _live_rows(platform, delay=0.0, fail=False, barrier=None, release=None, finished=None):
+    """
+    Fake platform fetcher. `barrier` only opens once every platform sharing it
+    is in flight at the same time; `release` blocks the fetch until it is set.
+    """
+    def fetch(*args, **kwargs):
+        if barrier is not None:
+            barrier.wait()
+        if release is not None:
+            release.wait(10)
+        time.sleep(delay)
+        if finished is not None:
+            finished.append(platform)
+        if fail:
+            raise RuntimeError(f"{platform} unavailable")
+        return pd.DataFrame({'artist': ['Tems'], 'track': ['Free Mind'], 'platform': [platform],
+                             'country': ['Nigeria'], 'streams': [1000], 'month': ['2025-03'],
+                             'reported_revenue_usd': [3.5]})
+    return fetch
 
 
 class TestDataPipeline(unittest.TestCase):
+    def setUp(self):
+        # Live results are cached per source; every test fetches afresh
+        data_pipeline.SOURCES.clear_cache()
+
     def test_fetch_all_returns_dataframe(self):
         df = fetch_all()
         self.assertIsInstance(df, pd.DataFrame)
@@ -18,7 +50,98 @@ class TestDataPipeline(unittest.TestCase):
         self.assertIn('streams', df.columns)
         # Should have at least one row in sample data
         self.assertGreaterEqual(len(df), 1)
+        self.assertEqual(df.attrs['fetch_report'], {})
+
+    def test_platforms_fetch_concurrently_with_isolated_failures(self):
+        creds = {'client_id': 'id', 'client_secret': 'secret'}
+        # Fetched one after another, the first fetch would break the barrier and report an error
+        both_in_flight = threading.Barrier(2, timeout=5)
+        with mock.patch.object(data_pipeline, 'get_spotify_data',
+                               _live_rows('Spotify', delay=0.05, barrier=both_in_flight)), \
+                mock.patch.object(data_pipeline, 'get_youtube_analytics',
+                                  _live_rows('YouTube', delay=0.05, barrier=both_in_flight)), \
+                mock.patch.object(data_pipeline, 'get_apple_music_data', _live_rows('Apple Music', fail=True)):
+            df = fetch_all(spotify_creds=creds, youtube_creds={'token': 't'}, apple_music_creds={'developer_token': 't'})
+
+        sample = load_sample_data()
+        expected = pd.concat([sample[~sample['platform'].isin(['Spotify', 'YouTube'])],
+                              _live_rows('Spotify')(), _live_rows('YouTube')()])
+        pd.testing.assert_frame_equal(df.astype(str), expected.reset_index(drop=True).astype(str))
+        report = df.attrs['fetch_report']
+        self.assertEqual([report[p]['status'] for p in ('Spotify', 'YouTube', 'Apple Music')], ['ok', 'ok', 'error'])
+        self.assertGreaterEqual(report['Spotify']['seconds'], 0.05)
+
+    def test_slow_platform_times_out_and_keeps_sample_rows(self):
+        creds = {'client_id': 'id', 'client_secret': 'secret'}
+        release, finished = threading.Event(), []
+        self.addCleanup(release.set)
+        with mock.patch.object(data_pipeline, 'get_spotify_data',
+                               _live_rows('Spotify', release=release, finished=finished)), \
+                mock.patch.object(data_pipeline, 'get_youtube_analytics', _live_rows('YouTube')):
+            df = fetch_all(spotify_creds=creds, youtube_creds={'token': 't'}, timeouts={'Spotify': 0.2})
+        # fetch_all returned while the Spotify fetch was still blocked: it was abandoned, not joined
+        self.assertEqual(finished, [])
+        self.assertEqual(df.attrs['fetch_report']['Spotify']['status'], 'timeout')
+        sample = load_sample_data()
+        self.assertEqual((df['platform'] == 'Spotify').sum(), (sample['platform'] == 'Spotify').sum())
+        self.assertEqual((df['platform'] == 'YouTube').sum(), 1)
+
+
+    def test_merge_live_data_matches_per_platform_replacement(self):
+        sample = load_sample_data()
+        live = {'Spotify': coerce_ledger(_live_rows('Spotify')().assign(label=['Mavin'])),
+                'YouTube': None,
+                'Apple Music': coerce_ledger(_live_rows('Apple Music')())}
+        merged = merge_live_data(sample, live)
+
+        expected = sample
+        for platform in ('Spotify', 'Apple Music'):
+            expected = pd.concat([expected[expected['platform'] != platform], live[platform]])
+        pd.testing.assert_frame_equal(merged.astype(str), expected.reset_index(drop=True).astype(str))
+        # Categories are unioned across sources rather than falling back to object
+        self.assertIsInstance(merged['artist'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(merged['platform'].dtype, pd.CategoricalDtype)
+        self.assertTrue(merged['label'].iloc[:-2].isna().all())
+
+
+class TestLedgerFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.csv = os.path.join(self.tmp, 'sample.csv')
+        shutil.copy(SAMPLE_PATH, self.csv)
+
+    def test_parses_once_and_hands_out_independent_copies(self):
+        cache = LedgerFileCache(self.csv)
+        first = cache.get()
+        first.loc[0, 'streams'] = 1
+        second = cache.get()
+        self.assertNotEqual(second.loc[0, 'streams'], 1)
+        pd.testing.assert_frame_equal(second, load_sample_data())
+        self.assertEqual(cache.stats(), {'hits': 1, 'loads': 1, 'sidecar_loads': 0})
+
+    def test_reloads_when_file_changes(self):
+        cache = LedgerFileCache(self.csv)
+        rows = len(cache.get(copy=False))
+        with open(self.csv, 'a') as f:
+            f.write("Burna Boy,Last Last,Spotify,Ghana,100,2025-03,0.4\n")
+        stat = os.stat(self.csv)
+        os.utime(self.csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(len(cache.get(copy=False)), rows + 1)
+        self.assertEqual(cache.stats()['loads'], 2)
+
+    def test_sidecar_serves_cold_caches_until_csv_changes(self):
+        sidecar = os.path.join(self.tmp, 'sample.parquet')
+        expected = LedgerFileCache(self.csv, sidecar).get()
+        cold = LedgerFileCache(self.csv, sidecar)
+        pd.testing.assert_frame_equal(cold.get(), expected)
+        self.assertEqual(cold.stats()['sidecar_loads'], 1)
 
+        stat = os.stat(self.csv)
+        os.utime(self.csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        stale = LedgerFileCache(self.csv, sidecar)
+        stale.get()
+        self.assertEqual(stale.stats(), {'hits': 0, 'loads': 1, 'sidecar_loads': 0})
 
 if __name__ == '__main__':
     unittest.main()
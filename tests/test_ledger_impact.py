@@ -0,0 +1,69 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app.ledger_impact import ledger_impact, sniff_encoding
+from tuneiq_app.models import ImpactAccumulator, economic_impact_proxy, economic_impact_proxy_chunked
+from tuneiq_app.scenarios import ArtistTotals
+
+
+class TestChunkedImpact(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        n = 5000
+        streams = rng.integers(1, 10_000_000, n)
+        self.df = pd.DataFrame({
+            'platform': rng.choice(['Spotify', 'YouTube', 'Apple Music', 'Boomplay'], n),
+            'country': rng.choice(['Nigeria', 'NG', 'GB', 'Ghana', None], n),
+            'streams': streams,
+            'reported_revenue_usd': streams * rng.uniform(0.0001, 0.01, n),
+        })
+
+    def test_identical_for_any_chunking(self):
+        expected = economic_impact_proxy(self.df)
+        for size in (1, 7, 999, len(self.df)):
+            chunks = (self.df.iloc[start:start + size] for start in range(0, len(self.df), size))
+            self.assertEqual(economic_impact_proxy_chunked(chunks), expected)
+
+        accumulator = ImpactAccumulator()
+        economic_impact_proxy_chunked([self.df.iloc[::-1]], accumulator=accumulator)
+        by_country = accumulator.by_country().set_index('country')
+        self.assertAlmostEqual(by_country['actual_revenue_ngn'].sum(), expected['direct_revenue_ngn'], delta=1e-3)
+        self.assertEqual(by_country.loc['Nigeria', 'cultural_export_value_ngn'], 0.0)
+        self.assertEqual(by_country.loc['NG', 'cultural_export_value_ngn'], 0.0)
+
+    def test_iso_code_ng_counts_as_domestic(self):
+        ledger = pd.DataFrame({
+            'artist': 'Tems',
+            'platform': 'Spotify',
+            'country': ['Nigeria', 'NG', 'GB'],
+            'streams': [1000, 500, 200],
+            'reported_revenue_usd': [4.0, 2.0, 0.8],
+        })
+        # Only the 200 GB streams are exports: 200 * 0.01 USD * 850 NGN (5950.0 while 'NG' counted as foreign)
+        self.assertEqual(economic_impact_proxy(ledger)['cultural_export_value_ngn'], 1700.0)
+        self.assertEqual(ArtistTotals(ledger).foreign_streams.tolist(), [200.0])
+
+    def test_utf7_ledger_file(self):
+        ledger = self.df.dropna().rename(columns={'reported_revenue_usd': 'last_updated'}).assign(country='GB')
+        ledger.loc[ledger.index[:10], 'country'] = 'Global'
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'artist_tracks.csv')
+            # As written by the scraper, with '_' escaped in the header
+            with open(path, 'w') as handle:
+                handle.write(ledger.to_csv(index=False).replace('last_updated', 'last+AF8-updated', 1))
+            self.assertEqual(sniff_encoding(path), 'utf-7')
+            accumulator = ledger_impact(path, chunk_rows=500)
+        self.assertEqual(accumulator.rows, len(ledger) - 10)
+        self.assertEqual(accumulator.result()['direct_revenue_ngn'], 0.0)
+        self.assertEqual(accumulator.by_country()['streams'].tolist(), [float(ledger['streams'].iloc[10:].sum())])
+
+
+if __name__ == '__main__':
+    unittest.main()
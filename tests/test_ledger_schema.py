@@ -0,0 +1,55 @@
+import sys
+import os
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app.data_pipeline import load_sample_data
+from tuneiq_app.ledger_schema import coerce_ledger, memory_report
+from tuneiq_app.models import detect_underpayment, economic_impact_proxy
+
+
+class TestCoerceLedger(unittest.TestCase):
+    def test_sample_data_uses_compact_dtypes(self):
+        df = load_sample_data()
+        for column in ('artist', 'track', 'platform', 'country'):
+            self.assertIsInstance(df[column].dtype, pd.CategoricalDtype)
+        self.assertEqual(str(df['month'].dtype), 'period[M]')
+        self.assertEqual(df['streams'].dtype, np.uint32)
+
+        raw = pd.read_csv(os.path.join(os.path.dirname(__file__), '..', 'sample_data', 'streaming_sample.csv'),
+                          comment='#')
+        self.assertEqual(economic_impact_proxy(df), economic_impact_proxy(raw))
+        pd.testing.assert_frame_equal(detect_underpayment(df), detect_underpayment(raw), check_dtype=False)
+        self.assertLess(memory_report(raw).loc['total', 'bytes_after'], memory_report(raw).loc['total', 'bytes_before'])
+
+    def test_months_streams_and_revenue_options(self):
+        df = pd.DataFrame({
+            'month': ['2025-11-12', '2025-11', 'Unknown', None],
+            'streams': [1.0, np.nan, 3.0, 4.0],
+            'reported_revenue_usd': [1.5, 2.5, np.nan, 0.0],
+        })
+        coerced = coerce_ledger(df, revenue_dtype='float32')
+        self.assertEqual(coerced['month'].astype(str).tolist(), ['2025-11', '2025-11', 'NaT', 'NaT'])
+        self.assertEqual(str(coerced['streams'].dtype), 'UInt32')
+        self.assertEqual(coerced['reported_revenue_usd'].dtype, np.float32)
+        self.assertEqual(df['streams'].dtype, np.float64)
+
+        too_large = coerce_ledger(pd.DataFrame({'streams': [2**33, 5]}))
+        self.assertEqual(too_large['streams'].dtype, np.int64)
+        pd.testing.assert_frame_equal(coerce_ledger(coerced, revenue_dtype='float32'), coerced)
+
+
+    def test_unparseable_months_count_as_missing(self):
+        df = pd.DataFrame({'month': ['2025-01', 'Unknown', '2025-02', 'Unknown', None], 'streams': [1, 2, 3, 4, 5]})
+        self.assertEqual(df['month'].notna().sum(), 4)
+        # Coerced, 'Unknown' is NaT like a missing month, so month filters drop those rows too
+        coerced = coerce_ledger(df)
+        self.assertEqual(coerced['month'].isna().sum(), 3)
+        self.assertEqual(coerced.loc[coerced['month'].notna(), 'streams'].tolist(), [1, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app import data_pipeline
+from tuneiq_app.ledger_impact import ledger_impact
+from tuneiq_app.ledger_store import LedgerStore
+from tuneiq_app.sources import FunctionSource
+
+ARTISTS = ['Burna Boy', 'Tems', 'Buju (BNXN)']
+
+
+class _ChartSource:
+    """Fake platform API recording calls and the most fetches in flight at once."""
+
+    def __init__(self, platform, delay=0.05, failing=()):
+        self.platform = platform
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, artist, credentials):
+        with self._lock:
+            self.calls.append(artist)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if artist in self.failing:
+            raise RuntimeError("rate limited")
+        return pd.DataFrame({'artist': [artist] * 2, 'track': ['Hit', 'Hit'], 'platform': [self.platform] * 2,
+                             'country': ['Nigeria', 'Ghana'], 'streams': [1000, 400], 'month': ['2025-03'] * 2,
+                             'reported_revenue_usd': [3.0, 1.2]})
+
+
+class TestBulkIngestion(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.chart = _ChartSource('Chartmetric')
+        self.radio = _ChartSource('Radio', failing={'Tems'})
+        for name, fetch, concurrency in (('chartmetric', self.chart, 1), ('radio', self.radio, 3)):
+            data_pipeline.SOURCES.register(FunctionSource(name, fetch, label=fetch.platform, platform=fetch.platform,
+                                                          schema=('artist', 'streams'), concurrency=concurrency))
+            self.addCleanup(data_pipeline.SOURCES.unregister, name)
+
+    def test_ingests_with_per_platform_limits_and_resumes(self):
+        report = data_pipeline.ingest_artists(self.root, ARTISTS, source_names=['chartmetric', 'radio'])
+        self.assertEqual(self.chart.max_in_flight, 1)
+        self.assertGreater(self.radio.max_in_flight, 1)
+        statuses = report.set_index(['artist', 'platform'])['status']
+        self.assertEqual(statuses[('Tems', 'Radio')], 'error')
+        self.assertEqual((statuses == 'ok').sum(), 5)
+
+        store = LedgerStore(self.root)
+        self.assertEqual(len(store.read()), 10)
+        self.assertEqual(store.read(artists=['Buju (BNXN)'], platforms=['Radio'])['artist'].unique().tolist(),
+                         ['Buju (BNXN)'])
+        self.assertEqual(ledger_impact(self.root).rows, 10)
+
+        # A second run only redoes the failed pair
+        self.radio.failing.clear()
+        calls = len(self.chart.calls), len(self.radio.calls)
+        report = data_pipeline.ingest_artists(self.root, ARTISTS, source_names=['chartmetric', 'radio'])
+        self.assertEqual((len(self.chart.calls), len(self.radio.calls)), (calls[0], calls[1] + 1))
+        self.assertEqual(report['status'].value_counts().to_dict(), {'done': 5, 'ok': 1})
+        self.assertEqual(len(store.read()), 12)
+
+    def test_failed_partition_write_only_loses_its_pair(self):
+        original = LedgerStore.write
+
+        def write(store, artist, platform, df):
+            if (artist, platform) == ('Burna Boy', 'Chartmetric'):
+                raise OSError("disk full")
+            return original(store, artist, platform, df)
+
+        with mock.patch.object(LedgerStore, 'write', write):
+            report = data_pipeline.ingest_artists(self.root, ARTISTS, source_names=['chartmetric'])
+        statuses = report.set_index('artist')['status']
+        self.assertEqual(statuses.to_dict(), {'Burna Boy': 'error', 'Tems': 'ok', 'Buju (BNXN)': 'ok'})
+        self.assertNotIn(('Burna Boy', 'Chartmetric'), LedgerStore(self.root).completed())
+
+        report = data_pipeline.ingest_artists(self.root, ARTISTS, source_names=['chartmetric'])
+        self.assertEqual(report['status'].value_counts().to_dict(), {'done': 2, 'ok': 1})
+        self.assertEqual(len(LedgerStore(self.root).read()), 6)
+
+    def test_torn_manifest_line_counts_as_not_completed(self):
+        store = LedgerStore(self.root)
+        store.mark_done('Tems', 'Chartmetric', status='ok', rows=2)
+        with open(store.manifest_path, 'a') as f:
+            f.write('{"artist": "Burna Boy", "platf')
+        self.assertEqual(list(store.completed()), [('Tems', 'Chartmetric')])
+        store.mark_done('Burna Boy', 'Chartmetric', status='ok', rows=2)
+        self.assertEqual(list(store.completed()), [('Tems', 'Chartmetric'), ('Burna Boy', 'Chartmetric')])
+
+
+if __name__ == '__main__':
+    unittest.main()
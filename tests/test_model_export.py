@@ -0,0 +1,59 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app.model_export import compile_estimator, export_model
+from tuneiq_app.predictor import MODEL_PATH, CompiledModel, load_compiled_model, load_tuneiq_model
+
+
+class TestModelExport(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.model = load_tuneiq_model(MODEL_PATH)
+        names = list(self.model.feature_names_in_)
+        self.X = pd.DataFrame(rng.gamma(1.5, 80.0, size=(300, len(names))), columns=names)
+
+    def test_exported_forest_matches_estimator(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'model.npz')
+            meta = export_model(MODEL_PATH, out)
+            compiled = load_compiled_model(out)
+        self.assertEqual(meta['kind'], 'tree_ensemble')
+        self.assertEqual(list(compiled.feature_names_in_), list(self.model.feature_names_in_))
+        np.testing.assert_array_equal(compiled.predict(self.X), self.model.predict(self.X))
+        # Reordered DataFrame columns are realigned by name
+        np.testing.assert_array_equal(compiled.predict(self.X[self.X.columns[::-1]]), self.model.predict(self.X))
+
+    def test_memory_mapped_directory_layout(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'model.npy')
+            export_model(MODEL_PATH, out, layout='npy')
+            compiled = load_compiled_model(out, mmap_mode='r')
+            self.assertIsInstance(compiled.threshold, np.memmap)
+            np.testing.assert_array_equal(compiled.predict(self.X), self.model.predict(self.X))
+            del compiled
+
+    def test_linear_model(self):
+        from sklearn.linear_model import LinearRegression
+
+        y = self.X.to_numpy() @ np.arange(1, self.X.shape[1] + 1) + 3.0
+        linear = LinearRegression().fit(self.X, y)
+        compiled = CompiledModel(*compile_estimator(linear))
+        np.testing.assert_array_equal(compiled.predict(self.X), linear.predict(self.X))
+
+    def test_unsupported_estimator(self):
+        from sklearn.ensemble import GradientBoostingRegressor
+
+        booster = GradientBoostingRegressor(n_estimators=2).fit(self.X, self.X.iloc[:, 0])
+        with self.assertRaises(ValueError):
+            compile_estimator(booster)
+
+
+if __name__ == '__main__':
+    unittest.main()
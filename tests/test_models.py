@@ -0,0 +1,148 @@
+import sys
+import os
+import unittest
+from fractions import Fraction
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app import money
+from tuneiq_app.models import (
+    DEFAULT_STREAM_RATE, NGN_RATE, STREAM_RATES, analyze_royalties, detect_underpayment,
+    economic_impact_proxy, economic_impact_proxy_chunked, estimate_royalties,
+)
+
+
+class TestEstimateRoyalties(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'platform': ['Spotify', 'YouTube', 'Apple Music', 'Boomplay', None],
+            'country': ['Nigeria', 'Ghana', 'Kenya', 'Nigeria', 'Ghana'],
+            'streams': [1000, 2000, 3000, 4000, 5000],
+            'reported_revenue_usd': [3.0, 1.0, 25.0, 10.0, 12.0],
+        })
+
+    def test_matches_per_row_rates(self):
+        result = estimate_royalties(self.df)
+        expected = [
+            1000 * STREAM_RATES['Spotify'],
+            2000 * STREAM_RATES['YouTube'],
+            3000 * STREAM_RATES['Apple Music'],
+            4000 * DEFAULT_STREAM_RATE,
+            5000 * DEFAULT_STREAM_RATE,
+        ]
+        np.testing.assert_array_equal(result['expected_revenue_usd'], expected)
+        np.testing.assert_array_equal(result['expected_revenue_ngn'], np.array(expected) * NGN_RATE)
+        np.testing.assert_array_equal(result['actual_revenue_ngn'], self.df['reported_revenue_usd'] * NGN_RATE)
+        self.assertNotIn('expected_revenue_usd', self.df.columns)
+
+    def test_categorical_platform_and_empty_frame(self):
+        categorical = self.df.assign(platform=self.df['platform'].astype('category'))
+        pd.testing.assert_series_equal(
+            estimate_royalties(categorical)['expected_revenue_usd'],
+            estimate_royalties(self.df)['expected_revenue_usd'],
+        )
+        self.assertEqual(len(estimate_royalties(self.df.iloc[:0])), 0)
+
+
+class TestAnalyzeRoyalties(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n = 400
+        streams = rng.integers(100, 100_000, n)
+        self.df = pd.DataFrame({
+            'platform': rng.choice(['Spotify', 'YouTube', 'Apple Music', 'Boomplay'], n),
+            'country': rng.choice(['Nigeria', 'Ghana', 'Kenya', 'United Kingdom'], n),
+            'streams': streams,
+            'reported_revenue_usd': np.round(streams * rng.uniform(0.0005, 0.006, n), 2),
+        })
+
+    def test_matches_separate_functions(self):
+        analysis = analyze_royalties(self.df, track_memory=True)
+        pd.testing.assert_frame_equal(analysis.frame, estimate_royalties(self.df))
+        pd.testing.assert_frame_equal(analysis.underpayment, detect_underpayment(self.df))
+        self.assertEqual(analysis.impact, economic_impact_proxy(self.df))
+        self.assertGreater(analysis.peak_memory_bytes, 0)
+        self.assertNotIn('expected_revenue_ngn', self.df.columns)
+
+    def test_zero_denominator_rows_are_masked_and_counted(self):
+        apple = pd.DataFrame({
+            'platform': ['Apple Music'] * 3 + [None],
+            'country': ['Nigeria', 'Ghana', 'Ghana', 'Ghana'],
+            'streams': [0, 0, 0, 0],
+            'reported_revenue_usd': [0.0, 5.0, -1.0, 2.0],
+        })
+        df = pd.concat([self.df, apple], ignore_index=True)
+        table = detect_underpayment(df)
+        self.assertTrue(np.isfinite(table.select_dtypes('number').to_numpy()).all())
+        pd.testing.assert_frame_equal(table, detect_underpayment(self.df))
+        self.assertEqual(table.attrs['masked_rows'], {'Apple Music': 3, 'Unknown': 1})
+        # attrs stay comparable, so tables can be combined and printed
+        self.assertEqual(len(pd.concat([table, detect_underpayment(df)])), 2 * len(table))
+        repr(pd.concat([table.head(3), table.tail(3)]))
+        self.assertEqual(analyze_royalties(df).masked_rows.sum(), 4)
+        self.assertEqual(len(detect_underpayment(self.df).attrs['masked_rows']), 0)
+
+    def test_inplace(self):
+        analysis = analyze_royalties(self.df, threshold=0.3, inplace=True)
+        self.assertIs(analysis.frame, self.df)
+        self.assertIn('expected_revenue_ngn', self.df.columns)
+        self.assertIsNone(analysis.peak_memory_bytes)
+        pd.testing.assert_frame_equal(analysis.underpayment, detect_underpayment(self.df, threshold=0.3))
+
+
+
+class TestExactMoney(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        n = 3000
+        streams = rng.integers(1, 50_000_000, n)
+        self.df = pd.DataFrame({
+            'platform': rng.choice(['Spotify', 'YouTube', 'Apple Music', 'Boomplay'], n),
+            'country': rng.choice(['Nigeria', 'Ghana', 'United Kingdom'], n),
+            'streams': streams,
+            'reported_revenue_usd': np.round(streams * rng.uniform(0.0001, 0.006, n), 2),
+        })
+        self.df.loc[::50, 'reported_revenue_usd'] = np.nan
+
+    def test_mul_div_rounds_half_to_even(self):
+        rng = np.random.default_rng(0)
+        values = np.append(rng.integers(-10**12, 10**12, 2000), [5, 15, -5, 25])
+        numerators = np.append(rng.integers(1, 10**6, 2000), [1, 1, 1, 1])
+        actual = money.mul_div(values, numerators, 10)
+        expected = [round(Fraction(int(v) * int(m), 10)) for v, m in zip(values, numerators)]
+        self.assertEqual(actual.tolist(), expected)
+        with self.assertRaises(OverflowError):
+            money.mul_div(np.array([2**62]), 10, 3)
+
+    def test_minor_units_match_rounded_floats(self):
+        exact = estimate_royalties(self.df, exact=True)
+        floats = estimate_royalties(self.df)
+        self.assertEqual(str(exact['expected_revenue_ngn'].dtype), 'Int64')
+        np.testing.assert_allclose(money.to_major(exact['expected_revenue_usd'], 'USD'),
+                                   floats['expected_revenue_usd'], atol=0.005)
+        np.testing.assert_allclose(money.to_major(exact['actual_revenue_ngn']), floats['actual_revenue_ngn'],
+                                   atol=0.005)
+        self.assertEqual(int(exact['actual_revenue_ngn'].isna().sum()), int(self.df['reported_revenue_usd'].isna().sum()))
+
+    def test_totals_tie_out_to_rows(self):
+        exact = estimate_royalties(self.df, exact=True)
+        impact = economic_impact_proxy(self.df, exact=True)
+        self.assertEqual(impact['direct_revenue_ngn'], int(exact['actual_revenue_ngn'].sum()))
+        self.assertIsInstance(impact['total_economic_impact_ngn'], int)
+        chunks = (self.df.iloc[start:start + 7] for start in range(0, len(self.df), 7))
+        self.assertEqual(economic_impact_proxy_chunked(chunks, exact=True), impact)
+
+        analysis = analyze_royalties(self.df, threshold=0.3, exact=True)
+        table = detect_underpayment(self.df, threshold=0.3, exact=True)
+        pd.testing.assert_frame_equal(analysis.underpayment, table)
+        self.assertEqual(analysis.impact, impact)
+        pd.testing.assert_series_equal(table['lost_revenue_ngn'],
+                                       table['expected_revenue_ngn'] - table['actual_revenue_ngn'],
+                                       check_names=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
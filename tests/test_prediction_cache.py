@@ -0,0 +1,75 @@
+import sys
+import os
+import copy
+import tempfile
+import unittest
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app import predictor
+from tuneiq_app.data_pipeline import load_sample_data
+from tuneiq_app.prediction_cache import PredictionCache, cached_predict_impact
+
+
+class TestPredictionCache(unittest.TestCase):
+    def setUp(self):
+        self.df = load_sample_data()
+
+    def test_repeat_call_is_a_hit(self):
+        cache = PredictionCache(max_entries=8, ttl=60, path=None)
+        first = cached_predict_impact(self.df, cache=cache)
+        second = cached_predict_impact(self.df, cache=cache)
+        self.assertEqual(first, second)
+        self.assertEqual(first, predictor.predict_impact(self.df))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_heuristic_settings_are_part_of_the_key(self):
+        cache = PredictionCache(max_entries=8, ttl=60, path=None)
+        cached_predict_impact(self.df, cache=cache)
+        original = predictor.AUTO_SCALE_FACTOR
+        predictor.AUTO_SCALE_FACTOR = original * 2
+        try:
+            cached_predict_impact(self.df, cache=cache)
+        finally:
+            predictor.AUTO_SCALE_FACTOR = original
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_lru_eviction_and_ttl(self):
+        cache = PredictionCache(max_entries=2, ttl=60, path=None)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, {'predicted_gdp': 1.0})
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        expired = PredictionCache(max_entries=2, ttl=-1, path=None)
+        expired.set('a', {'predicted_gdp': 1.0})
+        self.assertIsNone(expired.get('a'))
+
+    def test_disk_tier_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'predictions.sqlite')
+            writer = PredictionCache(max_entries=8, ttl=60, path=path)
+            result = cached_predict_impact(self.df, cache=writer)
+
+            reader = PredictionCache(max_entries=8, ttl=60, path=path)
+            self.assertEqual(cached_predict_impact(self.df, cache=reader), result)
+            self.assertEqual(reader.stats()['disk_hits'], 1)
+            writer._db.close()
+            reader._db.close()
+
+
+    def test_ad_hoc_models_are_never_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PredictionCache(max_entries=8, ttl=60, path=os.path.join(tmp, 'predictions.sqlite'))
+            model = copy.deepcopy(predictor.get_model())
+            result = cached_predict_impact(self.df, model=model, cache=cache)
+            self.assertEqual(result, predictor.predict_impact(self.df, model=model))
+            cached_predict_impact(self.df, model=model, cache=cache)
+            self.assertEqual(cache.stats()['entries'], 0)
+            self.assertEqual(cache._db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0], 0)
+            cache._db.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import sys
+import os
+import asyncio
+import copy
+import threading
+import unittest
+from unittest import mock
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app import predictor
+from tuneiq_app.data_pipeline import load_sample_data
+from tuneiq_app.prediction_cache import PredictionCache
+from tuneiq_app.prediction_service import PredictionService
+
+
+class TestPredictionService(unittest.TestCase):
+    def setUp(self):
+        sample = load_sample_data().dropna(subset=['streams'])
+        self.frames = {
+            'Burna Boy': sample,
+            'Wizkid': sample.head(5).assign(streams=sample.head(5)['streams'] * 40),
+            'Rema': sample.head(3),
+        }
+
+    def test_matches_predict_impact(self):
+        service = PredictionService(cache=False)
+        results = service.predict_many(self.frames)
+        service.close()
+        for name, frame in self.frames.items():
+            expected = predictor.predict_impact(frame)
+            self.assertAlmostEqual(results[name]['predicted_gdp'], expected['predicted_gdp'], places=6)
+            self.assertEqual(results[name]['predicted_jobs'], expected['predicted_jobs'])
+            self.assertAlmostEqual(results[name]['confidence'], expected['confidence'])
+            self.assertEqual(results[name]['auto_scaled'], expected['auto_scaled'])
+
+    def test_coalesces_identical_and_batches_distinct_requests(self):
+        service = PredictionService(window=0.2, cache=False)
+        calls = []
+        original = predictor.predict_features_many
+
+        def counting(X, total_streams, model=None):
+            calls.append(len(X))
+            return original(X, total_streams, model=model)
+
+        start = threading.Barrier(6)
+        futures = []
+
+        def request(frame):
+            start.wait()
+            futures.append(service.submit(frame))
+
+        with mock.patch.object(predictor, 'predict_features_many', counting):
+            threads = [threading.Thread(target=request, args=(frame,))
+                       for frame in [self.frames['Burna Boy']] * 4 + [self.frames['Wizkid'], self.frames['Rema']]]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            results = [future.result(5) for future in futures]
+        service.close()
+
+        self.assertEqual(calls, [3])
+        stats = service.stats()
+        self.assertEqual(stats['requests'], 6)
+        self.assertEqual(stats['coalesced'], 3)
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual(len(results), 6)
+
+    def test_cache_and_async(self):
+        service = PredictionService(cache=PredictionCache(ttl=60))
+        first = asyncio.run(service.predict_async(self.frames['Rema']))
+        second = service.predict(self.frames['Rema'])
+        service.close()
+        self.assertEqual(first, second)
+        self.assertEqual(service.stats()['cache_hits'], 1)
+        self.assertEqual(service.stats()['batches'], 1)
+
+    def test_requests_are_scored_by_the_model_that_prepared_them(self):
+        service = PredictionService(window=0.3, cache=False)
+        old_model, new_model = predictor.get_model(), copy.deepcopy(predictor.get_model())
+        scored_by = []
+        original = predictor.predict_features_many
+
+        def recording(X, total_streams, model=None):
+            scored_by.append((model, len(X)))
+            return original(X, total_streams, model=model)
+
+        with mock.patch.object(predictor, 'predict_features_many', recording):
+            first = service.submit(self.frames['Rema'])
+            # The registry reloads while the first request is still queued
+            with mock.patch.object(predictor, 'get_model', return_value=new_model):
+                second = service.submit(self.frames['Wizkid'])
+            first.result(5), second.result(5)
+        service.close()
+        self.assertEqual(len(scored_by), 2)
+        self.assertIs(scored_by[0][0], old_model)
+        self.assertIs(scored_by[1][0], new_model)
+        self.assertEqual(service.stats()['batches'], 1)
+
+    def test_cache_write_failure_still_resolves_requests(self):
+        cache = PredictionCache(ttl=60)
+        service = PredictionService(cache=cache)
+        with mock.patch.object(cache, 'set', side_effect=RuntimeError("database is locked")):
+            first = service.predict(self.frames['Rema'], timeout=5)
+        # The key left the in-flight map, so an identical request is scored again rather than hanging
+        second = service.predict(self.frames['Rema'], timeout=5)
+        service.close()
+        self.assertIsNone(first['error'])
+        self.assertEqual(first, second)
+        self.assertEqual(service.stats()['batches'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app.data_pipeline import load_sample_data
+from tuneiq_app.predictor import (
+    DEFAULT_FEATURES, MODEL_PATH, ModelRegistry, build_feature_matrix, predict_impact, predict_impact_many,
+    predict_with_intervals, load_tuneiq_model, disable_diagnostics, enable_diagnostics, get_diagnostics,
+)
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+        with open(self.path, 'wb') as f:
+            f.write(b'v1')
+        self.loads = []
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _loader(self, path):
+        with open(path, 'rb') as f:
+            content = f.read()
+        self.loads.append(content)
+        return content
+
+    def test_model_loaded_once(self):
+        registry = ModelRegistry(self.path, loader=self._loader, check_interval=0)
+        self.assertEqual(registry.get(), b'v1')
+        self.assertEqual(registry.get(), b'v1')
+        self.assertEqual(len(self.loads), 1)
+
+    def test_reload_on_content_change_only(self):
+        registry = ModelRegistry(self.path, loader=self._loader, check_interval=0)
+        registry.get()
+        first = registry.fingerprint
+
+        # Same bytes with a new mtime: no reload
+        os.utime(self.path, ns=(0, 0))
+        registry.get()
+        self.assertEqual(len(self.loads), 1)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'version-2')
+        self.assertEqual(registry.get(), b'version-2')
+        self.assertEqual(len(self.loads), 2)
+        self.assertNotEqual(registry.fingerprint, first)
+
+    def test_forced_reload(self):
+        registry = ModelRegistry(self.path, loader=self._loader, check_interval=0)
+        registry.get()
+        registry.reload()
+        self.assertEqual(len(self.loads), 2)
+
+
+class TestPredictImpactMany(unittest.TestCase):
+    def setUp(self):
+        sample = load_sample_data().dropna(subset=['streams'])
+        self.frames = {
+            'Burna Boy': sample,
+            'Wizkid': sample.head(5).assign(streams=sample.head(5)['streams'] * 40),
+            'Rema': sample.head(3).assign(duration=200.0),
+        }
+
+    def test_matches_single_artist_predictions(self):
+        results = predict_impact_many(self.frames)
+        self.assertEqual(list(results.index), list(self.frames))
+        for artist, frame in self.frames.items():
+            single = predict_impact(frame)
+            row = results.loc[artist]
+            self.assertAlmostEqual(row['predicted_gdp'], single['predicted_gdp'], places=6)
+            self.assertEqual(row['predicted_jobs'], single['predicted_jobs'])
+            self.assertAlmostEqual(row['confidence'], single['confidence'])
+            self.assertEqual(bool(row['estimation']), single['estimation'])
+            self.assertEqual(bool(row['auto_scaled']), single['auto_scaled'])
+            self.assertAlmostEqual(row['predicted_gdp_lower'], single['predicted_gdp_lower'], places=6)
+            self.assertAlmostEqual(row['predicted_gdp_upper'], single['predicted_gdp_upper'], places=6)
+
+    def test_long_format_and_empty_frames(self):
+        long_df = pd.concat([frame.assign(artist=name) for name, frame in self.frames.items()])
+        long_results = predict_impact_many(long_df)
+        self.assertEqual(len(long_results), len(self.frames))
+
+        frames = dict(self.frames, Davido=pd.DataFrame())
+        results = predict_impact_many(frames)
+        self.assertEqual(results.loc['Davido', 'error'], 'Input data is empty')
+        self.assertIsNone(results.loc['Rema', 'error'])
+
+
+class TestBuildFeatureMatrix(unittest.TestCase):
+    def test_per_group_values_and_defaults(self):
+        df = pd.DataFrame({
+            'artist': ['A', 'A', 'B'],
+            'streams': [1_000_000, 3_000_000, 500_000],
+            'duration': [120.0, 240.0, np.nan],
+        })
+        X, index, order, total_streams = build_feature_matrix(df, by='artist')
+        self.assertEqual(X.dtype, np.float64)
+        self.assertEqual(list(index), ['A', 'B'])
+        self.assertEqual(order, DEFAULT_FEATURES)
+        row_a = dict(zip(order, X[0]))
+        row_b = dict(zip(order, X[1]))
+        self.assertAlmostEqual(row_a['Total Streams (Millions)'], 4.0)
+        self.assertAlmostEqual(row_a['Avg Stream Duration (Min)'], 3.0)
+        self.assertAlmostEqual(row_a['Total Hours Streamed (Millions)'], 180 * 4_000_000 / 3600 / 1_000_000)
+        # B has no durations: duration-based features fall back to defaults
+        self.assertAlmostEqual(row_b['Avg Stream Duration (Min)'], 3.5)
+        self.assertAlmostEqual(row_b['Total Hours Streamed (Millions)'], 0.01)
+        self.assertEqual(row_b['Release Year'], 2023)
+        np.testing.assert_array_equal(total_streams, [4_000_000, 500_000])
+
+    def test_single_group_matches_grouped(self):
+        df = load_sample_data().dropna(subset=['streams'])
+        single, _, _, _ = build_feature_matrix(df)
+        grouped, _, _, _ = build_feature_matrix(df.assign(artist='x'), by='artist')
+        np.testing.assert_allclose(single, grouped)
+
+
+class TestPredictionIntervals(unittest.TestCase):
+    def setUp(self):
+        self.model = load_tuneiq_model(MODEL_PATH)
+        names = list(self.model.feature_names_in_)
+        rng = np.random.default_rng(3)
+        self.X = pd.DataFrame(rng.gamma(1.5, 80.0, size=(50, len(names))), columns=names)
+
+    def test_forest_point_estimate_and_interval_from_one_pass(self):
+        y, lower, upper = predict_with_intervals(self.model, self.X, coverage=0.8)
+        np.testing.assert_array_equal(y, self.model.predict(self.X))
+        self.assertTrue(np.all(lower <= upper))
+        _, wide_lower, wide_upper = predict_with_intervals(self.model, self.X, coverage=0.95)
+        self.assertTrue(np.all(wide_upper - wide_lower >= upper - lower))
+
+    def test_residual_table_for_models_without_trees(self):
+        from sklearn.linear_model import LinearRegression
+
+        linear = LinearRegression().fit(self.X, self.X.iloc[:, 0] * 2.0)
+        y, lower, upper = predict_with_intervals(linear, self.X)
+        self.assertIsNone(lower)
+        linear.residual_quantiles_ = {'levels': [0.1, 0.9], 'residuals': [-5.0, 5.0]}
+        y, lower, upper = predict_with_intervals(linear, self.X, coverage=0.8)
+        np.testing.assert_allclose(upper - y, 5.0)
+        np.testing.assert_allclose(y - lower, 5.0)
+
+    def test_predict_impact_reports_interval(self):
+        result = predict_impact(load_sample_data().dropna(subset=['streams']), model=self.model)
+        self.assertLessEqual(result['predicted_gdp_lower'], result['predicted_gdp_upper'])
+        self.assertGreater(result['confidence'], 0)
+        self.assertLess(result['confidence'], 1)
+
+
+class TestDiagnostics(unittest.TestCase):
+    def tearDown(self):
+        disable_diagnostics()
+
+    def test_records_stage_timings_only_when_enabled(self):
+        df = load_sample_data()
+        before = len(get_diagnostics())
+        predict_impact(df)
+        self.assertEqual(len(get_diagnostics()), before)
+
+        enable_diagnostics()
+        predict_impact(df)
+        record = get_diagnostics()[-1]
+        self.assertEqual(record['op'], 'predict_impact')
+        self.assertEqual(record['rows'], len(df))
+        for stage in ('load_ms', 'features_ms', 'predict_ms', 'postprocess_ms', 'total_ms'):
+            self.assertIn(stage, record)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app import models
+from tuneiq_app.data_pipeline import load_sample_data
+from tuneiq_app.rates import RateStore
+
+
+class TestRateStore(unittest.TestCase):
+    def setUp(self):
+        self.fx = pd.DataFrame({
+            'effective_date': ['2025-01-01', '2025-03-01'],
+            'currency': 'NGN',
+            'rate': [1500.0, 1600.0],
+        })
+        self.stream_rates = pd.DataFrame({
+            'effective_date': ['2025-01-01', '2025-02-01', '2025-01-01'],
+            'platform': ['Spotify', 'Spotify', 'Spotify'],
+            'country': ['*', '*', 'Nigeria'],
+            'rate': [0.004, 0.005, 0.001],
+        })
+        self.df = pd.DataFrame({
+            'month': ['2024-12', '2025-01', '2025-02', '2025-03', 'Unknown', '2025-02'],
+            'platform': ['Spotify'] * 5 + ['YouTube'],
+            'country': ['Ghana', 'Ghana', 'Ghana', 'Nigeria', 'Ghana', 'Ghana'],
+            'streams': 1000,
+            'reported_revenue_usd': 1.0,
+        })
+
+    def test_as_of_rates_per_month(self):
+        result = models.estimate_royalties(self.df, rates=RateStore(self.fx, self.stream_rates))
+        # Earliest rate before the first effective date, latest for unparseable months,
+        # country-specific rate over the wildcard, default rate for unknown platforms
+        np.testing.assert_allclose(result['expected_revenue_usd'], [4.0, 4.0, 5.0, 1.0, 5.0, 3.0])
+        np.testing.assert_allclose(result['actual_revenue_ngn'], [1500, 1500, 1500, 1600, 1600, 1500])
+        np.testing.assert_allclose(result['expected_revenue_ngn'], result['expected_revenue_usd'] * result['actual_revenue_ngn'])
+
+    def test_country_rate_only_applies_from_its_effective_date(self):
+        stream_rates = pd.DataFrame({
+            'effective_date': ['2024-01-01', '2025-06-01'],
+            'platform': 'Spotify',
+            'country': ['*', 'Nigeria'],
+            'rate': [0.004, 0.002],
+        })
+        store = RateStore(self.fx, stream_rates)
+        months = pd.Series(['2023-06', '2025-01', '2025-05', '2025-07'])
+        rates = store.stream_rates_for(months, pd.Series(['Spotify'] * 4), pd.Series(['Nigeria'] * 4))
+        # Wildcard until the override starts; before any rate, the one that started first
+        np.testing.assert_allclose(rates, [0.004, 0.004, 0.004, 0.002])
+
+    def test_loads_csv_and_parquet(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fx_path = os.path.join(tmp, 'fx.csv')
+            rates_path = os.path.join(tmp, 'stream_rates.parquet')
+            self.fx.to_csv(fx_path, index=False)
+            self.stream_rates.to_parquet(rates_path)
+            store = RateStore.from_files(fx_path, rates_path)
+        expected = RateStore(self.fx, self.stream_rates).lookup(self.df['month'], self.df['platform'], self.df['country'])
+        actual = store.lookup(self.df['month'], self.df['platform'], self.df['country'])
+        np.testing.assert_array_equal(actual[0], expected[0])
+        np.testing.assert_array_equal(actual[1], expected[1])
+
+    def test_constant_store_matches_module_constants(self):
+        store = RateStore.from_constants(models.STREAM_RATES, {'NGN': models.NGN_RATE}, models.DEFAULT_STREAM_RATE)
+        df = load_sample_data()
+        pd.testing.assert_frame_equal(models.estimate_royalties(df, rates=store), models.estimate_royalties(df))
+        self.assertEqual(models.economic_impact_proxy(df, rates=store), models.economic_impact_proxy(df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app.models import detect_underpayment
+from tuneiq_app.royalty_aggregates import UnderpaymentAggregates
+
+
+def _assert_same_table(actual, expected):
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True), rtol=1e-10)
+
+
+class TestUnderpaymentAggregates(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 3000
+        streams = rng.integers(100, 100_000, n)
+        self.df = pd.DataFrame({
+            'platform': rng.choice(['Spotify', 'YouTube', 'Apple Music'], n),
+            'country': rng.choice(['Nigeria', 'Ghana', 'Kenya', 'United Kingdom', 'France'], n),
+            'streams': streams,
+            'month': rng.choice(['2025-01', '2025-02', '2025-03', '2025-04'], n),
+            'reported_revenue_usd': np.round(streams * rng.uniform(0.0005, 0.008, n), 2),
+        })
+
+    def test_monthly_appends_match_full_recompute(self):
+        aggregates = UnderpaymentAggregates(threshold=0.3)
+        for _, month in self.df.groupby('month'):
+            aggregates.append(month)
+        _assert_same_table(aggregates.severity_table(), detect_underpayment(self.df, threshold=0.3))
+
+        subset = self.df[(self.df['platform'] == 'Spotify') & self.df['month'].isin(['2025-02', '2025-04'])]
+        _assert_same_table(aggregates.severity_table(platforms=['Spotify'], months=['2025-02', '2025-04']),
+                           detect_underpayment(subset, threshold=0.3))
+
+    def test_replace_month_and_round_trip(self):
+        aggregates = UnderpaymentAggregates(threshold=0.3)
+        aggregates.append(self.df)
+        aggregates.append(self.df[self.df['month'] == '2025-01'], replace=True)
+        _assert_same_table(aggregates.severity_table(), detect_underpayment(self.df, threshold=0.3))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'aggregates.parquet')
+            aggregates.save(path)
+            restored = UnderpaymentAggregates.load(path)
+        self.assertEqual(restored.threshold, 0.3)
+        pd.testing.assert_frame_equal(restored.severity_table(), aggregates.severity_table())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import os
+import contextlib
+import io
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app.models import NGN_RATE, economic_impact_proxy, estimate_royalties
+from tuneiq_app.scenarios import evaluate_scenarios, main, scenario_grid
+
+
+class TestScenarios(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        n = 2000
+        streams = rng.integers(100, 1_000_000, n)
+        self.df = pd.DataFrame({
+            'artist': rng.choice(['Burna Boy', 'Wizkid', 'Tems', 'Asake'], n),
+            'platform': rng.choice(['Spotify', 'YouTube', 'Apple Music', 'Boomplay'], n),
+            'country': rng.choice(['Nigeria', 'NG', 'Ghana', 'United Kingdom'], n),
+            'streams': streams,
+            'reported_revenue_usd': np.round(streams * rng.uniform(0.0005, 0.006, n), 2),
+        })
+
+    def test_default_scenario_matches_economic_impact_proxy(self):
+        result = evaluate_scenarios(self.df).set_index('artist')
+        for artist, rows in self.df.groupby('artist'):
+            impact = economic_impact_proxy(rows)
+            for key, value in impact.items():
+                self.assertAlmostEqual(result.loc[artist, key], value, delta=1e-6 * value)
+            expected = estimate_royalties(rows)['expected_revenue_ngn'].sum()
+            self.assertAlmostEqual(result.loc[artist, 'expected_revenue_ngn'], expected, delta=1e-6 * expected)
+
+    def test_grid_is_tidy_and_applies_parameters(self):
+        grid = scenario_grid(indirect_multiplier=[2.0, 3.0], ngn_rate=[850, 1700], **{'stream_rate:Spotify': [0.008]})
+        self.assertEqual(len(grid), 4)
+        result = evaluate_scenarios(self.df, grid)
+        self.assertEqual(len(result), 4 * 4)
+        self.assertEqual(result.groupby('scenario').size().tolist(), [4] * 4)
+
+        by_scenario = result.set_index(['scenario', 'artist'])
+        base = by_scenario.loc[0]
+        doubled = by_scenario.loc[1]  # same multiplier, twice the exchange rate
+        np.testing.assert_allclose(doubled['total_economic_impact_ngn'], 2 * base['total_economic_impact_ngn'])
+        np.testing.assert_allclose(by_scenario.loc[2, 'indirect_revenue_ngn'], 1.5 * base['indirect_revenue_ngn'])
+
+        spotify = self.df[self.df['platform'] == 'Spotify'].groupby('artist')['streams'].sum()
+        others = estimate_royalties(self.df[self.df['platform'] != 'Spotify']).groupby('artist')['expected_revenue_ngn'].sum()
+        np.testing.assert_allclose(base['expected_revenue_ngn'], (spotify * 0.008 * NGN_RATE + others)[base.index])
+
+        with self.assertRaises(ValueError):
+            scenario_grid(multiplier=[2.0])
+
+
+    def test_cli_sweeps_stream_rates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path, out_path = os.path.join(tmp, 'ledger.csv'), os.path.join(tmp, 'out.csv')
+            self.df.to_csv(csv_path, index=False)
+            main(['--csv', csv_path, '--ngn-rate', '850', '1700', '--stream-rate', 'Spotify=0.004,0.008',
+                  '--stream-rate', 'YouTube=0.001', '--out', out_path])
+            result = pd.read_csv(out_path)
+        self.assertEqual(len(result), 2 * 2 * 4)
+        self.assertEqual(sorted(result['stream_rate:Spotify'].unique()), [0.004, 0.008])
+        self.assertEqual(result['stream_rate:YouTube'].unique().tolist(), [0.001])
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main(['--csv', csv_path, '--stream-rate', 'Spotify'])
+
+if __name__ == '__main__':
+    unittest.main()
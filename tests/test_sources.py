@@ -0,0 +1,90 @@
+import sys
+import os
+import threading
+import unittest
+from unittest import mock
+import pandas as pd
+
+# Ensure the parent of the package is on sys.path so 'import tuneiq_app' works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tuneiq_app import data_pipeline
+from tuneiq_app.sources import FunctionSource, SourceRegistry
+
+
+def _chart_rows(artist, credentials):
+    return pd.DataFrame({'artist': [artist], 'track': ['Free Mind'], 'platform': ['Audiomack'],
+                         'country': ['Ghana'], 'streams': [500], 'month': ['2025-03'],
+                         'reported_revenue_usd': [0.5]})
+
+
+class TestSourceRegistry(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def fetch(artist, credentials):
+            self.calls.append(artist)
+            return _chart_rows(artist, credentials)
+
+        self.registry = SourceRegistry()
+        self.registry.register(FunctionSource('audiomack', fetch, label='Audiomack', platform='Audiomack',
+                                              schema=('artist', 'streams'), cost=2, cache_ttl=60))
+
+    def test_results_are_cached_per_artist(self):
+        _, first = self.registry.fetch(['Audiomack'], 'Tems')
+        live, second = self.registry.fetch(['audiomack'], 'Tems')
+        self.registry.fetch(['audiomack'], 'Rema')
+        self.assertEqual(self.calls, ['Tems', 'Rema'])
+        self.assertEqual((first['Audiomack']['status'], first['Audiomack']['cost']), ('ok', 2))
+        self.assertEqual((second['Audiomack']['status'], second['Audiomack']['cost']), ('cached', 0.0))
+        self.assertEqual(live['Audiomack']['artist'].tolist(), ['Tems'])
+
+    def test_schema_mismatch_and_slow_sources_are_isolated(self):
+        self.registry.register(FunctionSource('broken', lambda artist, creds: pd.DataFrame({'title': ['x']}),
+                                              schema=('artist',)))
+        release, finished = threading.Event(), []
+        self.addCleanup(release.set)
+        self.registry.register(FunctionSource('slow', lambda artist, creds: (release.wait(10), finished.append(artist))))
+        live, report = self.registry.fetch(['broken', 'slow', 'audiomack'], 'Tems', timeouts={'slow': 0.2})
+        # fetch returned while the slow source was still blocked: it was abandoned, not joined
+        self.assertEqual(finished, [])
+        self.assertEqual([info['status'] for info in report.values()], ['error', 'timeout', 'ok'])
+        self.assertIsNone(live['broken'])
+        self.assertEqual(len(live['Audiomack']), 1)
+
+    def test_unknown_and_duplicate_sources_raise(self):
+        with self.assertRaises(ValueError):
+            self.registry.get('napster')
+        with self.assertRaises(ValueError):
+            self.registry.register(FunctionSource('audiomack', _chart_rows))
+
+
+class TestBuiltinSources(unittest.TestCase):
+    def setUp(self):
+        data_pipeline.SOURCES.clear_cache()
+
+    def test_fetch_live_data_accepts_apple_music_names(self):
+        for name in ('apple_music', 'Apple Music'):
+            self.assertTrue(data_pipeline.fetch_live_data(source=name, artist_name='Tems').empty)
+        with self.assertRaises(ValueError):
+            data_pipeline.fetch_live_data(source='napster')
+
+    def test_registered_source_plugs_into_fetch_all(self):
+        source = FunctionSource('audiomack', _chart_rows, label='Audiomack', platform='Audiomack',
+                                schema=('artist', 'streams'))
+        data_pipeline.SOURCES.register(source)
+        self.addCleanup(data_pipeline.SOURCES.unregister, 'audiomack')
+        df = data_pipeline.fetch_all(artist_name='Tems', source_names=['audiomack'])
+        self.assertEqual(df.attrs['fetch_report']['Audiomack']['status'], 'ok')
+        self.assertEqual(df.loc[df['platform'] == 'Audiomack', 'artist'].tolist(), ['Tems'])
+        self.assertEqual(len(df), len(data_pipeline.load_sample_data()) + 1)
+
+    def test_fetch_live_data_fetches_with_credentials(self):
+        fetch = lambda creds, artist_name=None: _chart_rows(artist_name, creds)
+        with mock.patch.object(data_pipeline, 'get_apple_music_data', fetch):
+            df = data_pipeline.fetch_live_data('Apple Music', 'Tems', credentials={'developer_token': 't'})
+        self.assertEqual(df['artist'].tolist(), ['Tems'])
+
+
+if __name__ == '__main__':
+    unittest.main()